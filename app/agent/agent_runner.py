@@ -1,33 +1,200 @@
-from app.agent.tools.news_tool import get_news
+import asyncio
+import logging
+import os
+import uuid
+from typing import AsyncIterator, Dict, List, Optional
+
+from app.agent.article_store import get_article_store
+from app.agent.order_queue import order_queue
+from app.agent.scheduler import AUTO_SIGNAL_MAX_AGE, get_scheduler
+from app.agent.tools.news_tool import get_news, news_snapshot_version, stream_news
 from app.agent.tools.sentiment_tool import analyze_sentiments
-from app.agent.tools.decision_tool import make_trade_decision
-from app.agent.tools.trading_tool import execute_trade
+from app.agent.tools.sentiment_backends import get_sentiment_backend
+from app.agent.tools.decision_tool import decide_from_aggregate
 from app.agent.tools.plotting_tool import plot_sentiment_graph
+from app.agent.tools.chart_data import CHART_MODE, build_chart_data
+from app.agent.tools.symbol_resolver import symbol_resolver
+from app.agent.tools.sentiment_stats import SentimentAggregate, topic_aggregates
+
+logger = logging.getLogger(__name__)
+
+# Toplu isteklerde aynı anda çalışacak konu sayısı
+BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", "8"))
+
+
+async def score_articles(topic: str, news_data: List[Dict]) -> List[Dict]:
+    """
+    Haberleri skorlar; article store açıksa daha önce skorlanmış haberler
+    depodan gelir ve yalnızca yeni haberler analiz edilir.
+    """
+    store = get_article_store()
+    if store is None:
+        return await analyze_sentiments(news_data)
+    return await store.score_new(
+        topic, news_data, analyze_sentiments, get_sentiment_backend().scorer_key
+    )
 
 
-async def run_agent(topic: str, mode: str):
+def _chart_key(chart: str) -> str:
+    return "graph_url" if chart == "png" else "chart_data"
+
+
+async def analyze_topic(topic: str, chart: Optional[str] = None) -> Dict:
+    """
+    Haber çekme → skorlama → grafik → karar adımlarını çalıştırır.
+    - chart: "data" ise grafik verisi (chart_data), "png" ise sunucuda çizilen
+      grafiğin adresi (graph_url) döner; verilmezse CHART_MODE kullanılır.
+    """
+    chart = chart or CHART_MODE
     # 1. Haberleri çek
     news_data = await get_news(topic)
 
-    # 2. Sentiment analizini yap
-    sentiments = await analyze_sentiments(news_data)
-
-    # 3. Grafik oluştur
-    graph_url = await plot_sentiment_graph(topic, sentiments)
+    # 2. Sentiment analizini yap (daha önce görülen haberler tekrar skorlanmaz)
+    sentiments = await score_articles(topic, news_data)
 
-    # 4. Karar ver (BUY, SELL, HOLD)
-    decision, confidence = await make_trade_decision(sentiments)
+    # 3. Karar ver (BUY, SELL, HOLD). Konunun biriken (zamana göre
+    # ağırlıklı) özetine yalnızca yeni haberler eklenir ve karar ondan okunur
+    aggregate = topic_aggregates.update(topic, sentiments)
+    decision, confidence = decide_from_aggregate(aggregate)
 
     response = {
         "topic": topic,
         "decision": decision,
         "confidence": confidence,
-        "graph_url": graph_url,
+        "sentiment_stats": aggregate.snapshot(),
+        # Aynı haber seti aynı sinyali üretir; emir kuyruğunda idempotency için
+        "signal_version": news_snapshot_version(topic) or uuid.uuid4().hex[:12],
     }
 
-    # 5. Otomatik modda işlem aç (opsiyonel)
+    # 4. Grafik: istemci tarafında çizilecek veri ya da sunucuda PNG
+    if chart == "png":
+        response["graph_url"] = await plot_sentiment_graph(topic, sentiments)
+    else:
+        response["chart_data"] = build_chart_data(topic, sentiments)
+    return response
+
+
+async def run_agent(
+    topic: str, mode: str, refresh: bool = False, chart: Optional[str] = None
+):
+    """
+    Konu için karar üretir; izleme listesindeki konular için arka planda
+    hazırlanmış güncel sinyal varsa (refresh=False) doğrudan onu kullanır.
+    Otomatik modda emir bayat sinyalle açılmasın diye hazır sinyal yalnızca
+    AUTO_SIGNAL_MAX_AGE'den yeniyse kullanılır (0: her zaman yeniden analiz).
+    """
+    chart = chart or CHART_MODE
+    max_age = None
+    if mode == "auto":
+        refresh = refresh or AUTO_SIGNAL_MAX_AGE <= 0
+        max_age = AUTO_SIGNAL_MAX_AGE
+    scheduler = get_scheduler()
+    response = None if refresh or scheduler is None else scheduler.get(topic, max_age)
+    if response is not None and _chart_key(chart) not in response:
+        # Hazır sinyal istenen grafik türünü içermiyor
+        response = None
+    if response is None:
+        analysis = await analyze_topic(topic, chart)
+        if scheduler is not None and scheduler.is_watched(topic):
+            scheduler.record(topic, analysis)
+        response = {**analysis}
+    confidence = response["confidence"]
+    decision = response["decision"]
+
+    # Otomatik modda işlem aç (opsiyonel)
     if mode == "auto" and confidence > 0.8:  # güven seviyesi %80 üzeri
-        trade_result = await execute_trade(topic, decision)
-        response["trade_result"] = trade_result
+        pair = symbol_resolver.resolve(topic, fuzzy=False)
+        if decision == "hold":
+            response["trade_result"] = {
+                "status": "no_action",
+                "message": "Hold decision, no trade executed",
+            }
+        elif pair is None:
+            # İşlem çifti olmayan (veya yalnızca bulanık eşleşen) konu
+            # kuyruğa ve borsaya gitmez
+            response["trade_result"] = symbol_resolver.rejection(topic)
+        else:
+            # Emir kuyruğa alınır; sonuç /orders/{key} ile izlenir
+            order = order_queue.submit(
+                topic, decision, confidence, response["signal_version"], symbol=pair
+            )
+            response["trade_result"] = order.to_dict()
 
     return response
+
+
+async def run_agent_batch(
+    topics: List[str],
+    mode: str,
+    refresh: bool = False,
+    concurrency: Optional[int] = None,
+    chart: Optional[str] = None,
+) -> AsyncIterator[Dict]:
+    """
+    Birden çok konuyu eşzamanlı (en fazla `concurrency` tane) çalıştırır ve
+    her konunun sonucunu biter bitmez üretir. Bir konudaki hata diğerlerini
+    etkilemez; o konu için {"topic", "error"} döner.
+    """
+    semaphore = asyncio.Semaphore(concurrency or BATCH_CONCURRENCY)
+
+    async def run_one(topic: str) -> Dict:
+        async with semaphore:
+            try:
+                return await run_agent(topic, mode, refresh=refresh, chart=chart)
+            except Exception as e:
+                return {"topic": topic, "error": str(e)}
+
+    # Aynı konu birden fazla verilmişse ("Bitcoin", "bitcoin ") bir kez
+    # çalıştır; ilk yazım korunur
+    unique: Dict[str, str] = {}
+    for topic in topics:
+        unique.setdefault(topic.strip().lower(), topic)
+    tasks = [asyncio.create_task(run_one(topic)) for topic in unique.values()]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def stream_agent(topic: str, max_articles: int = 200) -> AsyncIterator[Dict]:
+    """
+    Haberleri sayfa sayfa çekip analiz eder ve her sayfadan sonra o ana kadarki
+    tüm haberlere göre güncel kararı üretir. İlk karar ilk sayfa gelir gelmez
+    hazırdır; bellekte yalnızca SentimentAggregate özeti tutulur. Sayfa
+    çekme veya skorlama yarıda hata verirse akış son kayıt olarak
+    {"topic", "page", "articles_analyzed", "error"} üretip biter. Hiç haber
+    yoksa tek kayıt (page 0, hold) üretilir; akış hiçbir zaman boş kalmaz.
+    """
+    aggregate = SentimentAggregate()
+    page = 0
+
+    def update() -> Dict:
+        decision, confidence = decide_from_aggregate(aggregate)
+        return {
+            "topic": topic,
+            "page": page,
+            "articles_analyzed": aggregate.count,
+            "avg_score": round(aggregate.mean, 3),
+            "score_std": round(aggregate.std, 3),
+            "label_counts": dict(aggregate.label_counts),
+            "decision": decision,
+            "confidence": confidence,
+        }
+
+    try:
+        async for articles in stream_news(topic, max_articles=max_articles):
+            page += 1
+            aggregate.extend(await score_articles(topic, articles))
+            yield update()
+        if page == 0:
+            yield update()
+    except Exception as e:
+        logger.exception("Akış analizi yarıda kaldı: %s", topic)
+        yield {
+            "topic": topic,
+            "page": page,
+            "articles_analyzed": aggregate.count,
+            "error": str(e),
+        }
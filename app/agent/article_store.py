@@ -0,0 +1,242 @@
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, List, Optional
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Boş bırakılırsa store devre dışı kalır
+ARTICLE_STORE_PATH = os.getenv("ARTICLE_STORE_PATH", "data/articles.db")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    url TEXT PRIMARY KEY,
+    content_hash TEXT NOT NULL,
+    title TEXT,
+    description TEXT,
+    published_at TEXT,
+    sentiment_score REAL NOT NULL,
+    sentiment_label TEXT NOT NULL,
+    analysis_details TEXT,
+    scorer TEXT NOT NULL,
+    scored_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS article_topics (
+    topic TEXT NOT NULL,
+    url TEXT NOT NULL,
+    PRIMARY KEY (topic, url)
+);
+CREATE INDEX IF NOT EXISTS idx_articles_published_at ON articles (published_at);
+"""
+
+
+def content_hash(article: Dict) -> str:
+    text = f"{article.get('title') or ''}\x1f{article.get('description') or ''}"
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def article_key(article: Dict) -> str:
+    # URL'si olmayan haberler içerik hash'i ile saklanır
+    return article.get("url") or f"hash:{content_hash(article)}"
+
+
+class ArticleStore:
+    """
+    SQLite tabanlı haber deposu.
+
+    Haberler URL ile saklanır; normalize edilmiş içerik, sentiment skoru,
+    label ve analysis_details birlikte tutulur. Aynı URL ve aynı içerik hash'i
+    aynı skorlayıcı ile daha önce skorlandıysa tekrar skorlanmaz.
+    SQLite çağrıları event loop'u bloklamamak için thread'de çalıştırılır.
+    """
+
+    def __init__(self, path: str = ARTICLE_STORE_PATH):
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self.reused = 0
+        self.scored = 0
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(SCHEMA)
+            conn.row_factory = sqlite3.Row
+            self._conn = conn
+        return self._conn
+
+    def _lookup(self, keys: List[str]) -> Dict[str, sqlite3.Row]:
+        rows = {}
+        with self._lock:
+            conn = self._connection()
+            # SQLite parametre limitine takılmamak için parça parça sorgula
+            for start in range(0, len(keys), 500):
+                chunk = keys[start : start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                for row in conn.execute(
+                    f"SELECT * FROM articles WHERE url IN ({placeholders})", chunk
+                ):
+                    rows[row["url"]] = row
+        return rows
+
+    def _save(self, topic: str, scorer: str, sentiments: List[Dict]) -> None:
+        now = datetime.utcnow().isoformat()
+        records = [
+            (
+                article_key(item),
+                content_hash(item),
+                item.get("title"),
+                item.get("description"),
+                item.get("publishedAt"),
+                item["sentiment_score"],
+                item["sentiment_label"],
+                json.dumps(item.get("analysis_details"), ensure_ascii=False),
+                scorer,
+                now,
+            )
+            for item in sentiments
+        ]
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO articles VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    records,
+                )
+                conn.executemany(
+                    "INSERT OR IGNORE INTO article_topics VALUES (?, ?)",
+                    [(topic.lower(), record[0]) for record in records],
+                )
+
+    def _link_topic(self, topic: str, keys: List[str]) -> None:
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.executemany(
+                    "INSERT OR IGNORE INTO article_topics VALUES (?, ?)",
+                    [(topic.lower(), key) for key in keys],
+                )
+
+    def _history(self, topic: str, since: Optional[str]) -> List[Dict]:
+        query = (
+            "SELECT a.* FROM articles a JOIN article_topics t ON t.url = a.url "
+            "WHERE t.topic = ?"
+        )
+        params = [topic.lower()]
+        if since:
+            query += " AND a.published_at >= ?"
+            params.append(since)
+        query += " ORDER BY a.published_at"
+        with self._lock:
+            conn = self._connection()
+            return [_row_to_article(row) for row in conn.execute(query, params)]
+
+    async def score_new(
+        self,
+        topic: str,
+        articles: List[Dict],
+        scorer: Callable[[List[Dict]], Awaitable[List[Dict]]],
+        scorer_name: str,
+    ) -> List[Dict]:
+        """
+        Daha önce skorlanmış haberleri depodan alır, yalnızca yenileri
+        skorlayıp kaydeder. Sonuç listesi girdi sırasını korur.
+        - scorer_name: skorlayıcının sürümlü anahtarı (SentimentBackend.scorer_key);
+          farklı anahtarla saklanmış skorlar yeniden hesaplanır
+        """
+        if not articles:
+            return []
+
+        keys = [article_key(a) for a in articles]
+        known = await asyncio.to_thread(self._lookup, list(set(keys)))
+
+        results: List[Optional[Dict]] = [None] * len(articles)
+        missing = []
+        for i, (key, article) in enumerate(zip(keys, articles)):
+            row = known.get(key)
+            if (
+                row is not None
+                and row["scorer"] == scorer_name
+                and row["content_hash"] == content_hash(article)
+            ):
+                results[i] = {
+                    **article,
+                    "sentiment_score": row["sentiment_score"],
+                    "sentiment_label": row["sentiment_label"],
+                    "analysis_details": json.loads(row["analysis_details"] or "null"),
+                }
+            else:
+                missing.append(i)
+
+        if missing:
+            scored = await scorer([articles[i] for i in missing])
+            for i, item in zip(missing, scored):
+                results[i] = item
+            await asyncio.to_thread(self._save, topic, scorer_name, scored)
+
+        missing_set = set(missing)
+        reused_keys = [key for i, key in enumerate(keys) if i not in missing_set]
+        if reused_keys:
+            await asyncio.to_thread(self._link_topic, topic, reused_keys)
+
+        self.reused += len(articles) - len(missing)
+        self.scored += len(missing)
+        return results
+
+    async def history(self, topic: str, since: Optional[str] = None) -> List[Dict]:
+        """
+        Konuya ait skorlanmış haberleri yayın zamanına göre sıralı döner.
+        """
+        return await asyncio.to_thread(self._history, topic, since)
+
+    def stats(self) -> Dict:
+        return {"path": self.path, "reused": self.reused, "scored": self.scored}
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+def _row_to_article(row: sqlite3.Row) -> Dict:
+    url = row["url"]
+    return {
+        "title": row["title"],
+        "description": row["description"],
+        "url": None if url.startswith("hash:") else url,
+        "publishedAt": row["published_at"],
+        "sentiment_score": row["sentiment_score"],
+        "sentiment_label": row["sentiment_label"],
+        "analysis_details": json.loads(row["analysis_details"] or "null"),
+    }
+
+
+_store: Optional[ArticleStore] = None
+
+
+def get_article_store() -> Optional[ArticleStore]:
+    """
+    Paylaşılan store'u döner; ARTICLE_STORE_PATH boşsa None.
+    """
+    global _store
+    if _store is None and ARTICLE_STORE_PATH:
+        _store = ArticleStore(ARTICLE_STORE_PATH)
+    return _store
+
+
+def close_article_store() -> None:
+    global _store
+    if _store is not None:
+        _store.close()
+        _store = None
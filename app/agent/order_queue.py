@@ -0,0 +1,263 @@
+import asyncio
+import logging
+import os
+import time
+from collections import OrderedDict, deque
+from dataclasses import asdict, dataclass, field
+from typing import Awaitable, Callable, Dict, List, Optional
+from dotenv import load_dotenv
+
+from app.agent.tools.trading_tool import execute_trade, trading_client
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Borsanın dakikalık istek ağırlığı sınırı ve bunun ne kadarının kullanılacağı
+EXCHANGE_WEIGHT_LIMIT = int(os.getenv("EXCHANGE_WEIGHT_LIMIT", "6000"))
+EXCHANGE_WEIGHT_SAFETY = float(os.getenv("EXCHANGE_WEIGHT_SAFETY", "0.8"))
+# Bir emrin tahmini ağırlığı (emir + gerekirse fiyat sorgusu)
+ORDER_REQUEST_WEIGHT = int(os.getenv("ORDER_REQUEST_WEIGHT", "3"))
+# Bellekte tutulan emir kaydı (/orders)
+ORDER_HISTORY_SIZE = int(os.getenv("ORDER_HISTORY_SIZE", "1000"))
+# Kapanışta süren emirlerin bitmesi için beklenecek süre (saniye)
+ORDER_SHUTDOWN_TIMEOUT = float(os.getenv("ORDER_SHUTDOWN_TIMEOUT", "10"))
+
+
+class WeightBudget:
+    """
+    Borsanın dakikalık istek ağırlığı bütçesi.
+
+    Son 60 saniyede harcanan ağırlık yerelde sayılır; borsanın bildirdiği
+    kullanılmış ağırlık (x-mbx-used-weight-1m) daha yüksekse o esas alınır.
+    Sınıra gelinince pencere açılana kadar beklenir.
+    """
+
+    def __init__(
+        self, limit: int = EXCHANGE_WEIGHT_LIMIT, safety: float = EXCHANGE_WEIGHT_SAFETY
+    ):
+        self.limit = max(int(limit * safety), 1)
+        self._spent: deque = deque()  # (zaman, ağırlık)
+        self._local = 0
+        self._reported = 0
+        self._reported_minute = -1
+        self.waits = 0
+        self._lock = asyncio.Lock()
+
+    def _used(self, now: float) -> int:
+        while self._spent and self._spent[0][0] <= now - 60:
+            self._local -= self._spent.popleft()[1]
+        reported = self._reported if self._reported_minute == int(now // 60) else 0
+        return max(self._local, reported)
+
+    def observe(self, used: Optional[int]) -> None:
+        """
+        Borsanın son yanıtta bildirdiği kullanılmış ağırlığı kaydeder.
+        """
+        if used is not None:
+            self._reported = used
+            self._reported_minute = int(time.time() // 60)
+
+    async def acquire(self, weight: int) -> None:
+        async with self._lock:
+            while True:
+                now = time.time()
+                used = self._used(now)
+                if used + weight <= self.limit:
+                    break
+                self.waits += 1
+                if self._reported >= self._local:
+                    # Borsanın penceresi dakika başında sıfırlanır
+                    wait = 60 - now % 60
+                else:
+                    wait = self._spent[0][0] + 60 - now
+                await asyncio.sleep(max(wait, 0.05))
+            self._spent.append((now, weight))
+            self._local += weight
+
+    def stats(self) -> Dict:
+        return {"limit": self.limit, "used": self._used(time.time()), "waits": self.waits}
+
+
+@dataclass
+class Order:
+    key: str  # idempotency anahtarı: konu + sinyal sürümü
+    topic: str
+    decision: str
+    confidence: float
+    signal_version: str
+    amount: Optional[float] = None
+    symbol: Optional[str] = None  # çözümlenmiş işlem çifti (BTCUSDT)
+    # queued, executing, executed, rejected, failed, coalesced, cancelled
+    status: str = "queued"
+    result: Optional[Dict] = None
+    error: Optional[str] = None
+    coalesced_with: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+    updated_at: float = field(default_factory=time.time)
+
+    def set_status(self, status: str) -> None:
+        self.status = status
+        self.updated_at = time.time()
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+
+class OrderQueue:
+    """
+    Sinyallerden gelen emirleri HTTP isteğinden bağımsız çalıştırır.
+
+    - Aynı (konu, sinyal sürümü) için ikinci emir açılmaz; ilk kayıt döner.
+    - Her sembolün tek worker'ı vardır; emirler sırayla gider.
+    - Bir sembolün yalnızca bir bekleyen emri olur: aynı yönlü yeni sinyal
+      bekleyene katılır, ters yönlü sinyal ikisini birden iptal eder
+      (net pozisyon değişmez).
+    - Borsanın istek ağırlığı bütçesi dolunca worker bekler.
+    """
+
+    def __init__(
+        self,
+        execute: Callable[[str, str, Optional[float]], Awaitable[Dict]] = execute_trade,
+        budget: Optional[WeightBudget] = None,
+        history_size: int = ORDER_HISTORY_SIZE,
+        used_weight: Optional[Callable[[], Optional[int]]] = None,
+    ):
+        """
+        - used_weight: borsanın bildirdiği kullanılmış ağırlığı dönen fonksiyon;
+          verilmezse yalnızca varsayılan execute_trade için trading_client'ınki
+        """
+        self._execute = execute
+        if used_weight is None and execute is execute_trade:
+            used_weight = trading_client.used_weight
+        self._used_weight = used_weight
+        self.budget = budget or WeightBudget()
+        self.history_size = history_size
+        self._orders: "OrderedDict[str, Order]" = OrderedDict()
+        self._pending: Dict[str, Order] = {}  # sembol -> bekleyen emir
+        self._workers: Dict[str, asyncio.Task] = {}
+        self.submitted = 0
+        self.duplicates = 0
+        self.coalesced = 0
+
+    @staticmethod
+    def make_key(topic: str, signal_version: str) -> str:
+        return f"{topic.strip().lower()}:{signal_version}"
+
+    def submit(
+        self,
+        topic: str,
+        decision: str,
+        confidence: float,
+        signal_version: str,
+        amount: Optional[float] = None,
+        symbol: Optional[str] = None,
+    ) -> Order:
+        """
+        Emri kuyruğa alır ve beklemeden kaydını döner; sonuç get(key) ile izlenir.
+        - symbol: çözümlenmiş işlem çifti; aynı çifte giden konular ("Bitcoin",
+          "BTC") aynı worker'da sıralanır. Verilmezse konu kullanılır.
+        """
+        key = self.make_key(topic, signal_version)
+        existing = self._orders.get(key)
+        if existing is not None:
+            self.duplicates += 1
+            return existing
+
+        symbol = symbol or topic.strip().upper()
+        order = Order(key, topic, decision.lower(), confidence, signal_version, amount, symbol)
+        self._remember(order)
+        self.submitted += 1
+
+        pending = self._pending.get(symbol)
+        if pending is not None:
+            order.coalesced_with = pending.key
+            order.set_status("coalesced")
+            self.coalesced += 1
+            if pending.decision != order.decision:
+                # Ters yönlü emirler birbirini götürür
+                pending.coalesced_with = order.key
+                pending.set_status("coalesced")
+                self.coalesced += 1
+                del self._pending[symbol]
+            return order
+
+        self._pending[symbol] = order
+        if symbol not in self._workers:
+            self._workers[symbol] = asyncio.create_task(self._worker(symbol))
+        return order
+
+    def _remember(self, order: Order) -> None:
+        self._orders[order.key] = order
+        while len(self._orders) > self.history_size:
+            self._orders.popitem(last=False)
+
+    async def _worker(self, symbol: str) -> None:
+        try:
+            while symbol in self._pending:
+                # Bütçe beklenirken emir bekleyen kalır; bu sırada gelen
+                # sinyallerle birleştirilebilir
+                await self.budget.acquire(ORDER_REQUEST_WEIGHT)
+                order = self._pending.pop(symbol, None)
+                if order is not None:
+                    await self._run(order)
+        finally:
+            self._workers.pop(symbol, None)
+
+    async def _run(self, order: Order) -> None:
+        order.set_status("executing")
+        try:
+            result = await self._execute(order.symbol, order.decision, order.amount)
+        except Exception as e:
+            logger.exception("Emir gönderilemedi: %s", order.key)
+            order.error = str(e)
+            order.set_status("failed")
+            return
+        finally:
+            if self._used_weight is not None:
+                self.budget.observe(self._used_weight())
+        order.result = result
+        order.set_status("rejected" if result.get("status") == "rejected" else "executed")
+
+    def get(self, key: str) -> Optional[Order]:
+        return self._orders.get(key)
+
+    def recent(self, limit: int = 50) -> List[Order]:
+        """
+        En yeni emirler önce.
+        """
+        orders = list(self._orders.values())[-limit:]
+        return orders[::-1]
+
+    def stats(self) -> Dict:
+        return {
+            "submitted": self.submitted,
+            "duplicates": self.duplicates,
+            "coalesced": self.coalesced,
+            "pending": len(self._pending),
+            "active_symbols": len(self._workers),
+            "weight": self.budget.stats(),
+        }
+
+    async def close(self, timeout: float = ORDER_SHUTDOWN_TIMEOUT) -> None:
+        """
+        Henüz başlamamış emirleri iptal eder, süren emirleri `timeout`
+        kadar bekler.
+        """
+        for order in self._pending.values():
+            order.set_status("cancelled")
+        self._pending.clear()
+        workers = list(self._workers.values())
+        if not workers:
+            return
+        _, running = await asyncio.wait(workers, timeout=timeout)
+        for task in running:
+            task.cancel()
+        await asyncio.gather(*running, return_exceptions=True)
+
+
+order_queue = OrderQueue()
+
+
+async def close_order_queue() -> None:
+    await order_queue.close()
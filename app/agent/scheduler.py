@@ -0,0 +1,192 @@
+import asyncio
+import logging
+import os
+import time
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Dict, Optional
+from dotenv import load_dotenv
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# İzlenecek konular: "Bitcoin:300,Ethereum:600" (saniye cinsinden aralık)
+WATCHLIST = os.getenv("WATCHLIST", "")
+WATCHLIST_DEFAULT_INTERVAL = float(os.getenv("WATCHLIST_DEFAULT_INTERVAL", "300"))
+# Zamanlayıcının saatte en fazla yapabileceği NewsAPI çağrısı (0: sınırsız)
+NEWS_API_BUDGET_PER_HOUR = float(os.getenv("NEWS_API_BUDGET_PER_HOUR", "50"))
+# Sinyal, aralığının bu katı kadar eskiyse bayat sayılır
+SIGNAL_STALE_FACTOR = float(os.getenv("SIGNAL_STALE_FACTOR", "2"))
+# Otomatik modda (emir açılırken) kullanılabilecek hazır sinyalin en fazla
+# yaşı (saniye); 0 ise otomatik modda her zaman yeniden analiz edilir
+AUTO_SIGNAL_MAX_AGE = float(os.getenv("AUTO_SIGNAL_MAX_AGE", "0"))
+
+
+def parse_watchlist(
+    value: str, default_interval: float = WATCHLIST_DEFAULT_INTERVAL
+) -> Dict[str, float]:
+    """
+    "Bitcoin:300,Ethereum" formatını {konu: aralık} sözlüğüne çevirir.
+    Aralığı geçersiz girdiler ("Bitcoin:5m", "Bitcoin:0") loglanıp atlanır.
+    """
+    watchlist = {}
+    for entry in value.split(","):
+        topic, _, interval = entry.strip().partition(":")
+        topic = topic.strip()
+        if not topic:
+            continue
+        if not interval.strip():
+            watchlist[topic] = default_interval
+            continue
+        try:
+            seconds = float(interval)
+        except ValueError:
+            seconds = 0.0
+        if not 0 < seconds < float("inf"):
+            logger.warning("WATCHLIST girdisi atlandı (aralık saniye olmalı): %r", entry)
+            continue
+        watchlist[topic] = seconds
+    return watchlist
+
+
+class RateBudget:
+    """
+    Token bucket: saatte `per_hour` çağrı, en fazla `per_hour` birikme.
+    `per_hour` 0 veya negatifse sınır uygulanmaz.
+    """
+
+    def __init__(self, per_hour: float):
+        self.unlimited = per_hour <= 0
+        self.capacity = max(per_hour, 1.0)
+        self.rate = per_hour / 3600.0
+        self.tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        refill = (now - self._updated) * self.rate
+        self.tokens = min(self.capacity, self.tokens + refill)
+        self._updated = now
+
+    async def acquire(self) -> None:
+        if self.unlimited:
+            return
+        async with self._lock:
+            self._refill()
+            while self.tokens < 1:
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+                self._refill()
+            self.tokens -= 1
+
+
+class SignalScheduler:
+    """
+    İzleme listesindeki konuları kendi aralıklarında arka planda analiz eder
+    ve son kararı bellekte sıcak tutar.
+    - analyze: konu alıp {"decision", "confidence", ...} dönen async fonksiyon
+    """
+
+    def __init__(
+        self,
+        watchlist: Dict[str, float],
+        analyze: Callable[[str], Awaitable[Dict]],
+        budget: RateBudget = None,
+    ):
+        self.watchlist = watchlist
+        self._intervals = {topic.strip().lower(): i for topic, i in watchlist.items()}
+        self.analyze = analyze
+        self.budget = budget or RateBudget(NEWS_API_BUDGET_PER_HOUR)
+        self.signals: Dict[str, Dict] = {}
+        self._tasks = []
+
+    def start(self) -> None:
+        count = max(len(self.watchlist), 1)
+        for i, (topic, interval) in enumerate(self.watchlist.items()):
+            # Başlangıç anında tüm konuların aynı anda çekilmesini önle
+            delay = min(interval, 60.0) * i / count
+            self._tasks.append(
+                asyncio.create_task(self._watch(topic, interval, delay))
+            )
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _watch(self, topic: str, interval: float, delay: float) -> None:
+        await asyncio.sleep(delay)
+        while True:
+            try:
+                await self.budget.acquire()
+                self.record(topic, await self.analyze(topic), interval)
+            except Exception:
+                logger.exception("Sinyal güncellenemedi: %s", topic)
+            await asyncio.sleep(interval)
+
+    def is_watched(self, topic: str) -> bool:
+        return topic.strip().lower() in self._intervals
+
+    def record(self, topic: str, analysis: Dict, interval: float = None) -> None:
+        key = topic.strip().lower()
+        if interval is None:
+            interval = self._intervals.get(key, WATCHLIST_DEFAULT_INTERVAL)
+        self.signals[key] = {
+            "analysis": analysis,
+            "updated_at": time.time(),
+            "interval": interval,
+        }
+
+    def get(self, topic: str, max_age: Optional[float] = None) -> Optional[Dict]:
+        """
+        Konunun bayat olmayan son analizini döner; yoksa None.
+        - max_age: verilirse sinyal bundan (saniye) eskiyse de None döner
+        """
+        entry = self.signals.get(topic.strip().lower())
+        if entry is None:
+            return None
+        age = time.time() - entry["updated_at"]
+        if age > entry["interval"] * SIGNAL_STALE_FACTOR:
+            return None
+        if max_age is not None and age > max_age:
+            return None
+        return {
+            **entry["analysis"],
+            "precomputed": True,
+            "updated_at": datetime.fromtimestamp(
+                entry["updated_at"], tz=timezone.utc
+            ).isoformat(),
+        }
+
+    def snapshot(self) -> Dict[str, Dict]:
+        return {topic: self.get(topic) for topic in self.signals}
+
+
+_scheduler: Optional[SignalScheduler] = None
+
+
+def get_scheduler() -> Optional[SignalScheduler]:
+    return _scheduler
+
+
+def start_scheduler(
+    analyze: Callable[[str], Awaitable[Dict]]
+) -> Optional[SignalScheduler]:
+    """
+    WATCHLIST tanımlıysa zamanlayıcıyı başlatır.
+    """
+    global _scheduler
+    watchlist = parse_watchlist(WATCHLIST)
+    if not watchlist:
+        return None
+    _scheduler = SignalScheduler(watchlist, analyze)
+    _scheduler.start()
+    return _scheduler
+
+
+async def stop_scheduler() -> None:
+    global _scheduler
+    if _scheduler is not None:
+        await _scheduler.stop()
+        _scheduler = None
@@ -0,0 +1,77 @@
+import os
+from datetime import datetime
+from typing import Dict, List
+from dotenv import load_dotenv
+
+import numpy as np
+
+load_dotenv()
+
+# Varsayılan grafik modu: "data" (istemci çizer) veya "png" (sunucu çizer)
+CHART_MODE = os.getenv("CHART_MODE", "data")
+# İstemciye gönderilecek en fazla nokta sayısı
+CHART_MAX_POINTS = int(os.getenv("CHART_MAX_POINTS", "200"))
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets ile seriyi `threshold` noktaya indirir.
+    İlk ve son nokta korunur; her kovadan, bir önceki seçilen nokta ile bir
+    sonraki kovanın ortalamasıyla en büyük üçgeni oluşturan nokta seçilir.
+    Dönüş: seçilen noktaların indeksleri (artan sırada)
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    every = (n - 2) / (threshold - 2)
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0] = 0
+    a = 0
+    for i in range(threshold - 2):
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+        next_start = end
+        next_end = min(int((i + 2) * every) + 1, n)
+        if next_start >= next_end:
+            next_start, next_end = n - 1, n
+
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+        areas = np.abs(
+            (x[a] - avg_x) * (y[start:end] - y[a])
+            - (x[a] - x[start:end]) * (avg_y - y[a])
+        )
+        a = start + int(np.argmax(areas))
+        selected[i + 1] = a
+    selected[-1] = n - 1
+    return selected
+
+
+def build_chart_data(
+    topic: str, sentiments: List[Dict], max_points: int = CHART_MAX_POINTS
+) -> Dict:
+    """
+    Sentiment zaman serisini istemcinin çizebileceği kompakt bir yapıya çevirir.
+    - t: Unix zaman damgaları (saniye), artan sırada
+    - y: sentiment skorları
+    Uzun seriler LTTB ile `max_points` noktaya indirilir.
+    """
+    points = sorted(
+        (
+            datetime.fromisoformat(item["publishedAt"].replace("Z", "+00:00")).timestamp(),
+            item["sentiment_score"],
+        )
+        for item in sentiments
+        if item.get("publishedAt")
+    )
+    x = np.array([p[0] for p in points], dtype=np.float64)
+    y = np.array([p[1] for p in points], dtype=np.float64)
+    keep = lttb_indices(x, y, max_points)
+
+    return {
+        "topic": topic,
+        "t": x[keep].astype(np.int64).tolist(),
+        "y": np.round(y[keep], 3).tolist(),
+        "source_points": len(points),
+    }
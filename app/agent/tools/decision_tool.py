@@ -1,5 +1,7 @@
 from typing import List, Dict, Tuple
 
+from app.agent.tools.sentiment_stats import SentimentAggregate
+
 
 async def make_trade_decision(
     sentiments: List[Dict], buy_threshold: float = 0.6, sell_threshold: float = 0.4
@@ -19,14 +21,32 @@ async def make_trade_decision(
         decision: "buy", "sell" veya "hold"
         confidence: [0.0–1.0] arası güven skoru
     """
+    return decide_from_aggregate(
+        SentimentAggregate.from_items(sentiments), buy_threshold, sell_threshold
+    )
+
+
+def decide_from_aggregate(
+    aggregate: SentimentAggregate, buy_threshold: float = 0.6, sell_threshold: float = 0.4
+) -> Tuple[str, float]:
+    """
+    Hazır SentimentAggregate'in (ağırlıklı) ortalamasından karar verir;
+    haber listesini tekrar dolaşmaz.
+    """
     # Boş liste kontrolü
-    if not sentiments:
+    if aggregate.count == 0:
         return "hold", 0.0
 
-    # Ortalama skor
-    scores = [item["sentiment_score"] for item in sentiments]
-    avg_score = sum(scores) / len(scores)
+    return decide_from_average(aggregate.mean, buy_threshold, sell_threshold)
+
 
+def decide_from_average(
+    avg_score: float, buy_threshold: float = 0.6, sell_threshold: float = 0.4
+) -> Tuple[str, float]:
+    """
+    Ortalama sentiment skorundan karar ve güven skoru üretir.
+    Akış (stream) modunda tüm listeyi tutmadan karar vermek için kullanılır.
+    """
     # Karar mekanizması
     if avg_score >= buy_threshold:
         decision = "buy"
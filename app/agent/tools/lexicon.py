@@ -0,0 +1,153 @@
+import csv
+import hashlib
+import os
+from typing import Dict, Iterable, List, Optional, Tuple
+from dotenv import load_dotenv
+
+from app.utils.phrase_index import PhraseIndex, tokenize
+
+load_dotenv()
+
+# Virgülle ayrılmış ek sözlük dosyaları (varsayılan sözlüğün üzerine yazılır)
+LEXICON_PATHS = os.getenv("SENTIMENT_LEXICON_PATH", "")
+
+# Finansal pozitif/negatif kelimeler
+POSITIVE_WORDS = [
+    'yükseldi', 'arttı', 'büyüdü', 'kazanç', 'profit', 'gain', 'rise', 'up', 'positive',
+    'olumlu', 'iyi', 'güçlü', 'başarılı', 'rekor', 'record', 'high', 'peak', 'bullish',
+    'satın al', 'buy', 'yükseliş', 'rally', 'momentum', 'güven', 'confidence', 'optimist',
+    'büyüme', 'growth', 'revenue', 'gelir', 'earnings', 'beat', 'üstün'
+]
+
+NEGATIVE_WORDS = [
+    'düştü', 'azaldı', 'kayıp', 'loss', 'drop', 'down', 'negative', 'olumsuz', 'kötü',
+    'zayıf', 'başarısız', 'düşüş', 'crash', 'bearish', 'sat', 'sell', 'panik', 'panic',
+    'korku', 'fear', 'risk', 'tehlike', 'düşük', 'low', 'minimum',
+    'zarar', 'damage', 'problem', 'sorun', 'kriz', 'crisis', 'iflas', 'bankruptcy'
+]
+
+
+class Lexicon:
+    """
+    Ağırlıklı sentiment sözlüğü.
+
+    Pozitif ağırlık pozitif, negatif ağırlık negatif terimi ifade eder.
+    Sözlük bir kez derlenir ve her haber tek geçişte skorlanır.
+    """
+
+    def __init__(self, weights: Optional[Dict[str, float]] = None):
+        self.terms: List[str] = []
+        self.weights: List[float] = []
+        self._index = PhraseIndex()
+        self._fingerprint: Optional[str] = None
+        for term, weight in (weights or {}).items():
+            self.add(term, weight)
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+    def add(self, term: str, weight: float) -> None:
+        """
+        Terimi ekler; aynı terim daha önce eklendiyse ağırlığını günceller.
+        """
+        self._fingerprint = None
+        term_id = self._index.get(term)
+        if term_id is not None:
+            self.weights[term_id] = float(weight)
+            return
+        if self._index.add(term, len(self.terms)):
+            self.terms.append(term)
+            self.weights.append(float(weight))
+
+    @property
+    def fingerprint(self) -> str:
+        """
+        Terim ve ağırlıklardan türetilen kısa hash; sözlük dosyası veya
+        ağırlıklar değişince değişir (saklanan skorların geçerliliği için).
+        """
+        if self._fingerprint is None:
+            digest = hashlib.sha1()
+            for term, weight in sorted(zip(self.terms, self.weights)):
+                digest.update(f"{term}\t{weight!r}\n".encode("utf-8"))
+            self._fingerprint = digest.hexdigest()[:12]
+        return self._fingerprint
+
+    def match_ids(self, text: str) -> Tuple[List[int], int]:
+        """
+        Metinde eşleşen terimlerin id'lerini ve metnin kelime sayısını döner.
+        """
+        tokens = tokenize(text)
+        ids = [term_id for term_id, _, _ in self._index.find_tokens(tokens)]
+        return ids, len(tokens)
+
+    def count(self, text: str) -> Tuple[float, float, int]:
+        """
+        Metindeki pozitif/negatif ağırlık toplamlarını ve kelime sayısını döner.
+        """
+        ids, total_words = self.match_ids(text)
+        weights = self.weights
+        positive = 0.0
+        negative = 0.0
+        for term_id in ids:
+            weight = weights[term_id]
+            if weight > 0:
+                positive += weight
+            else:
+                negative -= weight
+        return positive, negative, total_words
+
+    def load_file(self, path: str) -> int:
+        """
+        'terim<TAB>ağırlık' veya 'terim,ağırlık' satırlarından oluşan dosyayı yükler.
+        '#' ile başlayan satırlar yok sayılır. Ağırlık verilmezse 1.0 kabul edilir.
+        Dönüş: yüklenen terim sayısı
+        """
+        delimiter = "\t" if path.endswith((".tsv", ".txt")) else ","
+        loaded = 0
+        with open(path, encoding="utf-8", newline="") as f:
+            for row in csv.reader(f, delimiter=delimiter):
+                if not row or not row[0].strip() or row[0].lstrip().startswith("#"):
+                    continue
+                term = row[0].strip()
+                try:
+                    weight = float(row[1]) if len(row) > 1 and row[1].strip() else 1.0
+                except ValueError:
+                    # Başlık satırı (term,weight) gibi sayısal olmayan değerler
+                    continue
+                self.add(term, weight)
+                loaded += 1
+        return loaded
+
+    @classmethod
+    def from_words(
+        cls, positive: Iterable[str], negative: Iterable[str]
+    ) -> "Lexicon":
+        lexicon = cls()
+        for word in positive:
+            lexicon.add(word, 1.0)
+        for word in negative:
+            lexicon.add(word, -1.0)
+        return lexicon
+
+
+def build_default_lexicon(paths: str = LEXICON_PATHS) -> Lexicon:
+    """
+    Yerleşik kelime listelerinden ve SENTIMENT_LEXICON_PATH dosyalarından sözlük kurar.
+    """
+    lexicon = Lexicon.from_words(POSITIVE_WORDS, NEGATIVE_WORDS)
+    for path in filter(None, (p.strip() for p in paths.split(","))):
+        lexicon.load_file(path)
+    return lexicon
+
+
+_default_lexicon: Optional[Lexicon] = None
+
+
+def get_lexicon() -> Lexicon:
+    """
+    Uygulama boyunca paylaşılan sözlüğü döner (ilk çağrıda derlenir).
+    """
+    global _default_lexicon
+    if _default_lexicon is None:
+        _default_lexicon = build_default_lexicon()
+    return _default_lexicon
@@ -1,42 +1,190 @@
+import asyncio
+import hashlib
 import os
-from typing import List, Dict
-import httpx
+from collections import OrderedDict
+from typing import AsyncIterator, List, Dict, Optional, Tuple
 from dotenv import load_dotenv
 
+import httpx
+
+from app.utils.cache import AsyncTTLCache
+from app.utils.http_client import request_with_retry
+
 load_dotenv()
 
 NEWS_API_KEY = os.getenv("NEWS_API_KEY")
-BASE_URL = "https://newsapi.org/v2/everything"
+BASE_URL = os.getenv("NEWS_API_URL", "https://newsapi.org/v2/everything")
+
+# ETag/Last-Modified ile koşullu istek için saklanan yanıt sayısı
+CONDITIONAL_CACHE_SIZE = int(os.getenv("NEWS_CONDITIONAL_CACHE_SIZE", "256"))
+
+# NewsAPI'nin izin verdiği en büyük sayfa boyutu
+NEWS_MAX_PAGE_SIZE = 100
+
+# (konu, limit, dil) bazlı haber cache'i
+NEWS_CACHE_TTL = float(os.getenv("NEWS_CACHE_TTL", "60"))
+NEWS_CACHE_SIZE = int(os.getenv("NEWS_CACHE_SIZE", "256"))
+
+news_cache = AsyncTTLCache(ttl=NEWS_CACHE_TTL, maxsize=NEWS_CACHE_SIZE, name="news")
+
+# anahtar -> (ETag, Last-Modified, JSON gövde)
+_conditional_cache: "OrderedDict[Tuple, Tuple[Optional[str], Optional[str], Dict]]" = (
+    OrderedDict()
+)
+
+# konu -> son çekilen haber setinin parmak izi (yanıt cache'i anahtarı için)
+_snapshot_versions: "OrderedDict[str, str]" = OrderedDict()
+
 
+def _record_snapshot(topic: str, articles: List[Dict]) -> None:
+    payload = "\n".join(f"{a.get('url')}|{a.get('publishedAt')}" for a in articles)
+    key = topic.strip().lower()
+    _snapshot_versions[key] = hashlib.sha1(payload.encode("utf-8")).hexdigest()[:12]
+    _snapshot_versions.move_to_end(key)
+    while len(_snapshot_versions) > NEWS_CACHE_SIZE:
+        _snapshot_versions.popitem(last=False)
 
-async def get_news(topic: str, limit: int = 20) -> List[Dict]:
+
+def news_snapshot_version(topic: str) -> Optional[str]:
     """
-    Belirtilen konu hakkında en son haberleri NewsAPI'den çeker.
-    - topic: Aranacak anahtar kelime (örn. "Bitcoin")
-    - limit: Maksimum çekilecek haber sayısı
-    Dönüş: Her bir haber için {'title', 'description', 'url', 'publishedAt'} içeren dict listesi.
+    Konu için son çekilen haber setinin sürümünü döner; haberler
+    değiştiğinde sürüm de değişir. Konu hiç çekilmediyse None.
+    """
+    return _snapshot_versions.get(topic.strip().lower())
+
+
+def _normalize_article(a: Dict) -> Dict:
+    return {
+        "title": a.get("title"),
+        "description": a.get("description"),
+        "url": a.get("url"),
+        "publishedAt": a.get("publishedAt"),
+    }
+
+
+async def _fetch_json(params: Dict) -> Dict:
     """
+    NewsAPI'ye koşullu istek atar. Sunucu 304 dönerse önceki gövde kullanılır.
+    """
+    key = tuple(sorted((k, str(v)) for k, v in params.items() if k != "apiKey"))
+    cached = _conditional_cache.get(key)
+
+    headers = {}
+    if cached:
+        etag, last_modified, _ = cached
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+
+    resp = await request_with_retry("GET", BASE_URL, params=params, headers=headers)
+    if resp.status_code == 304 and cached:
+        _conditional_cache.move_to_end(key)
+        return cached[2]
+
+    resp.raise_for_status()
+    data = resp.json()
+
+    etag = resp.headers.get("ETag")
+    last_modified = resp.headers.get("Last-Modified")
+    if etag or last_modified:
+        _conditional_cache[key] = (etag, last_modified, data)
+        _conditional_cache.move_to_end(key)
+        while len(_conditional_cache) > CONDITIONAL_CACHE_SIZE:
+            _conditional_cache.popitem(last=False)
+    return data
+
+
+def _params(topic: str, page_size: int, language: str, page: int = 1) -> Dict:
     params = {
         "q": topic,
-        "language": "en",
+        "language": language,
         "sortBy": "publishedAt",
-        "pageSize": limit,
+        "pageSize": page_size,
         "apiKey": NEWS_API_KEY,
     }
+    if page > 1:
+        params["page"] = page
+    return params
+
 
-    async with httpx.AsyncClient(timeout=10) as client:
-        resp = await client.get(BASE_URL, params=params)
-        resp.raise_for_status()
-        data = resp.json()
-
-    articles = []
-    for a in data.get("articles", []):
-        articles.append(
-            {
-                "title": a.get("title"),
-                "description": a.get("description"),
-                "url": a.get("url"),
-                "publishedAt": a.get("publishedAt"),
-            }
-        )
+async def _fetch_news(topic: str, limit: int, language: str) -> List[Dict]:
+    data = await _fetch_json(_params(topic, limit, language))
+    articles = [_normalize_article(a) for a in data.get("articles", [])]
+    _record_snapshot(topic, articles)
     return articles
+
+
+async def get_news(topic: str, limit: int = 20, language: str = "en") -> List[Dict]:
+    """
+    Belirtilen konu hakkında en son haberleri NewsAPI'den çeker.
+    - topic: Aranacak anahtar kelime (örn. "Bitcoin")
+    - limit: Maksimum çekilecek haber sayısı
+    - language: Haber dili
+    Sonuçlar NEWS_CACHE_TTL saniye cache'lenir; aynı konu için eşzamanlı
+    çağrılar tek bir NewsAPI isteğini paylaşır.
+    Dönüş: Her bir haber için {'title', 'description', 'url', 'publishedAt'} içeren dict listesi.
+    """
+    key = (topic.strip().lower(), limit, language)
+    articles = await news_cache.get_or_load(
+        key, lambda: _fetch_news(topic, limit, language)
+    )
+    # Çağıranlar listeyi değiştirse de cache etkilenmesin
+    return list(articles)
+
+
+async def stream_news(
+    topic: str,
+    max_articles: int = 200,
+    page_size: int = NEWS_MAX_PAGE_SIZE,
+    language: str = "en",
+) -> AsyncIterator[List[Dict]]:
+    """
+    NewsAPI sayfalarını sırayla gezer ve her sayfanın normalize edilmiş
+    haberlerini geldiği anda liste olarak üretir.
+    - max_articles: toplamda en fazla üretilecek haber sayısı
+    - page_size: sayfa başına haber sayısı (en fazla 100)
+    Bir sayfa işlenirken sonraki sayfa arka planda çekilir. Sayfalar arasında
+    kayan haberler URL'ye göre tekilleştirilir; bellekte yalnızca URL'ler tutulur.
+    Planın sonuç sınırına gelinince (HTTP 426, maximumResultsReached)
+    sayfalama hatasız biter.
+    """
+    page_size = max(1, min(page_size, NEWS_MAX_PAGE_SIZE, max_articles))
+    seen_urls = set()
+    produced = 0
+    page = 1
+    next_page = asyncio.ensure_future(_fetch_json(_params(topic, page_size, language, page)))
+    try:
+        while next_page is not None:
+            try:
+                data = await next_page
+            except httpx.HTTPStatusError as e:
+                # Developer planı ilk 100 sonuçtan sonrasını 426 ile reddeder
+                if page > 1 and e.response.status_code == 426:
+                    break
+                raise
+            next_page = None
+            raw = data.get("articles", [])
+
+            # Kalan sayfa varsa, bu sayfa tüketilirken bir sonrakini çek
+            has_more = page * page_size < data.get("totalResults", 0)
+            if raw and has_more and produced + len(raw) < max_articles:
+                page += 1
+                next_page = asyncio.ensure_future(
+                    _fetch_json(_params(topic, page_size, language, page))
+                )
+
+            articles = []
+            for a in raw:
+                url = a.get("url")
+                if url in seen_urls:
+                    continue
+                seen_urls.add(url)
+                articles.append(_normalize_article(a))
+            articles = articles[: max_articles - produced]
+            produced += len(articles)
+            if articles:
+                yield articles
+    finally:
+        if next_page is not None:
+            next_page.cancel()
@@ -1,16 +1,154 @@
+import asyncio
+import hashlib
+import json
+import logging
 import os
-from typing import List, Dict
+import re
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Optional
 from datetime import datetime
-import matplotlib.pyplot as plt
-import matplotlib.dates as mdates
 from dotenv import load_dotenv
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 # Çıktı grafiklerinin kaydedileceği klasör
 OUTPUT_DIR = os.getenv("OUTPUT_DIR", "outputs")
 os.makedirs(OUTPUT_DIR, exist_ok=True)
 
+# Grafik çizimi ayrı process'lerde yapılır
+RENDER_WORKERS = int(os.getenv("RENDER_WORKERS", "2"))
+# Aynı anda çizilen + sırada bekleyen en fazla grafik sayısı
+RENDER_QUEUE_SIZE = int(os.getenv("RENDER_QUEUE_SIZE", "16"))
+
+# outputs/ saklama politikası: toplam boyut, en fazla yaş ve tarama aralığı
+OUTPUT_MAX_MB = float(os.getenv("OUTPUT_MAX_MB", "200"))
+OUTPUT_MAX_AGE_HOURS = float(os.getenv("OUTPUT_MAX_AGE_HOURS", "72"))
+OUTPUT_SWEEP_INTERVAL = float(os.getenv("OUTPUT_SWEEP_INTERVAL", "600"))
+
+# Saklama politikası yalnızca chart_filename'in ürettiği (içerik hash'li)
+# dosyalara ve onların geçici dosyalarına dokunur; elle konmuş veya eski
+# biçimdeki (zaman damgalı) dosyalar silinmez
+CHART_FILE_RE = re.compile(r"^(?:\.[0-9a-f]{32}\.)?[\w-]+_sentiment_[0-9a-f]{16}\.png$")
+
+
+# ———— Render worker (ayrı process içinde çalışır) ————
+def _init_render_worker() -> None:
+    # matplotlib'i önceden yükle; ilk grafikte soğuk başlangıç olmasın
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import matplotlib.dates  # noqa: F401
+    from matplotlib.backends import backend_agg  # noqa: F401
+    from matplotlib.figure import Figure  # noqa: F401
+
+
+def _warm_render_worker() -> int:
+    return os.getpid()
+
+
+def _render_png(
+    filepath: str, topic: str, times: List[datetime], scores: List[float]
+) -> str:
+    # pyplot'un global durumu yerine nesne tabanlı Figure API'si
+    import matplotlib.dates as mdates
+    from matplotlib.figure import Figure
+
+    fig = Figure()
+    ax = fig.subplots()
+    ax.plot(times, scores)
+    ax.set_title(f"Sentiment Trend for {topic}")
+    ax.set_xlabel("Time")
+    ax.set_ylabel("Sentiment Score")
+    ax.xaxis.set_major_formatter(mdates.DateFormatter("%H:%M\n%d-%m"))
+    fig.autofmt_xdate()
+    fig.savefig(filepath, bbox_inches="tight")
+    return filepath
+
+
+class RenderPool:
+    """
+    Grafikleri event loop dışında, matplotlib'i önceden yüklemiş bir process
+    havuzunda çizer. Sıra `queue_size` ile sınırlıdır; dolduğunda yeni
+    istekler event loop'u bloklamadan yer açılmasını bekler.
+    """
+
+    def __init__(
+        self, workers: int = RENDER_WORKERS, queue_size: int = RENDER_QUEUE_SIZE
+    ):
+        self.workers = workers
+        self.queue_size = queue_size
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+
+    async def start(self) -> None:
+        if self._executor is not None:
+            return
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers, initializer=_init_render_worker
+        )
+        self._slots = asyncio.Semaphore(self.queue_size)
+        # Tüm worker'ları şimdi başlat (ve matplotlib'i yüklet)
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(
+            *(
+                loop.run_in_executor(self._executor, _warm_render_worker)
+                for _ in range(self.workers)
+            )
+        )
+
+    async def render(
+        self, filepath: str, topic: str, times: List[datetime], scores: List[float]
+    ) -> str:
+        await self.start()
+        async with self._slots:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self._executor, _render_png, filepath, topic, times, scores
+            )
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+            self._slots = None
+
+
+render_pool = RenderPool()
+
+# Aynı grafik için eşzamanlı çizimler tek render'ı paylaşır
+_inflight: Dict[str, asyncio.Task] = {}
+
+
+def chart_filename(topic: str, times: List[datetime], scores: List[float]) -> str:
+    """
+    (konu, seri) içeriğinin hash'inden dosya adı üretir; aynı seri her zaman
+    aynı dosyaya karşılık gelir.
+    """
+    payload = json.dumps(
+        [topic, [t.isoformat() for t in times], scores], separators=(",", ":")
+    )
+    digest = hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+    slug = re.sub(r"[^\w-]+", "_", topic.lower()).strip("_") or "topic"
+    return f"{slug}_sentiment_{digest}.png"
+
+
+async def _render_to(
+    filepath: str, topic: str, times: List[datetime], scores: List[float]
+) -> None:
+    # Yarım yazılmış dosya servis edilmesin: önce geçici dosyaya çiz, sonra taşı
+    directory, filename = os.path.split(filepath)
+    tmp_path = os.path.join(directory, f".{uuid.uuid4().hex}.{filename}")
+    try:
+        await render_pool.render(tmp_path, topic, times, scores)
+        os.replace(tmp_path, filepath)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
 
 async def plot_sentiment_graph(topic: str, sentiments: List[Dict]) -> str:
     """
@@ -18,6 +156,7 @@ async def plot_sentiment_graph(topic: str, sentiments: List[Dict]) -> str:
     - topic: grafik dosyasının isminde kullanılır
     - sentiments: her item içinde 'publishedAt' (ISO str) ve 'sentiment_score'
     Dönüş: kaydedilen grafik dosyasının URL/path'i
+    Aynı (konu, seri) için grafik zaten varsa yeniden çizilmez.
     """
     # Zaman ve skorları ayıkla
     times = [
@@ -26,23 +165,94 @@ async def plot_sentiment_graph(topic: str, sentiments: List[Dict]) -> str:
     ]
     scores = [item["sentiment_score"] for item in sentiments]
 
-    # Grafik oluştur
-    plt.figure()
-    plt.plot(times, scores)
-    plt.title(f"Sentiment Trend for {topic}")
-    plt.xlabel("Time")
-    plt.ylabel("Sentiment Score")
-    plt.gca().xaxis.set_major_formatter(mdates.DateFormatter("%H:%M\n%d-%m"))
-    plt.gcf().autofmt_xdate()
-
-    # Kaydet
-    filename = (
-        f"{topic.lower()}_sentiment_{datetime.utcnow().strftime('%Y%m%d%H%M%S')}.png"
-    )
+    filename = chart_filename(topic, times, scores)
     filepath = os.path.join(OUTPUT_DIR, filename)
-    plt.savefig(filepath, bbox_inches="tight")
-    plt.close()
+
+    if os.path.exists(filepath):
+        # Saklama politikası LRU çalışır: kullanılan dosyanın zamanını güncelle
+        os.utime(filepath)
+    else:
+        task = _inflight.get(filename)
+        if task is None:
+            task = asyncio.ensure_future(_render_to(filepath, topic, times, scores))
+            _inflight[filename] = task
+            task.add_done_callback(lambda _: _inflight.pop(filename, None))
+        await asyncio.shield(task)
 
     # Eğer FastAPI static olarak outputs dizinini sunuyorsa path yeterli,
     # yoksa dış url ile değiştirebilirsin.
     return f"/{OUTPUT_DIR}/{filename}"
+
+
+def sweep_outputs(
+    directory: str = OUTPUT_DIR,
+    max_bytes: float = OUTPUT_MAX_MB * 1024 * 1024,
+    max_age: float = OUTPUT_MAX_AGE_HOURS * 3600,
+) -> Dict:
+    """
+    outputs/ klasöründeki grafikleri saklama politikasına göre temizler:
+    önce `max_age` saniyeden eski dosyalar, ardından toplam boyut `max_bytes`
+    altına inene kadar en uzun süredir kullanılmayanlar silinir. Yalnızca
+    içerik hash'li grafik dosyaları (CHART_FILE_RE) hesaba katılır.
+    """
+    now = time.time()
+    entries = []
+    deleted = 0
+    freed = 0
+    for entry in os.scandir(directory):
+        if not entry.is_file() or not CHART_FILE_RE.match(entry.name):
+            continue
+        stat = entry.stat()
+        # Yarım kalmış geçici dosyalar bir saat sonra silinir
+        limit = 3600 if entry.name.startswith(".") else max_age
+        if now - stat.st_mtime > limit:
+            try:
+                os.remove(entry.path)
+            except FileNotFoundError:
+                continue
+            deleted += 1
+            freed += stat.st_size
+        elif not entry.name.startswith("."):
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        total -= size
+        deleted += 1
+        freed += size
+
+    return {"deleted": deleted, "freed_bytes": freed, "remaining_bytes": total}
+
+
+_retention_task: Optional[asyncio.Task] = None
+
+
+async def _retention_loop(interval: float) -> None:
+    while True:
+        try:
+            result = await asyncio.to_thread(sweep_outputs)
+            if result["deleted"]:
+                logger.info("outputs temizlendi: %s", result)
+        except Exception:
+            logger.exception("outputs temizlenemedi")
+        await asyncio.sleep(interval)
+
+
+def start_output_retention(interval: float = OUTPUT_SWEEP_INTERVAL) -> None:
+    global _retention_task
+    if _retention_task is None:
+        _retention_task = asyncio.create_task(_retention_loop(interval))
+
+
+async def stop_output_retention() -> None:
+    global _retention_task
+    if _retention_task is not None:
+        _retention_task.cancel()
+        await asyncio.gather(_retention_task, return_exceptions=True)
+        _retention_task = None
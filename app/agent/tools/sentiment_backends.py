@@ -0,0 +1,309 @@
+import asyncio
+import hashlib
+import importlib
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+from dotenv import load_dotenv
+
+from app.agent.tools.lexicon import Lexicon, get_lexicon
+from app.agent.tools.sentiment_tool import (
+    NEGATIVE_THRESHOLD,
+    POSITIVE_THRESHOLD,
+    _article_text,
+    score_batch,
+)
+from app.utils.http_client import request_with_retry
+
+load_dotenv()
+
+# Kullanılacak backend: "lexicon" (varsayılan), "local" veya "http"
+SENTIMENT_BACKEND = os.getenv("SENTIMENT_BACKEND", "lexicon")
+
+# ———— Local model ————
+# SENTIMENT_MODEL_LOADER "paket.modul:fonksiyon" formatındadır; fonksiyon model
+# yolunu alır ve metin listesini [0.0–1.0] skor listesine çeviren bir callable döner.
+SENTIMENT_MODEL_LOADER = os.getenv("SENTIMENT_MODEL_LOADER", "")
+SENTIMENT_MODEL_PATH = os.getenv("SENTIMENT_MODEL_PATH", "models/sentiment.bin")
+SENTIMENT_WORKERS = int(os.getenv("SENTIMENT_WORKERS", "1"))
+
+# ———— Remote REST API ————
+SENTIMENT_API_URL = os.getenv("SENTIMENT_API_URL", "http://localhost:5000/analyze")
+# Servisteki model değişince artırılır; saklanan skorlar yeniden hesaplanır
+SENTIMENT_API_VERSION = os.getenv("SENTIMENT_API_VERSION", "")
+
+# Eşzamanlı isteklerden gelen metinler tek çağrıda birleştirilir
+SENTIMENT_MAX_BATCH = int(os.getenv("SENTIMENT_MAX_BATCH", "64"))
+SENTIMENT_BATCH_WAIT_MS = float(os.getenv("SENTIMENT_BATCH_WAIT_MS", "10"))
+
+
+def build_results(news_items: List[Dict], scores: List[float], backend: str) -> List[Dict]:
+    """
+    Model skorlarını analyze_sentiments çıktı formatına çevirir.
+    """
+    results = []
+    for item, score in zip(news_items, scores):
+        score = min(max(float(score), 0.0), 1.0)
+        if score >= POSITIVE_THRESHOLD:
+            label = "positive"
+        elif score <= NEGATIVE_THRESHOLD:
+            label = "negative"
+        else:
+            label = "neutral"
+        results.append({
+            **item,
+            "sentiment_score": round(score, 3),
+            "sentiment_label": label,
+            "analysis_details": {"backend": backend, "raw_score": score},
+        })
+    return results
+
+
+class MicroBatcher:
+    """
+    Eşzamanlı çağrılardan gelen metinleri kısa bir süre biriktirip tek bir
+    çıkarım çağrısında işler ve sonuçları çağıranlara geri dağıtır.
+    - run_batch: metin listesini skor listesine çeviren async fonksiyon
+    - max_batch: bu sayıya ulaşılınca beklemeden gönderilir
+    - max_wait: ilk metinden sonra en fazla bekleme süresi (saniye)
+    """
+
+    def __init__(
+        self,
+        run_batch: Callable[[List[str]], Awaitable[List[float]]],
+        max_batch: int = SENTIMENT_MAX_BATCH,
+        max_wait: float = SENTIMENT_BATCH_WAIT_MS / 1000,
+    ):
+        self._run_batch = run_batch
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self._pending: List[Tuple[List[str], asyncio.Future]] = []
+        self._pending_size = 0
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks = set()
+        self.batches = 0
+
+    async def submit(self, texts: List[str]) -> List[float]:
+        if not texts:
+            return []
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((texts, future))
+        self._pending_size += len(texts)
+
+        if self._pending_size >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        self._pending_size = 0
+        if batch:
+            task = asyncio.ensure_future(self._run(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: List[Tuple[List[str], asyncio.Future]]) -> None:
+        texts = [text for chunk, _ in batch for text in chunk]
+        self.batches += 1
+        try:
+            scores = await self._run_batch(texts)
+            if len(scores) != len(texts):
+                raise ValueError(
+                    f"Beklenen {len(texts)} skor, gelen {len(scores)} skor"
+                )
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        offset = 0
+        for chunk, future in batch:
+            if not future.done():
+                future.set_result(scores[offset : offset + len(chunk)])
+            offset += len(chunk)
+
+
+class SentimentBackend:
+    """
+    analyze_sentiments'in kullandığı backend arayüzü.
+    """
+
+    name = "base"
+
+    @property
+    def version(self) -> str:
+        """
+        Skorları etkileyen ayarların (sözlük, model, servis) kimliği.
+        """
+        return ""
+
+    @property
+    def scorer_key(self) -> str:
+        """
+        Article store'da saklanan skorların hangi skorlayıcıdan geldiği:
+        backend adı, sürümü ve label eşikleri. Biri değişirse haberler
+        yeniden skorlanır.
+        """
+        digest = hashlib.sha1(
+            f"{self.version}|{POSITIVE_THRESHOLD}|{NEGATIVE_THRESHOLD}".encode("utf-8")
+        ).hexdigest()[:12]
+        return f"{self.name}:{digest}"
+
+    async def analyze(self, news_items: List[Dict]) -> List[Dict]:
+        raise NotImplementedError
+
+    async def aclose(self) -> None:
+        pass
+
+
+class LexiconBackend(SentimentBackend):
+    """
+    Sözlük tabanlı yerleşik skorlayıcı.
+    """
+
+    name = "lexicon"
+
+    def __init__(self, lexicon: Lexicon = None):
+        self.lexicon = lexicon or get_lexicon()
+
+    @property
+    def version(self) -> str:
+        return self.lexicon.fingerprint
+
+    async def analyze(self, news_items: List[Dict]) -> List[Dict]:
+        return score_batch(news_items, self.lexicon).to_dicts(news_items)
+
+
+# ———— Local model worker (ayrı process içinde çalışır) ————
+_worker_predict = None
+
+
+def _init_model_worker(loader: str, model_path: str) -> None:
+    # Sadece CPU: GPU'ları worker'a gösterme
+    os.environ["CUDA_VISIBLE_DEVICES"] = ""
+    global _worker_predict
+    module_name, _, func_name = loader.partition(":")
+    load_model = getattr(importlib.import_module(module_name), func_name or "load_model")
+    _worker_predict = load_model(model_path)
+
+
+def _model_version(loader: str, model_path: str) -> str:
+    # Model dosyası değişince (boyut/zaman) sürüm de değişir
+    try:
+        stat = os.stat(model_path)
+        file_id = f"{stat.st_size}:{stat.st_mtime_ns}"
+    except OSError:
+        file_id = ""
+    return f"{loader}|{model_path}|{file_id}"
+
+
+def _predict_in_worker(texts: List[str]) -> List[float]:
+    return [float(score) for score in _worker_predict(texts)]
+
+
+class LocalModelBackend(SentimentBackend):
+    """
+    Process pool içinde yüklenen yerel (CPU) model ile skorlama yapar.
+    Model her worker'da bir kez yüklenir; eşzamanlı istekler mikro-batch'lenir,
+    böylece event loop çıkarım sırasında bloklanmaz.
+    """
+
+    name = "local"
+
+    def __init__(
+        self,
+        loader: str = SENTIMENT_MODEL_LOADER,
+        model_path: str = SENTIMENT_MODEL_PATH,
+        workers: int = SENTIMENT_WORKERS,
+    ):
+        if not loader:
+            raise ValueError("SENTIMENT_MODEL_LOADER environment variable is required")
+        self._pool = ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_model_worker,
+            initargs=(loader, model_path),
+        )
+        self.batcher = MicroBatcher(self._predict)
+        self._version = _model_version(loader, model_path)
+
+    @property
+    def version(self) -> str:
+        return self._version
+
+    async def _predict(self, texts: List[str]) -> List[float]:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._pool, _predict_in_worker, texts)
+
+    async def analyze(self, news_items: List[Dict]) -> List[Dict]:
+        scores = await self.batcher.submit([_article_text(item) for item in news_items])
+        return build_results(news_items, scores, self.name)
+
+    async def aclose(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+class HttpBackend(SentimentBackend):
+    """
+    SENTIMENT_API_URL üzerindeki servise toplu istek atar. Bağlantılar
+    uygulamanın paylaşılan httpx client havuzundan kullanılır.
+    İstek: {"texts": [...]}  Yanıt: {"scores": [...]} (her biri 0.0–1.0)
+    """
+
+    name = "http"
+
+    def __init__(self, url: str = SENTIMENT_API_URL):
+        self.url = url
+        self.batcher = MicroBatcher(self._post)
+
+    @property
+    def version(self) -> str:
+        # Servisin modeli buradan görülemez; SENTIMENT_API_VERSION ile belirtilir
+        return f"{self.url}|{SENTIMENT_API_VERSION}"
+
+    async def _post(self, texts: List[str]) -> List[float]:
+        resp = await request_with_retry("POST", self.url, json={"texts": texts})
+        resp.raise_for_status()
+        return resp.json()["scores"]
+
+    async def analyze(self, news_items: List[Dict]) -> List[Dict]:
+        scores = await self.batcher.submit([_article_text(item) for item in news_items])
+        return build_results(news_items, scores, self.name)
+
+
+BACKENDS = {
+    LexiconBackend.name: LexiconBackend,
+    LocalModelBackend.name: LocalModelBackend,
+    HttpBackend.name: HttpBackend,
+}
+
+_backend: Optional[SentimentBackend] = None
+
+
+def create_sentiment_backend(name: str) -> SentimentBackend:
+    if name not in BACKENDS:
+        raise ValueError(f"Bilinmeyen sentiment backend: {name}")
+    return BACKENDS[name]()
+
+
+def get_sentiment_backend() -> SentimentBackend:
+    """
+    SENTIMENT_BACKEND ile seçilen paylaşılan backend'i döner.
+    """
+    global _backend
+    if _backend is None:
+        _backend = create_sentiment_backend(SENTIMENT_BACKEND)
+    return _backend
+
+
+async def close_sentiment_backend() -> None:
+    global _backend
+    if _backend is not None:
+        await _backend.aclose()
+        _backend = None
@@ -0,0 +1,257 @@
+import heapq
+import math
+import os
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Iterable, Optional, Tuple
+from dotenv import load_dotenv
+
+from app.agent.article_store import article_key
+
+load_dotenv()
+
+# Yarılanma süresi (saat): bu kadar eski haber yeni habere göre yarı ağırlık
+# alır. 0 ağırlıksız düz ortalamadır. Karar konu için biriken haberlerin
+# (en fazla SENTIMENT_MAX_ARTICLES) özetinden verilir.
+SENTIMENT_HALF_LIFE_HOURS = float(os.getenv("SENTIMENT_HALF_LIFE_HOURS", "24"))
+# Konu başına özette tutulan en fazla haber; taşan en eski haber özetten çıkar
+SENTIMENT_MAX_ARTICLES = int(os.getenv("SENTIMENT_MAX_ARTICLES", "5000"))
+# Bellekte tutulan en fazla konu
+SENTIMENT_MAX_TOPICS = int(os.getenv("SENTIMENT_MAX_TOPICS", "1000"))
+# Ağırlığı bunun altına düşen (≈10 yarılanma) haber özetten çıkarılır
+SENTIMENT_MIN_WEIGHT = float(os.getenv("SENTIMENT_MIN_WEIGHT", "0.001"))
+
+LABELS = ("positive", "negative", "neutral")
+
+
+def _timestamp(published_at: Optional[str]) -> Optional[float]:
+    if not published_at:
+        return None
+    try:
+        return datetime.fromisoformat(published_at.replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return None
+
+
+# Özetten çıkarmak için saklanan haber kaydı: (etkin yayın zamanı, skor, label)
+Entry = Tuple[Optional[float], float, Optional[str]]
+
+
+class SentimentAggregate:
+    """
+    Haber skorlarının O(1) güncellenen özet istatistikleri.
+
+    Ağırlıklı toplamlar (w, w·x, w·x²) ve label başına ağırlıklar tutulur;
+    ortalama, varyans ve label payları bunlardan okunur. Yarılanma süresi
+    verilmişse ağırlık publishedAt'e göre 2^((t - t_son) / yarılanma) olur:
+    yeni bir haber geldiğinde toplamlar tek çarpımla ölçeklenir, sıra dışı
+    gelen eski haberler düşük ağırlıkla eklenir. Yayın zamanı olmayan haber
+    en güncel kabul edilir. add() dönen kayıtla haber remove() ile özetten
+    aynı ağırlıkla çıkarılabilir (kayan pencere).
+    """
+
+    def __init__(self, half_life_hours: float = SENTIMENT_HALF_LIFE_HOURS):
+        self.half_life = half_life_hours * 3600
+        self.count = 0
+        self.label_counts: Dict[str, int] = {label: 0 for label in LABELS}
+        self.version = 0
+        self.latest: Optional[float] = None
+        self._weight = 0.0
+        self._sum = 0.0
+        self._sum_sq = 0.0
+        self._label_weights: Dict[str, float] = {label: 0.0 for label in LABELS}
+
+    @classmethod
+    def from_items(
+        cls, sentiments: Iterable[Dict], half_life_hours: float = SENTIMENT_HALF_LIFE_HOURS
+    ) -> "SentimentAggregate":
+        aggregate = cls(half_life_hours)
+        aggregate.extend(sentiments)
+        return aggregate
+
+    def weight_of(self, published: Optional[float]) -> float:
+        """
+        Etkin yayın zamanı `published` olan haberin şu anki ağırlığı.
+        """
+        if self.half_life <= 0 or published is None or self.latest is None:
+            return 1.0
+        return 2.0 ** ((published - self.latest) / self.half_life)
+
+    def _advance(self, published: Optional[float]) -> Optional[float]:
+        # Haberin etkin yayın zamanını döner; gerekirse referansı ileri taşır
+        if self.half_life <= 0:
+            return None
+        if published is None:
+            published = self.latest if self.latest is not None else time.time()
+        if self.latest is None:
+            self.latest = published
+        elif published > self.latest:
+            # Referansı yeni habere taşı: eski toplamlar yarılanma oranında küçülür
+            factor = 2.0 ** ((self.latest - published) / self.half_life)
+            self._weight *= factor
+            self._sum *= factor
+            self._sum_sq *= factor
+            for label in self._label_weights:
+                self._label_weights[label] *= factor
+            self.latest = published
+        return published
+
+    def _apply(self, entry: Entry, sign: int) -> None:
+        published, score, label = entry
+        weight = sign * self.weight_of(published)
+        self._weight += weight
+        self._sum += weight * score
+        self._sum_sq += weight * score * score
+        self._label_weights[label] = self._label_weights.get(label, 0.0) + weight
+        self.count += sign
+        self.label_counts[label] = self.label_counts.get(label, 0) + sign
+        self.version += 1
+
+    def add(self, item: Dict) -> Entry:
+        published = self._advance(_timestamp(item.get("publishedAt")))
+        entry = (published, float(item.get("sentiment_score", 0)), item.get("sentiment_label"))
+        self._apply(entry, 1)
+        return entry
+
+    def remove(self, entry: Entry) -> None:
+        """
+        add()'in döndüğü kaydı özetten çıkarır.
+        """
+        self._apply(entry, -1)
+        if self.count == 0:
+            # Kayan nokta artıklarını sıfırla
+            self._weight = self._sum = self._sum_sq = 0.0
+            self._label_weights = {label: 0.0 for label in self._label_weights}
+
+    def extend(self, sentiments: Iterable[Dict]) -> None:
+        for item in sentiments:
+            self.add(item)
+
+    @property
+    def mean(self) -> float:
+        return self._sum / self._weight if self._weight > 1e-12 else 0.0
+
+    @property
+    def variance(self) -> float:
+        if self._weight <= 1e-12:
+            return 0.0
+        return max(self._sum_sq / self._weight - self.mean**2, 0.0)
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.variance)
+
+    @property
+    def label_shares(self) -> Dict[str, float]:
+        """
+        Label'ların ortalamayla aynı ağırlıklarla hesaplanan payları.
+        """
+        if self._weight <= 1e-12:
+            return {label: 0.0 for label in self._label_weights}
+        return {
+            label: max(weight, 0.0) / self._weight
+            for label, weight in self._label_weights.items()
+        }
+
+    @property
+    def positive(self) -> int:
+        return self.label_counts.get("positive", 0)
+
+    @property
+    def negative(self) -> int:
+        return self.label_counts.get("negative", 0)
+
+    @property
+    def neutral(self) -> int:
+        return self.label_counts.get("neutral", 0)
+
+    def snapshot(self) -> Dict:
+        return {
+            "count": self.count,
+            "mean": round(self.mean, 4),
+            "std": round(self.std, 4),
+            "label_counts": dict(self.label_counts),
+            "label_shares": {k: round(v, 4) for k, v in self.label_shares.items()},
+            "half_life_hours": self.half_life / 3600,
+            "version": self.version,
+        }
+
+
+class TopicAggregates:
+    """
+    Konu başına sürekli güncellenen SentimentAggregate'ler.
+
+    Aynı haber (URL veya içerik hash'i) bir konuya yalnızca bir kez eklenir;
+    böylece her yenilemede yalnızca yeni haberler işlenir. Özet kayan bir
+    penceredir: `max_articles`'ı aşan en eski haber ve ağırlığı `min_weight`
+    altına düşen haber hem özetten hem görülenler listesinden birlikte
+    çıkar; sayılar ve ortalama her zaman aynı haber kümesine aittir.
+    """
+
+    def __init__(
+        self,
+        half_life_hours: float = SENTIMENT_HALF_LIFE_HOURS,
+        max_articles: int = SENTIMENT_MAX_ARTICLES,
+        max_topics: int = SENTIMENT_MAX_TOPICS,
+        min_weight: float = SENTIMENT_MIN_WEIGHT,
+    ):
+        self.half_life_hours = half_life_hours
+        self.max_articles = max_articles
+        self.max_topics = max_topics
+        self.min_weight = min_weight
+        # konu -> (özet, {haber anahtarı: kayıt}, [(etkin zaman, anahtar)] heap)
+        self._topics: "OrderedDict[str, tuple]" = OrderedDict()
+
+    def get(self, topic: str) -> Optional[SentimentAggregate]:
+        entry = self._topics.get(topic.strip().lower())
+        return entry[0] if entry else None
+
+    def update(self, topic: str, sentiments: Iterable[Dict]) -> SentimentAggregate:
+        """
+        Daha önce görülmemiş haberleri konunun özetine ekler, pencereden
+        düşenleri çıkarır ve özeti döner.
+        """
+        key = topic.strip().lower()
+        entry = self._topics.get(key)
+        if entry is None:
+            entry = self._topics[key] = (SentimentAggregate(self.half_life_hours), OrderedDict(), [])
+        self._topics.move_to_end(key)
+        aggregate, seen, by_time = entry
+
+        for item in sentiments:
+            item_key = article_key(item)
+            if item_key in seen:
+                continue
+            record = seen[item_key] = aggregate.add(item)
+            if record[0] is not None:
+                heapq.heappush(by_time, (record[0], item_key))
+
+        while len(seen) > self.max_articles:
+            _, record = seen.popitem(last=False)
+            aggregate.remove(record)
+        self._expire(aggregate, seen, by_time)
+
+        while len(self._topics) > self.max_topics:
+            self._topics.popitem(last=False)
+        return aggregate
+
+    def _expire(self, aggregate: SentimentAggregate, seen: Dict, by_time: list) -> None:
+        # Ağırlığı ihmal edilebilir hale gelen haberleri özetten çıkar
+        if aggregate.half_life <= 0 or aggregate.latest is None or self.min_weight <= 0:
+            by_time.clear()
+            return
+        cutoff = aggregate.latest + aggregate.half_life * math.log2(self.min_weight)
+        while by_time and by_time[0][0] < cutoff:
+            published, item_key = heapq.heappop(by_time)
+            record = seen.get(item_key)
+            if record is not None and record[0] == published:
+                del seen[item_key]
+                aggregate.remove(record)
+        if len(by_time) > 2 * len(seen) + 64:
+            # Pencereden sayıyla düşenlerin artıklarını temizle
+            by_time[:] = [(record[0], k) for k, record in seen.items() if record[0] is not None]
+            heapq.heapify(by_time)
+
+
+topic_aggregates = TopicAggregates()
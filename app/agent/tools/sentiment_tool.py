@@ -1,100 +1,156 @@
-import os
-from typing import List, Dict
+from typing import List, Dict, Tuple
 from dotenv import load_dotenv
-import httpx  # Eğer dış bir servis kullanacaksan
 
 load_dotenv()
 
-# ———— OPTION A: Local Python Model ————
-# from your_sentiment_pkg import load_model, predict
-# MODEL_PATH = os.getenv("SENTIMENT_MODEL_PATH", "models/sentiment.bin")
-# model = load_model(MODEL_PATH)
-
-# ———— OPTION B: Remote REST API ————
-# SENTIMENT_API_URL = os.getenv("SENTIMENT_API_URL", "http://localhost:5000/analyze")
+# Yerel model ve uzak REST API seçenekleri için bkz. sentiment_backends.py
+# (SENTIMENT_BACKEND=lexicon|local|http)
 
 
 # app/agent/tools/sentiment_tool.py
 
-import re
-from typing import List, Dict
+from dataclasses import dataclass
+
+import numpy as np
+
+from app.agent.tools.lexicon import Lexicon, get_lexicon
+
+# Label eşikleri
+POSITIVE_THRESHOLD = 0.6
+NEGATIVE_THRESHOLD = 0.4
+LABELS = np.array(["negative", "neutral", "positive"])
 
 
-async def analyze_sentiments(news_items: List[Dict]) -> List[Dict]:
+def _article_text(item: Dict) -> str:
+    # Haber metnini birleştir
+    text = ""
+    if item.get('title'):
+        text += item['title'] + " "
+    if item.get('description'):
+        text += item['description'] + " "
+    return text
+
+
+@dataclass
+class SentimentBatch:
+    """
+    Kolon bazlı sentiment sonuçları.
+
+    Tüm diziler aynı uzunluktadır; `index[i]`, i. satırın kaynak haber
+    listesindeki konumudur. Haber başına dict'ler yalnızca `to_dicts`
+    çağrıldığında üretilir.
+    """
+
+    index: np.ndarray
+    scores: np.ndarray
+    label_codes: np.ndarray
+    positive: np.ndarray
+    negative: np.ndarray
+    total_words: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    @property
+    def labels(self) -> np.ndarray:
+        return LABELS[self.label_codes]
+
+    def ratios(self) -> Tuple[np.ndarray, np.ndarray]:
+        total = np.maximum(self.total_words, 1)
+        has_words = self.total_words > 0
+        return (
+            np.where(has_words, self.positive / total, 0.0),
+            np.where(has_words, self.negative / total, 0.0),
+        )
+
+    def to_dicts(self, news_items: List[Dict]) -> List[Dict]:
+        """
+        analyze_sentiments ile aynı formatta haber başına sonuç listesi üretir.
+        """
+        positive_ratio, negative_ratio = self.ratios()
+        scores = self.scores.tolist()
+        labels = self.labels.tolist()
+        positive = self.positive.tolist()
+        negative = self.negative.tolist()
+        total_words = self.total_words.tolist()
+        positive_ratio = positive_ratio.tolist()
+        negative_ratio = negative_ratio.tolist()
+
+        results = []
+        for row, source in enumerate(self.index.tolist()):
+            results.append({
+                **news_items[source],
+                "sentiment_score": scores[row],
+                "sentiment_label": labels[row],
+                "analysis_details": {
+                    "positive_words_found": positive[row],
+                    "negative_words_found": negative[row],
+                    "total_words": total_words[row],
+                    "positive_ratio": positive_ratio[row],
+                    "negative_ratio": negative_ratio[row],
+                },
+            })
+        return results
+
+
+def score_batch(news_items: List[Dict], lexicon: Lexicon = None) -> SentimentBatch:
+    """
+    Haber listesini toplu olarak skorlar.
+
+    Haberler tek geçişte terim id'lerine ayrılır; (haber, terim) eşleşmeleri
+    seyrek bir terim-sayım matrisi oluşturur ve ağırlık vektörüyle çarpımı
+    np.bincount ile hesaplanır. Skor ve label hesabı dizi işlemleriyle yapılır.
+    """
+    if lexicon is None:
+        lexicon = get_lexicon()
+
+    n = len(news_items)
+    rows: List[int] = []
+    term_ids: List[int] = []
+    total_words = np.zeros(n, dtype=np.int64)
+    for row, item in enumerate(news_items):
+        ids, total = lexicon.match_ids(_article_text(item))
+        rows.extend([row] * len(ids))
+        term_ids.extend(ids)
+        total_words[row] = total
+
+    weights = np.asarray(lexicon.weights, dtype=np.float64)[term_ids]
+    positive = np.bincount(rows, weights=np.clip(weights, 0.0, None), minlength=n)
+    negative = np.bincount(rows, weights=np.clip(-weights, 0.0, None), minlength=n)
+
+    # Skor: 0.5 ± 2 × (oran farkı), [0.0, 1.0] aralığına kırpılır; eşitlikte nötr
+    total = np.maximum(total_words, 1)
+    ratio_diff = np.where(total_words > 0, (positive - negative) / total, 0.0)
+    scores = np.where(
+        positive == negative, 0.5, np.clip(0.5 + ratio_diff * 2, 0.0, 1.0)
+    )
+
+    # Label belirle: 0 = negative, 1 = neutral, 2 = positive
+    label_codes = np.ones(n, dtype=np.int8)
+    label_codes[scores >= POSITIVE_THRESHOLD] = 2
+    label_codes[scores <= NEGATIVE_THRESHOLD] = 0
+
+    return SentimentBatch(
+        index=np.arange(n),
+        scores=np.round(scores, 3),
+        label_codes=label_codes,
+        positive=positive,
+        negative=negative,
+        total_words=total_words,
+    )
+
+
+async def analyze_sentiments(
+    news_items: List[Dict], lexicon: Lexicon = None
+) -> List[Dict]:
     """
     Gerçek sentiment analizi: haber içeriğine göre duygu skoru hesaplar.
+    - lexicon: verilirse doğrudan bu sözlükle skorlanır; verilmezse
+      SENTIMENT_BACKEND ile seçilen backend kullanılır
     """
-    results = []
-    
-    # Finansal pozitif/negatif kelimeler
-    positive_words = [
-        'yükseldi', 'arttı', 'büyüdü', 'kazanç', 'profit', 'gain', 'rise', 'up', 'positive',
-        'olumlu', 'iyi', 'güçlü', 'başarılı', 'rekor', 'record', 'high', 'peak', 'bullish',
-        'satın al', 'buy', 'yükseliş', 'rally', 'momentum', 'güven', 'confidence', 'optimist',
-        'büyüme', 'growth', 'revenue', 'gelir', 'kazanç', 'earnings', 'beat', 'üstün'
-    ]
-    
-    negative_words = [
-        'düştü', 'azaldı', 'kayıp', 'loss', 'drop', 'down', 'negative', 'olumsuz', 'kötü',
-        'zayıf', 'başarısız', 'düşüş', 'crash', 'bearish', 'sat', 'sell', 'panik', 'panic',
-        'korku', 'fear', 'risk', 'tehlike', 'düşük', 'low', 'minimum', 'kayıp', 'loss',
-        'zarar', 'damage', 'problem', 'sorun', 'kriz', 'crisis', 'iflas', 'bankruptcy'
-    ]
-    
-    for item in news_items:
-        # Haber metnini birleştir
-        text = ""
-        if item.get('title'):
-            text += item['title'] + " "
-        if item.get('description'):
-            text += item['description'] + " "
-        
-        text = text.lower()
-        
-        # Pozitif ve negatif kelime sayısını hesapla
-        positive_count = sum(1 for word in positive_words if word in text)
-        negative_count = sum(1 for word in negative_words if word in text)
-        
-        # Sentiment skoru hesapla
-        total_words = len(text.split())
-        if total_words > 0:
-            positive_ratio = positive_count / total_words
-            negative_ratio = negative_count / total_words
-            
-            # Skor hesaplama (0.0 - 1.0 arası)
-            if positive_count > negative_count:
-                score = 0.5 + (positive_ratio - negative_ratio) * 2
-                score = min(score, 1.0)
-            elif negative_count > positive_count:
-                score = 0.5 - (negative_ratio - positive_ratio) * 2
-                score = max(score, 0.0)
-            else:
-                score = 0.5  # Nötr
-        else:
-            score = 0.5
-        
-        # Label belirle
-        if score >= 0.6:
-            label = "positive"
-        elif score <= 0.4:
-            label = "negative"
-        else:
-            label = "neutral"
-        
-        # Detaylı analiz bilgisi
-        analysis_info = {
-            "positive_words_found": positive_count,
-            "negative_words_found": negative_count,
-            "total_words": total_words,
-            "positive_ratio": positive_ratio if total_words > 0 else 0,
-            "negative_ratio": negative_ratio if total_words > 0 else 0
-        }
-        
-        results.append({
-            **item, 
-            "sentiment_score": round(score, 3), 
-            "sentiment_label": label,
-            "analysis_details": analysis_info
-        })
-    
-    return results
+    if lexicon is not None:
+        return score_batch(news_items, lexicon).to_dicts(news_items)
+
+    from app.agent.tools.sentiment_backends import get_sentiment_backend
+
+    return await get_sentiment_backend().analyze(news_items)
@@ -0,0 +1,164 @@
+import difflib
+import os
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Set, Tuple
+from dotenv import load_dotenv
+
+from app.intent_engine import Symbol, get_intent_engine
+from app.utils.phrase_index import tokenize
+
+load_dotenv()
+
+# Bulanık eşleşme için en düşük benzerlik (0-1); 1 ise kapalı
+SYMBOL_FUZZY_CUTOFF = float(os.getenv("SYMBOL_FUZZY_CUTOFF", "0.85"))
+# Çözümlenen konuların cache boyutu
+SYMBOL_CACHE_SIZE = int(os.getenv("SYMBOL_CACHE_SIZE", "4096"))
+
+QUOTE_ASSET = "USDT"
+
+_MISSING = object()
+
+
+class SymbolResolver:
+    """
+    Kullanıcının yazdığı konudan ("bitcoin", "Ethereum", "btc") işlem
+    çiftine ("BTCUSDT") giden yerel indeks.
+
+    Sırasıyla: doğrudan çift/ticker, alias tablosu (symbols.csv), alias ve
+    ticker'lar üzerinde bulanık eşleşme. Borsanın exchangeInfo'su
+    yüklendiyse yalnızca işlem gören çiftler kabul edilir; yüklenmediyse
+    yalnızca alias tablosundaki kripto semboller (ve onların çiftleri,
+    "BTCUSDT") kabul edilir. Bulanık eşleşmeler ("btcd" -> BTCUSDT) yalnızca
+    öneri/manuel kullanım içindir; emir yolları resolve(topic, fuzzy=False)
+    çağırır. Sonuçlar (bulunamayanlar dahil) cache'lenir; borsa listesi
+    güncellenince cache sıfırlanır. Hiçbir adım ağ çağrısı yapmaz.
+    """
+
+    def __init__(
+        self,
+        quote: str = QUOTE_ASSET,
+        fuzzy_cutoff: float = SYMBOL_FUZZY_CUTOFF,
+        cache_size: int = SYMBOL_CACHE_SIZE,
+    ):
+        self.quote = quote
+        self.fuzzy_cutoff = fuzzy_cutoff
+        self.cache_size = cache_size
+        self._aliases: Optional[Dict[str, Symbol]] = None
+        self._pairs: Optional[Set[str]] = None  # None: borsa listesi henüz yok
+        self._fuzzy_keys: list = []
+        # konu -> (çift, bulanık eşleşme mi)
+        self._cache: "OrderedDict[str, Tuple[Optional[str], bool]]" = OrderedDict()
+        self.misses = 0
+
+    def _alias_table(self) -> Dict[str, Symbol]:
+        if self._aliases is None:
+            self._aliases = get_intent_engine().symbols.aliases()
+            self._rebuild_fuzzy_keys()
+        return self._aliases
+
+    def _rebuild_fuzzy_keys(self) -> None:
+        keys = set(self._aliases or ())
+        if self._pairs:
+            keys.update(pair[: -len(self.quote)].lower() for pair in self._pairs)
+        self._fuzzy_keys = sorted(keys)
+
+    def update_pairs(self, pairs: Iterable[str]) -> None:
+        """
+        Borsada işlem gören çiftleri (exchangeInfo'dan) günceller.
+        """
+        self._pairs = {p for p in pairs if p.endswith(self.quote)}
+        self._alias_table()
+        self._rebuild_fuzzy_keys()
+        self._cache.clear()
+
+    def _tradable(self, base: str) -> Optional[str]:
+        if base.upper() == self.quote:
+            # USDTUSDT gibi kendi kendine çift olmaz
+            return None
+        pair = f"{base.upper()}{self.quote}"
+        if self._pairs is None:
+            return pair
+        return pair if pair in self._pairs else None
+
+    def _symbol_pair(self, symbol: Symbol) -> Optional[str]:
+        # Borsa listesi yokken hisse/emtia gibi kripto dışı semboller reddedilir
+        if self._pairs is None and symbol.kind and symbol.kind != "crypto":
+            return None
+        return self._tradable(symbol.ticker)
+
+    def _lookup(self, key: str) -> Tuple[Optional[str], bool]:
+        aliases = self._alias_table()
+
+        # 1. Doğrudan çift (BTCUSDT) veya borsadaki ticker
+        upper = key.upper()
+        if self._pairs is not None:
+            if upper in self._pairs:
+                return upper, False
+            if f"{upper}{self.quote}" in self._pairs:
+                return f"{upper}{self.quote}", False
+
+        # 2. Alias tablosu; borsa listesi yokken "btcusdt" gibi çiftler de
+        # alias'ın ticker'ı üzerinden kabul edilir
+        symbol = aliases.get(key)
+        if symbol is None and self._pairs is None and key.endswith(self.quote.lower()):
+            symbol = aliases.get(key[: -len(self.quote)])
+            if symbol is not None and symbol.ticker.upper() != upper[: -len(self.quote)]:
+                symbol = None
+        if symbol is not None:
+            return self._symbol_pair(symbol), False
+
+        # 3. Bulanık eşleşme ("bitcon" -> bitcoin); yalnızca öneri içindir
+        if self.fuzzy_cutoff < 1:
+            match = difflib.get_close_matches(key, self._fuzzy_keys, n=1, cutoff=self.fuzzy_cutoff)
+            if match:
+                symbol = aliases.get(match[0])
+                pair = self._symbol_pair(symbol) if symbol else self._tradable(match[0])
+                if pair is not None:
+                    return pair, True
+        return None, False
+
+    def resolve(self, topic: str, fuzzy: bool = True) -> Optional[str]:
+        """
+        Konunun işlem çiftini ("BTCUSDT") döner; bulunamazsa None.
+        - fuzzy: False ise bulanık eşleşmeler kabul edilmez (emir yolları)
+        """
+        key = " ".join(tokenize(topic))
+        entry = self._cache.get(key, _MISSING)
+        if entry is not _MISSING:
+            self._cache.move_to_end(key)
+        else:
+            entry = self._lookup(key) if key else (None, False)
+            if entry[0] is None:
+                self.misses += 1
+            self._cache[key] = entry
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        pair, is_fuzzy = entry
+        return None if is_fuzzy and not fuzzy else pair
+
+    def suggest(self, topic: str) -> Optional[str]:
+        """
+        Kesin çözümlenemeyen konu için bulanık eşleşmeyle önerilen çift.
+        """
+        pair = self.resolve(topic)
+        return pair if pair != self.resolve(topic, fuzzy=False) else None
+
+    def rejection(self, topic: str) -> Dict:
+        """
+        Çözümlenemeyen konu için emir sonucu; varsa öneriyi de içerir.
+        """
+        result = {"status": "rejected", "reason": f"'{topic}' için işlem çifti bulunamadı"}
+        suggestion = self.suggest(topic)
+        if suggestion is not None:
+            result["suggestion"] = suggestion
+        return result
+
+    def stats(self) -> Dict:
+        return {
+            "pairs": None if self._pairs is None else len(self._pairs),
+            "cached": len(self._cache),
+            "misses": self.misses,
+        }
+
+
+symbol_resolver = SymbolResolver()
@@ -1,47 +1,301 @@
+import asyncio
+import logging
 import os
-from typing import Dict
+import time
+from dataclasses import dataclass
+from decimal import ROUND_DOWN, Decimal
+from typing import Dict, Optional
 from dotenv import load_dotenv
-from binance import AsyncClient
+
+from app.agent.tools.symbol_resolver import symbol_resolver
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 API_KEY = os.getenv("BINANCE_API_KEY")
 SECRET_KEY = os.getenv("BINANCE_SECRET_KEY")
 DEFAULT_AMOUNT = float(os.getenv("TRADE_AMOUNT", "0.001"))
 
+# Test/mock borsa için REST kökü (örn. http://127.0.0.1:8901/api); boşsa Binance
+BINANCE_API_URL = os.getenv("BINANCE_API_URL", "")
+BINANCE_TESTNET = os.getenv("BINANCE_TESTNET", "0").lower() in ("1", "true", "yes")
+# exchangeInfo (sembol filtreleri) ve son fiyatın cache süresi (saniye)
+EXCHANGE_INFO_TTL = float(os.getenv("EXCHANGE_INFO_TTL", "3600"))
+PRICE_CACHE_TTL = float(os.getenv("PRICE_CACHE_TTL", "2"))
+# Borsaya açık tutulacak keep-alive bağlantı sayısı
+BINANCE_MAX_CONNECTIONS = int(os.getenv("BINANCE_MAX_CONNECTIONS", "10"))
 
-async def execute_trade(symbol: str, decision: str, amount: float = None) -> Dict:
+
+@dataclass
+class SymbolFilters:
     """
-    Binance API ile market emirleri gönderir.
-    - symbol: "BTC" → "BTCUSDT" olarak çevrilir
-    - decision: "buy" veya "sell"
-    - amount: işlem miktarı (örn. 0.001 BTC). Yoksa DEFAULT_AMOUNT kullanır.
-    Dönüş: Binance'den gelen order onayı dict'i
+    Bir işlem çiftinin emir kuralları (LOT_SIZE / MARKET_LOT_SIZE,
+    MIN_NOTIONAL / NOTIONAL). Miktar emir gönderilmeden yerelde doğrulanır.
     """
-    # Symbol formatla
-    pair = f"{symbol.upper()}USDT"
-    qty = amount or DEFAULT_AMOUNT
 
-    client = await AsyncClient.create(API_KEY, SECRET_KEY)
-    try:
-        if decision.lower() == "buy":
-            order = await client.create_order(
-                symbol=pair, side="BUY", type="MARKET", quantity=qty
-            )
-        elif decision.lower() == "sell":
-            order = await client.create_order(
-                symbol=pair, side="SELL", type="MARKET", quantity=qty
-            )
-        else:
+    symbol: str
+    status: str
+    base_asset: str = ""
+    min_qty: Decimal = Decimal("0")
+    max_qty: Decimal = Decimal("0")
+    step_size: Decimal = Decimal("0")
+    min_notional: Decimal = Decimal("0")
+
+    @classmethod
+    def from_exchange_info(cls, info: Dict) -> "SymbolFilters":
+        filters = cls(info["symbol"], info.get("status", "TRADING"), info.get("baseAsset", ""))
+        for f in info.get("filters", []):
+            kind = f.get("filterType")
+            # Market emirlerinde MARKET_LOT_SIZE (0 değilse) LOT_SIZE'ın yerine geçer
+            if kind in ("LOT_SIZE", "MARKET_LOT_SIZE"):
+                step = Decimal(f.get("stepSize", "0"))
+                if kind == "LOT_SIZE" or step > 0:
+                    filters.min_qty = Decimal(f.get("minQty", "0"))
+                    filters.max_qty = Decimal(f.get("maxQty", "0"))
+                    filters.step_size = step or filters.step_size
+            elif kind in ("MIN_NOTIONAL", "NOTIONAL"):
+                filters.min_notional = Decimal(f.get("minNotional", "0"))
+        return filters
+
+    def round_quantity(self, quantity: float) -> Decimal:
+        qty = Decimal(str(quantity))
+        if self.step_size > 0:
+            qty = (qty / self.step_size).to_integral_value(ROUND_DOWN) * self.step_size
+        return qty
+
+    def validate(self, quantity: Decimal, price: Optional[Decimal]) -> Optional[str]:
+        """
+        Miktar kurallara uymuyorsa sebebini, uyuyorsa None döner.
+        """
+        if self.status != "TRADING":
+            return f"{self.symbol} işlem görmüyor ({self.status})"
+        if quantity <= 0 or quantity < self.min_qty:
+            return f"Miktar en az {self.min_qty} olmalı"
+        if self.max_qty > 0 and quantity > self.max_qty:
+            return f"Miktar en fazla {self.max_qty} olabilir"
+        if price is not None and self.min_notional > 0:
+            notional = quantity * price
+            if notional < self.min_notional:
+                return f"İşlem tutarı ({notional:.2f}) en az {self.min_notional} olmalı"
+        return None
+
+
+class TradingClient:
+    """
+    Uygulama boyunca açık kalan Binance client'ı.
+
+    Bağlantı havuzu (keep-alive), sunucu zaman farkı ve exchangeInfo
+    başlangıçta bir kez hazırlanır; emir anında yalnızca emir isteği gider.
+    Sembol filtreleri ve son fiyatlar cache'lenir, miktar yerelde doğrulanır.
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str] = API_KEY,
+        api_secret: Optional[str] = SECRET_KEY,
+        api_url: str = BINANCE_API_URL,
+        testnet: bool = BINANCE_TESTNET,
+    ):
+        self.api_key = api_key
+        self.api_secret = api_secret
+        self.api_url = api_url
+        self.testnet = testnet
+        self._client = None
+        self._lock = asyncio.Lock()
+        self._filters: Dict[str, SymbolFilters] = {}
+        self._filters_at = 0.0
+        self._prices: Dict[str, tuple] = {}
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        """
+        Client'ı oluşturur, sunucu saatini eşitler ve exchangeInfo'yu yükler.
+        """
+        async with self._lock:
+            if self._client is None:
+                self._client = await self._connect()
+        await self.exchange_filters()
+
+    async def _connect(self):
+        # binance paketi ağır; yalnızca trading kullanılacaksa yüklenir
+        import aiohttp
+        from binance import AsyncClient
+
+        client = AsyncClient(
+            self.api_key,
+            self.api_secret,
+            testnet=self.testnet,
+            session_params={
+                "connector": aiohttp.TCPConnector(
+                    limit=BINANCE_MAX_CONNECTIONS, keepalive_timeout=60
+                )
+            },
+        )
+        if self.api_url:
+            client.API_URL = self.api_url.rstrip("/")
+        try:
+            server_time = await client.get_server_time()
+            client.timestamp_offset = server_time["serverTime"] - int(time.time() * 1000)
+        except Exception:
+            await client.close_connection()
+            raise
+        return client
+
+    async def client(self):
+        if self._client is None:
+            await self.start()
+        return self._client
+
+    async def exchange_filters(self, refresh: bool = False) -> Dict[str, SymbolFilters]:
+        """
+        {çift: SymbolFilters}; EXCHANGE_INFO_TTL süresince cache'lenir.
+        """
+        if not refresh and self._filters and time.monotonic() - self._filters_at < EXCHANGE_INFO_TTL:
+            return self._filters
+        client = await self.client()
+        info = await client.get_exchange_info()
+        self._filters = {
+            s["symbol"]: SymbolFilters.from_exchange_info(s) for s in info.get("symbols", [])
+        }
+        self._filters_at = time.monotonic()
+        symbol_resolver.update_pairs(
+            pair for pair, f in self._filters.items() if f.status == "TRADING"
+        )
+        return self._filters
+
+    async def _refresh_loop(self) -> None:
+        # exchangeInfo emir yolunda değil, arka planda yenilenir
+        while True:
+            await asyncio.sleep(EXCHANGE_INFO_TTL * 0.9)
+            try:
+                await self.exchange_filters(refresh=True)
+            except Exception:
+                logger.exception("exchangeInfo yenilenemedi")
+
+    def start_refresh(self) -> None:
+        if self._refresh_task is None:
+            self._refresh_task = asyncio.create_task(self._refresh_loop())
+
+    async def price(self, pair: str) -> Decimal:
+        cached = self._prices.get(pair)
+        if cached is not None and time.monotonic() - cached[0] < PRICE_CACHE_TTL:
+            return cached[1]
+        client = await self.client()
+        ticker = await client.get_symbol_ticker(symbol=pair)
+        price = Decimal(ticker["price"])
+        self._prices[pair] = (time.monotonic(), price)
+        return price
+
+    async def execute(self, symbol: str, decision: str, amount: float = None) -> Dict:
+        side = {"buy": "BUY", "sell": "SELL"}.get(decision.lower())
+        if side is None:
             return {
                 "status": "no_action",
                 "message": "Hold decision, no trade executed",
             }
+        if not self.api_key or not self.api_secret:
+            return {"status": "rejected", "reason": "BINANCE_API_KEY / BINANCE_SECRET_KEY tanımlı değil"}
+
+        # Çözümlenemeyen konu ağ çağrısı yapılmadan reddedilir; bulanık
+        # eşleşmeyle emir açılmaz
+        pair = symbol_resolver.resolve(symbol, fuzzy=False)
+        if pair is None:
+            return symbol_resolver.rejection(symbol)
+        filters = (await self.exchange_filters()).get(pair)
+        if filters is None:
+            return {"status": "rejected", "reason": f"{pair} borsada bulunamadı"}
+
+        qty = filters.round_quantity(amount or DEFAULT_AMOUNT)
+        price = await self.price(pair) if filters.min_notional > 0 else None
+        reason = filters.validate(qty, price)
+        if reason is not None:
+            return {"status": "rejected", "reason": reason, "symbol": pair}
+
+        client = await self.client()
+        order = await client.create_order(
+            symbol=pair, side=side, type="MARKET", quantity=format(qty.normalize(), "f")
+        )
         return {
             "status": order.get("status"),
             "orderId": order.get("orderId"),
             "executedQty": order.get("executedQty"),
             "fills": order.get("fills"),
         }
-    finally:
-        await client.close_connection()
+
+    def used_weight(self) -> Optional[int]:
+        """
+        Borsanın son yanıtta bildirdiği, bu dakika kullanılmış istek ağırlığı.
+        """
+        response = getattr(self._client, "response", None)
+        value = response.headers.get("x-mbx-used-weight-1m") if response is not None else None
+        return int(value) if value else None
+
+    async def health(self) -> Dict:
+        """
+        Borsaya ping atar; gecikme ve cache durumunu döner.
+        """
+        start = time.perf_counter()
+        try:
+            client = await self.client()
+            await client.ping()
+        except Exception as e:
+            return {"status": "down", "error": str(e)}
+        return {
+            "status": "ok",
+            "latency_ms": round((time.perf_counter() - start) * 1000, 1),
+            "symbols": len(self._filters),
+            "exchange_info_age_s": round(time.monotonic() - self._filters_at, 1)
+            if self._filters
+            else None,
+            "time_offset_ms": client.timestamp_offset,
+            "symbol_index": symbol_resolver.stats(),
+        }
+
+    async def close(self) -> None:
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            await asyncio.gather(self._refresh_task, return_exceptions=True)
+            self._refresh_task = None
+        async with self._lock:
+            if self._client is not None:
+                await self._client.close_connection()
+                self._client = None
+
+
+trading_client = TradingClient()
+
+
+def trading_enabled() -> bool:
+    """
+    API anahtarları ya da mock borsa adresi tanımlıysa True.
+    """
+    return bool(API_KEY and SECRET_KEY) or bool(BINANCE_API_URL)
+
+
+async def start_trading_client() -> None:
+    """
+    Lifespan'de çağrılır; borsaya ulaşılamazsa ilk emirde tekrar denenir.
+    """
+    try:
+        await trading_client.start()
+    except Exception:
+        logger.exception("Binance client başlatılamadı; ilk emirde denenecek")
+    trading_client.start_refresh()
+
+
+async def close_trading_client() -> None:
+    await trading_client.close()
+
+
+async def execute_trade(symbol: str, decision: str, amount: float = None) -> Dict:
+    """
+    Binance API ile market emirleri gönderir.
+    - symbol: ticker, çift veya konu adı; "BTC", "bitcoin" → "BTCUSDT"
+    - decision: "buy" veya "sell"
+    - amount: işlem miktarı (örn. 0.001 BTC). Yoksa DEFAULT_AMOUNT kullanır.
+    Miktar LOT_SIZE adımına aşağı yuvarlanır; borsa kurallarına uymayan
+    emirler gönderilmeden {"status": "rejected", "reason": ...} döner.
+    Dönüş: Binance'den gelen order onayı dict'i
+    """
+    return await trading_client.execute(symbol, decision, amount)
@@ -1,23 +1,65 @@
 import os
-from typing import List, Dict, Any
+import threading
+import uuid
+from contextlib import suppress
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import AsyncIterator, List, Dict, Any, Optional, Tuple
 from dotenv import load_dotenv
-from langchain_openai import ChatOpenAI
-from langchain.agents import AgentExecutor, create_openai_tools_agent
-from langchain.tools import BaseTool
-from langchain.prompts import ChatPromptTemplate, MessagesPlaceholder
-from langchain.schema import BaseMessage, HumanMessage, AIMessage
-from langchain.memory import ConversationBufferMemory
-from langchain.tools import tool
 
 from pydantic import BaseModel, Field
-import asyncio
+
+from app.agent.tools.sentiment_stats import SentimentAggregate
 
 load_dotenv()
 
-# OpenAI API Key kontrolü
+# LangChain ve LLM client'ı ağır olduğundan modül import edilirken değil,
+# agent ilk kez oluşturulurken (get_ai_agent) yüklenir.
 OPENAI_API_KEY = os.getenv("TOGETHER_API_KEY")
-if not OPENAI_API_KEY:
-    raise ValueError("OPENAI_API_KEY environment variable is required")
+
+
+@dataclass
+class ToolRunContext:
+    """
+    Tek bir agent çalıştırması sırasında araçların ürettiği veriler.
+    Yanıtta news_data/sentiment_data olarak döner; aynı veriler tekrar
+    çekilmez.
+    """
+
+    news_data: List[Dict] = field(default_factory=list)
+    sentiment_data: List[Dict] = field(default_factory=list)
+    tools_used: List[str] = field(default_factory=list)
+
+    def use(self, tool_name: str) -> None:
+        if tool_name not in self.tools_used:
+            self.tools_used.append(tool_name)
+
+    @staticmethod
+    def _merge(target: List[Dict], items: List[Dict]) -> None:
+        # Aynı haber birden çok araç çağrısında gelirse bir kez tutulur
+        seen = {item.get("url") or item.get("title") for item in target}
+        for item in items:
+            key = item.get("url") or item.get("title")
+            if key not in seen:
+                seen.add(key)
+                target.append(item)
+
+    def add_news(self, items: List[Dict]) -> None:
+        self._merge(self.news_data, items)
+
+    def add_sentiments(self, items: List[Dict]) -> None:
+        self._merge(self.sentiment_data, items)
+
+
+# İstek başına araç bağlamı; eşzamanlı sohbetler birbirinin verisini görmez
+_tool_context: ContextVar[Optional[ToolRunContext]] = ContextVar(
+    "tool_context", default=None
+)
+
+
+def _current_context() -> ToolRunContext:
+    # Agent dışında (doğrudan) çağrılan araçlar için atılan geçici bağlam
+    return _tool_context.get() or ToolRunContext()
 
 
 class NewsToolInput(BaseModel):
@@ -38,6 +80,7 @@ class TradingToolInput(BaseModel):
     symbol: str = Field(description="İşlem yapılacak sembol (örn: BTC, ETH)")
     decision: str = Field(description="İşlem kararı (buy, sell, hold)")
     amount: float = Field(description="İşlem miktarı", default=0.001)
+    confidence: float = Field(description="Kararın güven skoru (0.0–1.0)", default=0.0)
 
 
 class PlottingToolInput(BaseModel):
@@ -47,6 +90,15 @@ class PlottingToolInput(BaseModel):
 
 class FinancialAgent:
     def __init__(self):
+        from langchain_openai import ChatOpenAI
+        from langchain.agents import AgentExecutor, create_openai_tools_agent
+        from langchain.prompts import ChatPromptTemplate, MessagesPlaceholder
+        from langchain.tools import StructuredTool
+
+        # OpenAI API Key kontrolü
+        if not OPENAI_API_KEY:
+            raise ValueError("OPENAI_API_KEY environment variable is required")
+
         # OpenAI LLM
 
         self.llm = ChatOpenAI(
@@ -56,18 +108,21 @@ class FinancialAgent:
             openai_api_base="https://api.together.xyz/v1",
         )
 
-        # Memory
-        self.memory = ConversationBufferMemory(
-            memory_key="chat_history", return_messages=True
-        )
-
-        # Tools
+        # Tools (bound method'lar StructuredTool'a sarılır)
         self.tools = [
-            self.news_tool,
-            self.sentiment_tool,
-            self.decision_tool,
-            self.trading_tool,
-            self.plotting_tool,
+            StructuredTool.from_function(
+                coroutine=method,
+                name=name,
+                description=method.__doc__,
+                args_schema=args_schema,
+            )
+            for name, method, args_schema in (
+                ("news_tool", self.news_tool, NewsToolInput),
+                ("sentiment_tool", self.sentiment_tool, SentimentToolInput),
+                ("decision_tool", self.decision_tool, DecisionToolInput),
+                ("trading_tool", self.trading_tool, TradingToolInput),
+                ("plotting_tool", self.plotting_tool, PlottingToolInput),
+            )
         ]
 
         # Agent prompt
@@ -87,7 +142,7 @@ Kullanabileceğin araçlar:
 - news_tool: Güncel haberleri topla
 - sentiment_tool: Haberlerin duygu analizini yap
 - decision_tool: Sentiment skorlarına göre karar ver
-- trading_tool: Otomatik işlem yap (sadece yüksek güvenle)
+- trading_tool: Otomatik işlem emrini kuyruğa al (sadece yüksek güvenle; decision_tool'un confidence değerini de ilet)
 - plotting_tool: Sentiment grafiği oluştur
 
 Önemli kurallar:
@@ -122,18 +177,19 @@ Kullanıcı mesajını analiz et ve uygun araçları kullan.""",
         self.agent_executor = AgentExecutor(
             agent=self.agent,
             tools=self.tools,
-            memory=self.memory,
             verbose=True,
             handle_parsing_errors=True,
         )
 
-    @tool("news_tool")
     async def news_tool(self, topic: str) -> str:
         """Belirtilen konu hakkında güncel haberleri toplar."""
         from app.agent.tools.news_tool import get_news
 
+        context = _current_context()
+        context.use("news_tool")
         try:
             news_data = await get_news(topic)
+            context.add_news(news_data)
 
             # Haberleri formatla
             formatted_news = []
@@ -149,68 +205,63 @@ Kullanıcı mesajını analiz et ve uygun araçları kullan.""",
         except Exception as e:
             return f"❌ Haber toplama hatası: {str(e)}"
 
-    @tool("sentiment_tool")
     async def sentiment_tool(self, news_data: List[Dict]) -> str:
         """Haberlerin duygu analizini yapar."""
         from app.agent.tools.sentiment_tool import analyze_sentiments
 
+        context = _current_context()
+        context.use("sentiment_tool")
         try:
             sentiments = await analyze_sentiments(news_data)
+            context.add_sentiments(sentiments)
 
             # Sentiment sonuçlarını formatla
-            positive_count = sum(
-                1 for s in sentiments if s.get("sentiment_label") == "positive"
-            )
-            negative_count = sum(
-                1 for s in sentiments if s.get("sentiment_label") == "negative"
-            )
-            neutral_count = sum(
-                1 for s in sentiments if s.get("sentiment_label") == "neutral"
-            )
-
-            avg_score = (
-                sum(s.get("sentiment_score", 0) for s in sentiments) / len(sentiments)
-                if sentiments
-                else 0
-            )
+            stats = SentimentAggregate.from_items(sentiments)
 
             return f"""📊 Sentiment Analizi Sonuçları:
             
-📈 Pozitif Haberler: {positive_count}
-📉 Negatif Haberler: {negative_count}
-➡️ Nötr Haberler: {neutral_count}
-📊 Ortalama Sentiment Skoru: {avg_score:.3f}
+📈 Pozitif Haberler: {stats.positive}
+📉 Negatif Haberler: {stats.negative}
+➡️ Nötr Haberler: {stats.neutral}
+📊 Ortalama Sentiment Skoru: {stats.mean:.3f}
 
 Detaylı Analiz:
 {chr(10).join([f"• {s.get('title', 'Başlık yok')[:50]}... - Skor: {s.get('sentiment_score', 0):.3f} ({s.get('sentiment_label', 'unknown')})" for s in sentiments[:3]])}"""
         except Exception as e:
             return f"❌ Sentiment analizi hatası: {str(e)}"
 
-    @tool("decision_tool")
     async def decision_tool(self, sentiments: List[Dict]) -> Dict:
         """Sentiment skorlarına göre alım-satım kararı verir."""
-        from app.agent.tools.decision_tool import make_trade_decision
+        from app.agent.tools.decision_tool import decide_from_aggregate
 
+        _current_context().use("decision_tool")
         try:
-            decision, confidence = await make_trade_decision(sentiments)
+            stats = SentimentAggregate.from_items(sentiments)
+            decision, confidence = decide_from_aggregate(stats)
             return {
                 "status": "success",
                 "decision": decision,
                 "confidence": confidence,
                 "reasoning": self._generate_decision_reasoning(
-                    sentiments, decision, confidence
+                    stats, decision, confidence
                 ),
             }
         except Exception as e:
             return {"status": "error", "error": str(e)}
 
-    @tool("trading_tool")
     async def trading_tool(
-        self, symbol: str, decision: str, amount: float = 0.001
+        self, symbol: str, decision: str, amount: float = 0.001, confidence: float = 0.0
     ) -> Dict:
-        """Otomatik trading işlemi yapar (sadece yüksek güven seviyesinde)."""
-        from app.agent.tools.trading_tool import execute_trade
-
+        """
+        Otomatik trading emrini kuyruğa alır (sadece yüksek güven seviyesinde).
+        Emir run_agent'taki gibi order_queue'dan geçer: aynı konu ve haber
+        sürümü için tek emir açılır, yanıt borsayı beklemez.
+        """
+        from app.agent.order_queue import order_queue
+        from app.agent.tools.news_tool import news_snapshot_version
+        from app.agent.tools.symbol_resolver import symbol_resolver
+
+        _current_context().use("trading_tool")
         try:
             if decision.lower() == "hold":
                 return {
@@ -218,16 +269,24 @@ Detaylı Analiz:
                     "message": "Hold kararı - işlem yapılmadı",
                 }
 
-            trade_result = await execute_trade(symbol, decision, amount)
-            return {"status": "success", "trade_result": trade_result}
+            # Bulanık veya bilinmeyen sembolle emir açılmaz
+            pair = symbol_resolver.resolve(symbol, fuzzy=False)
+            if pair is None:
+                return {"status": "rejected", "trade_result": symbol_resolver.rejection(symbol)}
+
+            signal_version = news_snapshot_version(symbol) or uuid.uuid4().hex[:12]
+            order = order_queue.submit(
+                symbol, decision, confidence, signal_version, amount, symbol=pair
+            )
+            return {"status": "queued", "trade_result": order.to_dict()}
         except Exception as e:
             return {"status": "error", "error": str(e)}
 
-    @tool("plotting_tool")
     async def plotting_tool(self, topic: str, sentiments: List[Dict]) -> Dict:
         """Sentiment trend grafiği oluşturur."""
         from app.agent.tools.plotting_tool import plot_sentiment_graph
 
+        _current_context().use("plotting_tool")
         try:
             graph_url = await plot_sentiment_graph(topic, sentiments)
             return {"status": "success", "graph_url": graph_url, "topic": topic}
@@ -235,28 +294,23 @@ Detaylı Analiz:
             return {"status": "error", "error": str(e)}
 
     def _generate_decision_reasoning(
-        self, sentiments: List[Dict], decision: str, confidence: float
+        self, stats: SentimentAggregate, decision: str, confidence: float
     ) -> str:
-        """Karar için gerekçe oluşturur."""
-        if not sentiments:
+        """Karar için gerekçe oluşturur (listeyi dolaşmadan, özet istatistiklerden)."""
+        if stats.count == 0:
             return "Haber verisi bulunamadığı için HOLD kararı verildi."
 
-        avg_score = sum(item.get("sentiment_score", 0) for item in sentiments) / len(
-            sentiments
-        )
-        positive_count = sum(
-            1 for item in sentiments if item.get("sentiment_label") == "positive"
-        )
-        negative_count = sum(
-            1 for item in sentiments if item.get("sentiment_label") == "negative"
-        )
+        avg_score = stats.mean
+        positive_count = stats.positive
+        negative_count = stats.negative
 
         reasoning = f"""
 Analiz Sonuçları:
 - Ortalama Sentiment Skoru: {avg_score:.2f}
+- Skor Standart Sapması: {stats.std:.2f}
 - Pozitif Haber Sayısı: {positive_count}
 - Negatif Haber Sayısı: {negative_count}
-- Toplam Haber Sayısı: {len(sentiments)}
+- Toplam Haber Sayısı: {stats.count}
 
 Karar: {decision.upper()}
 Güven Seviyesi: %{confidence * 100:.1f}
@@ -284,46 +338,142 @@ Gerekçe: {self._get_decision_explanation(decision, avg_score, positive_count, n
         else:  # hold
             return f"Sentiment skoru ({avg_score:.2f}) nötr bölgede. Pozitif ({positive}) ve negatif ({negative}) haberler dengeli."
 
-    async def process_message(self, message: str) -> Dict[str, Any]:
-        """Kullanıcı mesajını AI agent ile işler."""
+    async def process_message(
+        self, message: str, history: Optional[List[Tuple[str, str]]] = None
+    ) -> Dict[str, Any]:
+        """
+        Kullanıcı mesajını AI agent ile işler.
+        - history: oturumun (rol, metin) geçmişi; rol "human" veya "ai"
+        """
+        context = ToolRunContext()
+        token = _tool_context.set(context)
         try:
-            # Agent'ı çalıştır
-            result = await self.agent_executor.ainvoke({"input": message})
-
-            # Haber verilerini manuel olarak topla (eğer Bitcoin ile ilgiliyse)
-            news_data = []
-            sentiment_data = []
-
-            if "bitcoin" in message.lower():
-                try:
-                    from app.agent.tools.news_tool import get_news
-                    from app.agent.tools.sentiment_tool import analyze_sentiments
-
-                    news_data = await get_news("Bitcoin")
-                    if news_data:
-                        sentiment_data = await analyze_sentiments(news_data)
-                except Exception as e:
-                    print(f"Haber toplama hatası: {e}")
+            # Agent'ı çalıştır; araçların topladığı veriler context'e yazılır
+            result = await self.agent_executor.ainvoke(
+                {"input": message, "chat_history": self._chat_history(history)}
+            )
+            return await self._build_result(result["output"], context)
 
+        except Exception as e:
             return {
-                "response": result["output"],
+                "error": f"AI Agent işlemi sırasında hata: {str(e)}",
                 "is_ai_agent": True,
-                "tools_used": self._extract_tools_used(result),
-                "news_data": news_data,
-                "sentiment_data": sentiment_data,
             }
+        finally:
+            _tool_context.reset(token)
+
+    async def stream_message(
+        self, message: str, history: Optional[List[Tuple[str, str]]] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        process_message'ın akış versiyonu. Olaylar {"event", "data"} olarak
+        üretilir:
+        - tool_start / tool_end: araç çağrıları
+        - result: decision_tool / plotting_tool'un yapılandırılmış çıktısı
+        - token: LLM'in ürettiği metin parçaları
+        - final: process_message'ın döneceği sonuç (her zaman son olay)
+        """
+        context = ToolRunContext()
+        token = _tool_context.set(context)
+        try:
+            output = None
+            async for event in self.agent_executor.astream_events(
+                {"input": message, "chat_history": self._chat_history(history)},
+                version="v2",
+            ):
+                kind = event["event"]
+                if kind == "on_chat_model_stream":
+                    text = event["data"]["chunk"].content
+                    if text:
+                        yield {"event": "token", "data": {"text": text}}
+                elif kind == "on_tool_start":
+                    tool_input = event["data"].get("input") or {}
+                    yield {
+                        "event": "tool_start",
+                        "data": {
+                            "tool": event["name"],
+                            # LLM'in geri gönderdiği haber listeleri gibi büyük
+                            # argümanlar akışa yazılmaz
+                            "input": {
+                                k: v
+                                for k, v in tool_input.items()
+                                if isinstance(v, (str, int, float, bool))
+                            }
+                            if isinstance(tool_input, dict)
+                            else {},
+                        },
+                    }
+                elif kind == "on_tool_end":
+                    yield {"event": "tool_end", "data": {"tool": event["name"]}}
+                    tool_output = event["data"].get("output")
+                    if isinstance(tool_output, dict) and tool_output.get("status") == "success":
+                        yield {
+                            "event": "result",
+                            "data": {"tool": event["name"], **tool_output},
+                        }
+                elif kind == "on_chain_end" and not event.get("parent_ids"):
+                    output = event["data"]["output"]["output"]
+
+            yield {"event": "final", "data": await self._build_result(output, context)}
 
         except Exception as e:
-            return {
-                "error": f"AI Agent işlemi sırasında hata: {str(e)}",
-                "is_ai_agent": True,
+            yield {
+                "event": "final",
+                "data": {
+                    "error": f"AI Agent işlemi sırasında hata: {str(e)}",
+                    "is_ai_agent": True,
+                },
             }
+        finally:
+            # Akış başka bir context'te kapatılırsa reset edilemez; sorun değil
+            with suppress(ValueError):
+                _tool_context.reset(token)
 
-    def _extract_tools_used(self, result: Dict) -> List[str]:
+    def _chat_history(self, history: Optional[List[Tuple[str, str]]]) -> List:
+        from langchain.schema import AIMessage, HumanMessage
+
+        return [
+            HumanMessage(content=text) if role == "human" else AIMessage(content=text)
+            for role, text in history or []
+        ]
+
+    async def _build_result(self, output: str, context: ToolRunContext) -> Dict[str, Any]:
+        # Haberler toplandı ama skorlanmadıysa, aynı haberleri skorla
+        # (haber API'sine tekrar gidilmez)
+        if context.news_data and not context.sentiment_data:
+            from app.agent.tools.sentiment_tool import analyze_sentiments
+
+            try:
+                context.add_sentiments(await analyze_sentiments(context.news_data))
+            except Exception as e:
+                print(f"Sentiment analizi hatası: {e}")
+
+        return {
+            "response": output,
+            "is_ai_agent": True,
+            "tools_used": self._extract_tools_used(context),
+            "news_data": context.news_data,
+            "sentiment_data": context.sentiment_data,
+        }
+
+    def _extract_tools_used(self, context: ToolRunContext) -> List[str]:
         """Kullanılan araçları çıkarır."""
-        # Bu kısım LangChain'in tool usage tracking'i ile geliştirilebilir
-        return ["ai_agent"]
+        return context.tools_used or ["ai_agent"]
+
+
+# Global agent instance (ilk kullanımda oluşturulur)
+_ai_agent: Optional[FinancialAgent] = None
+_ai_agent_lock = threading.Lock()
 
 
-# Global agent instance
-ai_agent = FinancialAgent()
+def get_ai_agent() -> FinancialAgent:
+    """
+    Paylaşılan agent'ı döner; ilk çağrıda LangChain'i yükleyip oluşturur.
+    Lifespan'deki ısınma thread'i ile aynı anda çağrılabilir.
+    """
+    global _ai_agent
+    if _ai_agent is None:
+        with _ai_agent_lock:
+            if _ai_agent is None:
+                _ai_agent = FinancialAgent()
+    return _ai_agent
@@ -1,9 +1,23 @@
-from fastapi import APIRouter, Request
-from fastapi.responses import HTMLResponse
+import json
+import uuid
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import HTMLResponse, StreamingResponse
 from fastapi.templating import Jinja2Templates
-from app.models.request_models import AgentRequest
-from app.agent.agent_runner import run_agent
+from app.models.request_models import (
+    AgentRequest,
+    BatchAgentRequest,
+    StreamAgentRequest,
+    StreamFormatEnum,
+)
+from app.agent.agent_runner import run_agent, run_agent_batch, stream_agent
+from app.agent.article_store import get_article_store
+from app.agent.order_queue import order_queue
+from app.agent.scheduler import get_scheduler
+from app.agent.tools.news_tool import news_cache
+from app.agent.tools.trading_tool import trading_client, trading_enabled
 from app.chat_handler import chat_handler
+from app.response_cache import response_cache
+from app.session_memory import session_store
 import os
 
 router = APIRouter()
@@ -31,19 +45,165 @@ async def chat_endpoint(request: Request):
         
         if not message:
             return {"error": "Mesaj boş olamaz"}
+
+        # Oturum id'si yoksa yeni oturum açılır; istemci sonraki mesajlarda geri gönderir
+        session_id = str(body.get("session_id") or "")[:128] or uuid.uuid4().hex
         
         # Chat handler ile mesajı işle
-        result = await chat_handler.process_message(message)
+        result = await chat_handler.process_message(message, session_id)
+        result["session_id"] = session_id
         return result
         
     except Exception as e:
         return {"error": f"Mesaj işlenirken hata oluştu: {str(e)}"}
 
 
+@router.post("/chat/stream")
+async def chat_stream_endpoint(request: Request):
+    """
+    Chatbot mesajını Server-Sent Events olarak işler: yönlendirme, araç
+    çağrıları, LLM token'ları ve yapılandırılmış sonuçlar üretildikçe
+    gönderilir; son olay `done` yanıtın tamamını taşır.
+    """
+    # Akış açılmadan önce doğrulanır; hatalı istek 500 yerine 400 döner
+    try:
+        body = await request.json()
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Geçersiz JSON")
+    message = body.get("message", "") if isinstance(body, dict) else None
+    if not isinstance(message, str):
+        raise HTTPException(status_code=400, detail="message metin olmalı")
+    message = message.strip()
+    session_id = str(body.get("session_id") or "")[:128] or uuid.uuid4().hex
+
+    async def events():
+        # İlk bayt agent beklenmeden gider
+        yield _sse("session", {"session_id": session_id})
+        if not message:
+            yield _sse("done", {"error": "Mesaj boş olamaz"})
+            return
+        async for event in chat_handler.stream_message(message, session_id):
+            data = event["data"]
+            if event["event"] == "done":
+                data["session_id"] = session_id
+            yield _sse(event["event"], data)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def _sse(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
 @router.post("/run-agent")
 async def run_agent_route(request: AgentRequest):
     """
     Haberleri al, analiz et, karar ver ve gerekirse işlem yap.
     """
-    result = await run_agent(request.topic, request.mode)
+    result = await run_agent(
+        request.topic,
+        request.mode,
+        refresh=request.refresh,
+        chart=request.chart.value if request.chart else None,
+    )
     return result
+
+
+@router.post("/run-agent/batch")
+async def run_agent_batch_route(request: BatchAgentRequest):
+    """
+    Birden çok konuyu eşzamanlı analiz eder; her konunun sonucu hazır
+    olduğunda NDJSON satırı (veya SSE olayı) olarak gönderilir.
+    """
+    sse = request.format == StreamFormatEnum.sse
+
+    async def lines():
+        async for result in run_agent_batch(
+            request.topics,
+            request.mode,
+            request.refresh,
+            request.concurrency,
+            request.chart.value if request.chart else None,
+        ):
+            data = json.dumps(result, ensure_ascii=False)
+            yield f"event: result\ndata: {data}\n\n" if sse else data + "\n"
+        if sse:
+            yield "event: done\ndata: {}\n\n"
+
+    media_type = "text/event-stream" if sse else "application/x-ndjson"
+    return StreamingResponse(lines(), media_type=media_type)
+
+
+@router.get("/signals")
+async def signals():
+    """
+    Arka planda güncel tutulan sinyalleri döner.
+    """
+    scheduler = get_scheduler()
+    return scheduler.snapshot() if scheduler else {}
+
+
+@router.post("/run-agent/stream")
+async def run_agent_stream_route(request: StreamAgentRequest):
+    """
+    Haberleri sayfa sayfa analiz eder; her sayfadan sonra güncel kararı
+    NDJSON satırı olarak gönderir.
+    """
+
+    async def lines():
+        async for update in stream_agent(request.topic, request.max_articles):
+            yield json.dumps(update, ensure_ascii=False) + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+@router.get("/metrics")
+async def metrics():
+    """
+    Cache, article store, chat yönlendirme ve oturum sayaçlarını döner.
+    """
+    store = get_article_store()
+    return {
+        "news_cache": news_cache.stats(),
+        "article_store": store.stats() if store else None,
+        "chat_routes": dict(chat_handler.route_counts),
+        "sessions": session_store.stats(),
+        "agent_response_cache": response_cache.stats(),
+        "orders": order_queue.stats(),
+    }
+
+
+@router.get("/orders")
+async def orders(limit: int = 50):
+    """
+    Kuyruğa alınmış son emirler (en yeni önce) ve kuyruk sayaçları.
+    """
+    return {
+        "orders": [order.to_dict() for order in order_queue.recent(limit)],
+        "stats": order_queue.stats(),
+    }
+
+
+@router.get("/orders/{key}")
+async def order_status(key: str):
+    """
+    Tek bir emrin durumu; key, /run-agent yanıtındaki trade_result.key'dir.
+    """
+    order = order_queue.get(key)
+    if order is None:
+        raise HTTPException(status_code=404, detail="Emir bulunamadı")
+    return order.to_dict()
+
+
+@router.get("/health/trading")
+async def trading_health():
+    """
+    Borsa bağlantısını ping'ler; gecikme ve exchangeInfo cache durumunu döner.
+    """
+    if not trading_enabled():
+        return {"status": "disabled"}
+    return await trading_client.health()
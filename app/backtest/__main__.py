@@ -0,0 +1,104 @@
+"""
+Karar kurallarını geçmiş veride dener.
+
+Kullanım:
+    python -m app.backtest --candles data/btcusdt_1h.csv --topic Bitcoin \
+        --windows 1h,6h,24h --buy 0.5:0.9:0.01 --sell 0.1:0.5:0.01 \
+        --confidence 0.5:0.95:0.05 --fee 0.001 --top 20 --output results.csv
+
+Haber skorları ARTICLE_STORE_PATH'teki depodan (veya --articles dosyasından),
+mumlar CSV/Parquet dosyasından okunur.
+"""
+import argparse
+import time
+
+import numpy as np
+
+from app.agent.article_store import ARTICLE_STORE_PATH
+from app.backtest.data import load_articles_file, load_candles, load_scored_articles
+from app.backtest.engine import Grid, run_backtest
+
+UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+def parse_values(spec: str) -> np.ndarray:
+    """
+    "0.5,0.6" listesi veya "başlangıç:bitiş:adım" (bitiş dahil) aralığı.
+    """
+    if ":" in spec:
+        start, stop, step = (float(x) for x in spec.split(":"))
+        return np.round(np.arange(start, stop + step / 2, step), 10)
+    return np.asarray([float(x) for x in spec.split(",")])
+
+
+def parse_windows(spec: str) -> np.ndarray:
+    """
+    "30m,1h,1d" → saniye; birimsiz değerler saniyedir.
+    """
+    values = []
+    for part in spec.split(","):
+        part = part.strip().lower()
+        unit = UNITS.get(part[-1])
+        values.append(float(part[:-1]) * unit if unit else float(part))
+    return np.asarray(values)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.backtest")
+    parser.add_argument("--candles", required=True, help="CSV/Parquet mum dosyası")
+    parser.add_argument("--topic", help="ArticleStore'daki konu")
+    parser.add_argument("--store", default=ARTICLE_STORE_PATH, help="ArticleStore yolu")
+    parser.add_argument("--articles", help="publishedAt,sentiment_score dosyası (store yerine)")
+    parser.add_argument("--since", help="Bu tarihten (ISO) sonraki haberler")
+    parser.add_argument("--windows", default="1h,6h,24h")
+    parser.add_argument("--buy", default="0.5:0.9:0.02")
+    parser.add_argument("--sell", default="0.1:0.5:0.02")
+    parser.add_argument("--confidence", default="0.5:0.95:0.05")
+    parser.add_argument("--horizon", type=int, default=1, help="İşlem süresi (mum)")
+    parser.add_argument("--fee", type=float, default=0.0)
+    parser.add_argument("--min-articles", type=int, default=1)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--sort", default="pnl", choices=("pnl", "hit_rate", "avg_return"))
+    parser.add_argument("--min-trades", type=int, default=10)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--output", help="Tüm sonuçların yazılacağı CSV")
+    args = parser.parse_args()
+
+    candle_times, close = load_candles(args.candles)
+    if args.articles:
+        article_times, scores = load_articles_file(args.articles)
+    elif args.topic:
+        article_times, scores = load_scored_articles(args.topic, args.store, args.since)
+    else:
+        parser.error("--topic veya --articles gerekli")
+
+    grid = Grid(
+        parse_windows(args.windows),
+        parse_values(args.buy),
+        parse_values(args.sell),
+        parse_values(args.confidence),
+    )
+    print(f"{len(close)} mum, {len(scores)} haber, {grid.size} kombinasyon")
+
+    start = time.perf_counter()
+    result = run_backtest(
+        candle_times, close, article_times, scores, grid,
+        horizon=args.horizon, fee=args.fee, min_articles=args.min_articles,
+        workers=args.workers,
+    )
+    print(f"Süre: {time.perf_counter() - start:.2f}s")
+
+    for row in result.top(args.top, key=args.sort, min_trades=args.min_trades):
+        print(
+            f"window={row['window'] / 3600:g}h buy={row['buy_threshold']:g} "
+            f"sell={row['sell_threshold']:g} conf={row['min_confidence']:g} "
+            f"trades={row['trades']} pnl={row['pnl']:+.4f} "
+            f"hit_rate={row['hit_rate']:.3f}"
+        )
+    if args.output:
+        result.to_csv(args.output)
+        print(f"Sonuçlar: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+import asyncio
+import csv
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from app.agent.article_store import ARTICLE_STORE_PATH, ArticleStore
+
+# Sırayla denenen zaman sütunları; kapanış zamanı yoksa açılış zamanına
+# mum aralığı eklenir (kararın mum kapanmadan verilmemesi için)
+CLOSE_TIME_COLUMNS = ("close_time", "timestamp", "time", "date", "datetime")
+OPEN_TIME_COLUMNS = ("open_time",)
+
+
+def to_epoch_seconds(values: List) -> np.ndarray:
+    """
+    Unix saniye/milisaniye sayılarını veya ISO 8601 metinlerini float
+    epoch saniyeye çevirir.
+    """
+    try:
+        numbers = np.asarray(values, dtype=np.float64)
+    except (TypeError, ValueError):
+        # "2024-01-01T00:00:00Z" -> numpy yalnızca saat dilimsiz biçimi okur
+        text = [str(v).strip().replace(" ", "T").rstrip("Z").split("+")[0] for v in values]
+        return np.asarray(text, dtype="datetime64[ms]").astype(np.int64) / 1000.0
+    # Binance kline'ları milisaniye
+    return numbers / 1000.0 if numbers.size and np.nanmax(numbers) > 1e11 else numbers
+
+
+def _read_columns(path: str) -> dict:
+    if path.endswith(".parquet"):
+        try:
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError("Parquet dosyaları için pyarrow kurulmalı") from e
+        return {k.lower(): v for k, v in pq.read_table(path).to_pydict().items()}
+    with open(path, encoding="utf-8", newline="") as f:
+        rows = list(csv.DictReader(f))
+    if not rows:
+        return {}
+    return {key.lower(): [row[key] for row in rows] for key in rows[0]}
+
+
+def load_candles(path: str) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    CSV veya Parquet mum verisini okur.
+    - path: `close` ve bir zaman sütunu (close_time, timestamp, time, date,
+      datetime veya open_time) içeren dosya
+    Dönüş: (kapanış zamanları [epoch saniye], kapanış fiyatları), zamana göre sıralı
+    """
+    columns = _read_columns(path)
+    if "close" not in columns:
+        raise ValueError(f"{path}: 'close' sütunu bulunamadı")
+
+    name = next((c for c in CLOSE_TIME_COLUMNS if c in columns), None)
+    if name is not None:
+        times = to_epoch_seconds(columns[name])
+    else:
+        name = next((c for c in OPEN_TIME_COLUMNS if c in columns), None)
+        if name is None:
+            raise ValueError(f"{path}: zaman sütunu bulunamadı")
+        times = to_epoch_seconds(columns[name])
+        if len(times) > 1:
+            times = times + np.median(np.diff(np.sort(times)))
+
+    close = np.asarray(columns["close"], dtype=np.float64)
+    order = np.argsort(times, kind="stable")
+    return times[order], close[order]
+
+
+def load_scored_articles(
+    topic: str, store_path: str = ARTICLE_STORE_PATH, since: Optional[str] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    ArticleStore'daki skorlanmış haberleri okur.
+    Dönüş: (yayın zamanları [epoch saniye], sentiment skorları), zamana göre sıralı
+    """
+    if not store_path:
+        raise ValueError("ARTICLE_STORE_PATH tanımlı değil")
+    store = ArticleStore(store_path)
+    try:
+        articles = asyncio.run(store.history(topic, since))
+    finally:
+        store.close()
+    return _article_arrays(
+        [a["publishedAt"] for a in articles], [a["sentiment_score"] for a in articles]
+    )
+
+
+def load_articles_file(path: str) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    `publishedAt` ve `sentiment_score` sütunlu CSV/Parquet dosyasını okur
+    (store dışında üretilmiş skorlar için).
+    """
+    columns = _read_columns(path)
+    return _article_arrays(columns.get("publishedat", []), columns.get("sentiment_score", []))
+
+
+def _article_arrays(published: List, scores: List) -> Tuple[np.ndarray, np.ndarray]:
+    # Yayın zamanı olmayan haberler pencereye yerleştirilemez
+    pairs = [(p, s) for p, s in zip(published, scores) if p]
+    if not pairs:
+        return np.empty(0), np.empty(0)
+    times = to_epoch_seconds([p for p, _ in pairs])
+    values = np.asarray([s for _, s in pairs], dtype=np.float64)
+    order = np.argsort(times, kind="stable")
+    return times[order], values[order]
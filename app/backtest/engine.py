@@ -0,0 +1,236 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+import numpy as np
+
+# Grid'i paylaştıracak process sayısı (0: CPU sayısı)
+BACKTEST_WORKERS = int(os.getenv("BACKTEST_WORKERS", "0"))
+
+RESULT_FIELDS = (
+    "window", "buy_threshold", "sell_threshold", "min_confidence",
+    "trades", "buys", "sells", "pnl", "hit_rate", "avg_return",
+)
+
+
+@dataclass
+class Grid:
+    """
+    Denenecek parametreler; sonuç her kombinasyon (kartezyen çarpım) içindir.
+    - windows: haber penceresi (saniye); karar anından geriye bu süredeki haberler
+    - buy_thresholds / sell_thresholds: decide_from_average eşikleri
+    - min_confidences: işlem açmak için güvenin aşması gereken değer
+      (run_agent'ta 0.8)
+    """
+
+    windows: np.ndarray
+    buy_thresholds: np.ndarray
+    sell_thresholds: np.ndarray
+    min_confidences: np.ndarray
+
+    def __post_init__(self):
+        for name in ("windows", "buy_thresholds", "sell_thresholds", "min_confidences"):
+            setattr(self, name, np.asarray(getattr(self, name), dtype=np.float64).ravel())
+
+    @property
+    def size(self) -> int:
+        return (
+            len(self.windows) * len(self.buy_thresholds)
+            * len(self.sell_thresholds) * len(self.min_confidences)
+        )
+
+
+def window_averages(
+    candle_times: np.ndarray,
+    article_times: np.ndarray,
+    scores: np.ndarray,
+    window: float,
+):
+    """
+    Her mum için (t - window, t] aralığındaki haberlerin ortalama skoru ve
+    haber sayısı. Kümülatif toplam + searchsorted ile O((n + m) log m).
+    """
+    cumulative = np.concatenate(([0.0], np.cumsum(scores)))
+    hi = np.searchsorted(article_times, candle_times, side="right")
+    lo = np.searchsorted(article_times, candle_times - window, side="right")
+    counts = hi - lo
+    averages = np.full(len(candle_times), np.nan)
+    np.divide(cumulative[hi] - cumulative[lo], counts, out=averages, where=counts > 0)
+    return averages, counts
+
+
+def forward_returns(close: np.ndarray, horizon: int) -> np.ndarray:
+    """
+    Her mumdan `horizon` mum sonrasına getiri; sonu NaN.
+    """
+    returns = np.full(len(close), np.nan)
+    if horizon < len(close):
+        returns[:-horizon] = close[horizon:] / close[:-horizon] - 1.0
+    return returns
+
+
+def evaluate_grid(
+    averages: np.ndarray,
+    counts: np.ndarray,
+    returns: np.ndarray,
+    buy_thresholds: np.ndarray,
+    sell_thresholds: np.ndarray,
+    min_confidences: np.ndarray,
+    fee: float = 0.0,
+    min_articles: int = 1,
+) -> Dict[str, np.ndarray]:
+    """
+    Tek bir pencere için tüm eşik/güven kombinasyonlarını hesaplar.
+
+    Kurallar decide_from_average ile aynıdır: ort >= buy → al (güven = ort),
+    değilse ort <= sell → sat (güven = 1 - ort); güven (2 haneye yuvarlı)
+    min_confidence'ı aşarsa işlem açılır. Mumlar ortalamaya göre sıralanınca
+    her kombinasyonun alım kümesi bir sonek, satım kümesi bir önek olur;
+    getiri/isabet toplamları kümülatif dizilerden, sınırlar searchsorted ile
+    bulunur. Dönüş: (buy, sell, confidence) boyutlu diziler
+    """
+    valid = (counts >= min_articles) & np.isfinite(averages) & np.isfinite(returns)
+    order = np.argsort(averages[valid], kind="stable")
+    avg = averages[valid][order]
+    ret = returns[valid][order]
+    n = len(avg)
+
+    cum_ret = np.concatenate(([0.0], np.cumsum(ret)))
+    cum_up = np.concatenate(([0], np.cumsum(ret > 0)))
+    cum_down = np.concatenate(([0], np.cumsum(ret < 0)))
+    # decide_from_average güveni 2 haneye yuvarlar; yuvarlama monoton
+    buy_conf = np.round(avg, 2)
+    sell_conf = -np.round(1.0 - avg, 2)  # artan sıralı olsun diye negatif
+
+    buy = buy_thresholds[:, None, None]
+    sell = sell_thresholds[None, :, None]
+    conf = min_confidences[None, None, :]
+
+    # Alım: ort >= buy ve güven > conf  → [buy_start, n)
+    buy_start = np.maximum(
+        np.searchsorted(avg, buy, side="left"),
+        np.searchsorted(buy_conf, conf, side="right"),
+    )
+    # Satım: alım değil, ort <= sell ve güven > conf → [0, sell_end)
+    sell_end = np.minimum(
+        np.minimum(
+            np.searchsorted(avg, sell, side="right"),
+            np.searchsorted(avg, buy, side="left"),
+        ),
+        np.searchsorted(sell_conf, -conf, side="left"),
+    )
+    shape = (len(buy_thresholds), len(sell_thresholds), len(min_confidences))
+    buy_start = np.broadcast_to(buy_start, shape)
+    sell_end = np.broadcast_to(sell_end, shape)
+
+    buys = n - buy_start
+    sells = sell_end
+    trades = buys + sells
+    pnl = (cum_ret[n] - cum_ret[buy_start]) - cum_ret[sell_end] - fee * trades
+    hits = (cum_up[n] - cum_up[buy_start]) + cum_down[sell_end]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        hit_rate = np.where(trades > 0, hits / trades, np.nan)
+        avg_return = np.where(trades > 0, pnl / trades, np.nan)
+    return {
+        "trades": trades,
+        "buys": buys,
+        "sells": sells,
+        "pnl": pnl,
+        "hit_rate": hit_rate,
+        "avg_return": avg_return,
+    }
+
+
+def _run_windows(args) -> List[Dict[str, np.ndarray]]:
+    # Worker process'te bir pencere grubunu çalıştırır
+    (windows, candle_times, close, article_times, scores, grid, horizon, fee, min_articles) = args
+    returns = forward_returns(close, horizon)
+    results = []
+    for window in windows:
+        averages, counts = window_averages(candle_times, article_times, scores, window)
+        results.append(
+            evaluate_grid(
+                averages, counts, returns,
+                grid.buy_thresholds, grid.sell_thresholds, grid.min_confidences,
+                fee, min_articles,
+            )
+        )
+    return results
+
+
+@dataclass
+class BacktestResult:
+    """
+    Her kombinasyon için bir satır; diziler RESULT_FIELDS sırasıyla aynı uzunlukta.
+    """
+
+    columns: Dict[str, np.ndarray]
+
+    def __len__(self) -> int:
+        return len(self.columns["pnl"])
+
+    def top(self, n: int = 10, key: str = "pnl", min_trades: int = 1) -> List[Dict]:
+        """
+        `key`'e göre en iyi `n` kombinasyonu (en az `min_trades` işlemli) döner.
+        """
+        values = np.where(self.columns["trades"] >= min_trades, self.columns[key], np.nan)
+        order = np.argsort(-np.nan_to_num(values, nan=-np.inf), kind="stable")[:n]
+        return [self.row(i) for i in order if np.isfinite(values[i])]
+
+    def row(self, i: int) -> Dict:
+        return {name: self.columns[name][i].item() for name in RESULT_FIELDS}
+
+    def to_csv(self, path: str) -> None:
+        table = np.column_stack([self.columns[name] for name in RESULT_FIELDS])
+        np.savetxt(path, table, delimiter=",", header=",".join(RESULT_FIELDS), comments="", fmt="%.10g")
+
+
+def run_backtest(
+    candle_times: np.ndarray,
+    close: np.ndarray,
+    article_times: np.ndarray,
+    scores: np.ndarray,
+    grid: Grid,
+    horizon: int = 1,
+    fee: float = 0.0,
+    min_articles: int = 1,
+    workers: Optional[int] = None,
+) -> BacktestResult:
+    """
+    Grid'deki her kombinasyonu geçmiş mumlar üzerinde çalıştırır.
+    - candle_times / close: load_candles çıktısı (kapanış zamanı, fiyat)
+    - article_times / scores: zamana göre sıralı haber skorları
+    - horizon: işlemin kaç mum tutulacağı (her mum ayrı sinyal; işlemler örtüşebilir)
+    - fee: işlem başına getiriden düşülecek oran (örn. 0.001)
+    - min_articles: pencerede bundan az haber varsa karar verilmez
+    - workers: pencereler bu kadar process'e bölünür (1: aynı process)
+    PnL işlem getirilerinin toplamıdır (birim pozisyon, satım = açığa satış).
+    """
+    workers = workers or BACKTEST_WORKERS or os.cpu_count() or 1
+    workers = min(workers, len(grid.windows))
+    chunks = [c for c in np.array_split(grid.windows, max(workers, 1)) if len(c)]
+    tasks = [
+        (chunk, candle_times, close, article_times, scores, grid, horizon, fee, min_articles)
+        for chunk in chunks
+    ]
+    if workers <= 1:
+        per_window = [r for task in tasks for r in _run_windows(task)]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            per_window = [r for results in executor.map(_run_windows, tasks) for r in results]
+
+    inner = len(grid.buy_thresholds) * len(grid.sell_thresholds) * len(grid.min_confidences)
+    window, buy, sell, conf = np.meshgrid(
+        grid.windows, grid.buy_thresholds, grid.sell_thresholds, grid.min_confidences,
+        indexing="ij",
+    )
+    columns = {
+        "window": window.ravel(),
+        "buy_threshold": buy.ravel(),
+        "sell_threshold": sell.ravel(),
+        "min_confidence": conf.ravel(),
+    }
+    for name in ("trades", "buys", "sells", "pnl", "hit_rate", "avg_return"):
+        columns[name] = np.concatenate([r[name].reshape(inner) for r in per_window])
+    return BacktestResult(columns)
@@ -1,102 +1,70 @@
-import re
-from typing import Dict, Any
+import os
+import time
+from collections import Counter
+from typing import AsyncIterator, Dict, Any, Optional
+from dotenv import load_dotenv
 from app.agent.agent_runner import run_agent
-from app.ai_agent import ai_agent
+from app.ai_agent import get_ai_agent
+from app.intent_engine import ANALYSIS_CLASSES, Intent, get_intent_engine
+from app.response_cache import response_cache
+from app.session_memory import session_store
+
+load_dotenv()
+
+# Net komutlar ("Bitcoin analiz et") LLM'e gitmeden doğrudan run_agent'a gider
+CHAT_FAST_PATH = os.getenv("CHAT_FAST_PATH", "1").lower() in ("1", "true", "yes")
+# Bundan uzun mesajlar serbest metin sayılır ve LLM'e bırakılır
+CHAT_FAST_PATH_MAX_WORDS = int(os.getenv("CHAT_FAST_PATH_MAX_WORDS", "8"))
+# Sohbetten gelen otomatik işlem komutları ("Tesla için otomatik işlem yap")
+# run_agent'ın auto modunda (güven eşiği, sembol çözümleme, emir kuyruğu)
+# çalışır; 0 ise yalnızca analiz yapılır
+CHAT_AUTO_TRADE = os.getenv("CHAT_AUTO_TRADE", "1").lower() in ("1", "true", "yes")
+
+
+def _structured(result: Dict[str, Any]) -> Dict[str, Any]:
+    # Akışta erken gönderilen karar/grafik alanları
+    keys = ("topic", "decision", "confidence", "chart_data", "graph_url", "trade_result")
+    return {key: result[key] for key in keys if key in result}
 
 
 class ChatHandler:
     def __init__(self):
-        # Komut kalıpları ve regex'ler
-        self.patterns = {
-            'analyze': [
-                r'(?:analiz|analiz et|kontrol et|incele)\s+(.+)',
-                r'(.+?)\s+(?:analiz|analiz et|kontrol et|incele)',
-                r'(.+?)\s+(?:için|hakkında)\s+(?:analiz|sentiment)',
-            ],
-            'sentiment': [
-                r'(.+?)\s+(?:sentiment|duygu)\s+(?:analizi|analiz)',
-                r'(?:sentiment|duygu)\s+(?:analizi|analiz)\s+(.+)',
-            ],
-            'auto_trade': [
-                r'(.+?)\s+(?:otomatik|otomatik işlem|trade|alım satım)',
-                r'(?:otomatik|otomatik işlem|trade|alım satım)\s+(.+)',
-            ]
-        }
-    
+        # Hangi yolun kaç isteğe hizmet ettiği (/metrics)
+        self.route_counts = Counter()
+        # Anahtar kelime sınıfları ve sembol/alias indeksi bir kez derlenir
+        self.engine = get_intent_engine()
+
     def extract_topic_and_mode(self, message: str) -> tuple[str, str]:
         """
         Kullanıcı mesajından konu ve mod bilgisini çıkarır.
+        Selamlaşma/genel mesajlarda veya konu bulunamazsa (None, None) döner.
         """
-        message = message.lower().strip()
-        
-        # Selamlaşma ve genel mesajlar kontrolü
-        greeting_keywords = ['selam', 'merhaba', 'hey', 'hi', 'hello', 'nasılsın', 'naber', 'teşekkür', 'thanks', 'yardım', 'help']
-        if any(keyword in message for keyword in greeting_keywords):
+        intent = self.engine.parse(message)
+        if not intent.is_analysis or intent.topic is None:
             return None, None  # Analiz yapma
-        
-        # Finansal analiz anahtar kelimeleri
-        analysis_keywords = ['analiz', 'sentiment', 'duygu', 'kontrol', 'incele', 'trade', 'işlem', 'alım', 'satım']
-        has_analysis_intent = any(keyword in message for keyword in analysis_keywords)
-        
-        # Eğer analiz niyeti yoksa, sadece konu belirtilmişse de analiz yap
-        crypto_stocks = ['bitcoin', 'ethereum', 'btc', 'eth', 'apple', 'tesla', 'google', 'microsoft', 'amazon', 'netflix', 'meta', 'nvidia', 'amd', 'intel']
-        has_financial_topic = any(topic in message for topic in crypto_stocks)
-        
-        if not has_analysis_intent and not has_financial_topic:
-            return None, None  # Analiz yapma
-        
-        # Otomatik işlem modu kontrolü
-        auto_keywords = ['otomatik', 'otomatik işlem', 'trade', 'alım satım', 'işlem yap']
-        is_auto = any(keyword in message for keyword in auto_keywords)
-        
-        # Sentiment analizi kontrolü
-        sentiment_keywords = ['sentiment', 'duygu', 'duygu analizi']
-        is_sentiment_only = any(keyword in message for keyword in sentiment_keywords)
-        
-        # Konu çıkarma
-        topic = None
-        
-        # Analiz kalıpları
-        for pattern in self.patterns['analyze']:
-            match = re.search(pattern, message)
-            if match:
-                topic = match.group(1).strip()
-                break
-        
-        # Sentiment kalıpları
-        if not topic:
-            for pattern in self.patterns['sentiment']:
-                match = re.search(pattern, message)
-                if match:
-                    topic = match.group(1).strip()
-                    break
-        
-        # Otomatik işlem kalıpları
-        if not topic:
-            for pattern in self.patterns['auto_trade']:
-                match = re.search(pattern, message)
-                if match:
-                    topic = match.group(1).strip()
-                    break
-        
-        # Eğer hiçbir kalıp eşleşmezse ama finansal konu varsa
-        if not topic and has_financial_topic:
-            # Mesajdaki finansal terimleri bul
-            for financial_topic in crypto_stocks:
-                if financial_topic in message:
-                    topic = financial_topic
-                    break
-        
-        # Mod belirleme
-        if is_auto:
-            mode = "auto"
-        elif is_sentiment_only:
-            mode = "manual"  # Sadece sentiment analizi
-        else:
-            mode = "manual"  # Varsayılan olarak manuel
-        
-        return topic, mode
-    
+        return intent.topic, intent.mode
+
+    def match_command(self, message: str) -> Optional[tuple[str, str]]:
+        """
+        Mesaj net bir analiz komutuysa (konu, mod) döner; belirsiz veya serbest
+        metinse None.
+        """
+        intent = self.engine.parse(message)
+        return (intent.topic, intent.mode) if self._is_command(message, intent) else None
+
+    def _is_command(self, message: str, intent: Intent) -> bool:
+        # Kısa, soru olmayan ve konusu belli analiz mesajları komuttur.
+        # Bilinen sembol tek başına da komut sayılır ("bitcoin").
+        if not intent.is_analysis or intent.topic is None:
+            return False
+        if "?" in message or intent.word_count > CHAT_FAST_PATH_MAX_WORDS:
+            return False
+        has_keyword = any(c in ANALYSIS_CLASSES for c in intent.keywords)
+        return has_keyword or intent.word_count == 1
+
+    def _is_greeting(self, intent: Intent) -> bool:
+        return intent.is_social and intent.word_count <= 4
+
     def generate_response(self, result: Dict[str, Any]) -> str:
         """
         API sonucunu kullanıcı dostu mesaja çevirir.
@@ -118,82 +86,210 @@ class ChatHandler:
             response_parts.append(f"📊 **Karar:** {decision_text}")
             response_parts.append(f"🎯 **Güven:** %{confidence * 100:.1f}")
         
-        # Grafik bilgisi
+        # Grafik bilgisi; yalnızca sunucu PNG çizdiyse (chart_data istemciye
+        # ham veri olarak gider, çizilmiş grafik yoktur)
         if 'graph_url' in result:
-            response_parts.append(f"📈 Sentiment grafiği oluşturuldu.")
+            response_parts.append("📈 Sentiment grafiği oluşturuldu.")
         
         # İşlem sonucu
         if 'trade_result' in result:
             trade_status = result['trade_result'].get('status', 'unknown')
             if trade_status == 'FILLED':
                 response_parts.append("✅ Otomatik işlem başarıyla gerçekleştirildi!")
+            elif trade_status == 'queued':
+                response_parts.append(
+                    f"🕒 Emir kuyruğa alındı (takip: /orders/{result['trade_result'].get('key')})"
+                )
             else:
                 response_parts.append(f"⚠️ İşlem durumu: {trade_status}")
         
         return '\n'.join(response_parts)
     
-    async def process_message(self, message: str) -> Dict[str, Any]:
+    async def process_message(
+        self, message: str, session_id: Optional[str] = None
+    ) -> Dict[str, Any]:
         """
         Kullanıcı mesajını işler ve uygun yanıtı döner.
+        - session_id: verilirse tur oturum geçmişine eklenir ve AI agent'a
+          yalnızca bu oturumun (token bütçesine indirilmiş) geçmişi gönderilir
+        Sıra: net komut -> doğrudan run_agent (fast_path), selamlaşma ->
+        hazır yanıt (greeting), diğerleri -> AI agent (ai_agent). AI agent
+        kullanılamazsa eski regex yöntemine düşülür (fallback). Otomatik
+        işlem komutları run_agent'ın auto moduyla çalışır (CHAT_AUTO_TRADE).
+        Yanıttaki `served_by` hangi yolun kullanıldığını gösterir.
         """
+        start = time.perf_counter()
         try:
-            # Önce AI agent'ı dene
-            ai_result = await ai_agent.process_message(message)
-            
-            # Eğer AI agent başarılı olduysa
-            if "response" in ai_result and not "error" in ai_result:
-                return {
-                    "response_text": ai_result["response"],
-                    "is_ai_agent": True,
-                    "tools_used": ai_result.get("tools_used", []),
-                    "news_data": ai_result.get("news_data", []),
-                    "sentiment_data": ai_result.get("sentiment_data", [])
-                }
-            
-            # AI agent başarısızsa, eski yöntemi kullan
-            topic, mode = self.extract_topic_and_mode(message)
-            
-            # Eğer topic None ise, bu selamlaşma veya genel mesaj
-            if topic is None:
-                return {
-                    "response_text": self.get_greeting_response(message),
-                    "is_greeting": True
-                }
-            
-            # Agent'ı çalıştır
-            result = await run_agent(topic, mode)
-            
-            # Yanıtı formatla
-            response_text = self.generate_response(result)
-            
-            return {
-                **result,
-                "response_text": response_text,
-                "topic": topic,
-                "mode": mode
+            result = await self._route(message, session_id)
+        except Exception as e:
+            result = {
+                "error": f"İşlem sırasında bir hata oluştu: {str(e)}",
+                "served_by": "error",
             }
-            
+        return await self._finish(message, session_id, result, start)
+
+    async def stream_message(
+        self, message: str, session_id: Optional[str] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        process_message'ın akış versiyonu; olaylar {"event", "data"} olarak
+        üretilir:
+        - route: mesajı hangi yolun işleyeceği (ilk olay, hemen gönderilir)
+        - tool_start / tool_end / token: AI agent araç çağrıları ve LLM metni
+        - result: karar / grafik gibi yapılandırılmış sonuçlar hazır olunca
+        - done: process_message'ın döneceği yanıtın tamamı (son olay)
+        """
+        start = time.perf_counter()
+        intent = self.engine.parse(message)
+        route = self._direct_route(message, intent)
+        yield {"event": "route", "data": {"served_by": route or "ai_agent"}}
+
+        try:
+            if route is not None:
+                result = await self._run_direct(route, message, intent)
+                if "decision" in result:
+                    yield {"event": "result", "data": _structured(result)}
+            else:
+                history = await session_store.history(session_id) if session_id else []
+                ai_result = response_cache.lookup(message, history)
+                if ai_result is None:
+                    ai_result = {"error": "AI Agent yanıt vermedi"}
+                    agent_start = time.perf_counter()
+                    try:
+                        ai_agent = get_ai_agent()
+                    except Exception as e:
+                        ai_result = {"error": f"AI Agent başlatılamadı: {str(e)}"}
+                    else:
+                        async for event in ai_agent.stream_message(message, history):
+                            if event["event"] == "final":
+                                ai_result = event["data"]
+                            else:
+                                yield event
+                        response_cache.store(
+                            message,
+                            history,
+                            ai_result,
+                            (time.perf_counter() - agent_start) * 1000,
+                        )
+                result = await self._from_agent(message, intent, ai_result)
+                if result["served_by"] == "fallback" and "decision" in result:
+                    yield {"event": "result", "data": _structured(result)}
         except Exception as e:
+            result = {
+                "error": f"İşlem sırasında bir hata oluştu: {str(e)}",
+                "served_by": "error",
+            }
+        yield {"event": "done", "data": await self._finish(message, session_id, result, start)}
+
+    async def _finish(
+        self, message: str, session_id: Optional[str], result: Dict[str, Any], start: float
+    ) -> Dict[str, Any]:
+        if session_id and result.get("response_text"):
+            await session_store.append(session_id, message, result["response_text"])
+        self.route_counts[result["served_by"]] += 1
+        result["latency_ms"] = round((time.perf_counter() - start) * 1000, 1)
+        return result
+
+    def _direct_route(self, message: str, intent: Intent) -> Optional[str]:
+        # LLM'siz cevaplanabilecek mesajlar için yol adı; diğerleri için None
+        if CHAT_FAST_PATH and self._is_command(message, intent):
+            return "fast_path"
+        if self._is_greeting(intent):
+            return "greeting"
+        return None
+
+    async def _run_direct(self, route: str, message: str, intent: Intent) -> Dict[str, Any]:
+        if route == "fast_path":
+            return await self._run_command(intent.topic, intent.mode, served_by="fast_path")
+        return {
+            "response_text": self.get_greeting_response(message),
+            "is_greeting": True,
+            "served_by": "greeting",
+        }
+
+    async def _route(self, message: str, session_id: Optional[str]) -> Dict[str, Any]:
+        # Mesaj bir kez çözümlenir; niyet, konu ve mod birlikte gelir
+        intent = self.engine.parse(message)
+        route = self._direct_route(message, intent)
+        if route is not None:
+            return await self._run_direct(route, message, intent)
+
+        # Belirsiz / serbest metin: AI agent (yanıt cache'i önünde; agent ilk
+        # kullanımda oluşturulur, oluşturulamazsa eski yönteme düşülür)
+        history = await session_store.history(session_id) if session_id else []
+        ai_result = await response_cache.get_or_run(
+            message, history, lambda: self._ask_agent(message, history)
+        )
+        return await self._from_agent(message, intent, ai_result)
+
+    async def _from_agent(
+        self, message: str, intent: Intent, ai_result: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        # Eğer AI agent başarılı olduysa
+        if "response" in ai_result and not "error" in ai_result:
             return {
-                "error": f"İşlem sırasında bir hata oluştu: {str(e)}"
+                "response_text": ai_result["response"],
+                "is_ai_agent": True,
+                "tools_used": ai_result.get("tools_used", []),
+                "news_data": ai_result.get("news_data", []),
+                "sentiment_data": ai_result.get("sentiment_data", []),
+                "served_by": "ai_agent",
+                "cached": ai_result.get("cached", False),
             }
-    
+
+        # AI agent başarısızsa, motorun bulduğu konuyla devam et
+        topic, mode = (intent.topic, intent.mode) if intent.is_analysis else (None, None)
+
+        # Eğer topic None ise, bu selamlaşma veya genel mesaj
+        if topic is None:
+            return {
+                "response_text": self.get_greeting_response(message),
+                "is_greeting": True,
+                "served_by": "fallback",
+            }
+
+        return await self._run_command(topic, mode, served_by="fallback")
+
+    async def _ask_agent(self, message: str, history: list) -> Dict[str, Any]:
+        try:
+            ai_agent = get_ai_agent()
+        except Exception as e:
+            return {"error": f"AI Agent başlatılamadı: {str(e)}"}
+        return await ai_agent.process_message(message, history)
+
+    async def _run_command(self, topic: str, mode: str, served_by: str) -> Dict[str, Any]:
+        # Agent'ı çalıştır; otomatik işlem kapalıysa yalnızca analiz
+        if mode == "auto" and not CHAT_AUTO_TRADE:
+            mode = "manual"
+        result = await run_agent(topic, mode)
+
+        # Yanıtı formatla
+        response_text = self.generate_response(result)
+
+        return {
+            **result,
+            "response_text": response_text,
+            "topic": topic,
+            "mode": mode,
+            "served_by": served_by,
+        }
+
     def get_greeting_response(self, message: str) -> str:
         """
         Selamlaşma mesajlarına uygun yanıt verir.
         """
-        message_lower = message.lower()
+        keywords = self.engine.parse(message).keywords
         
-        if any(word in message_lower for word in ['selam', 'merhaba', 'hey', 'hi', 'hello']):
+        if 'greeting' in keywords:
             return "Merhaba! 👋 Ben News2Signal, finansal analiz konusunda size yardımcı olabilirim. Hangi konu hakkında analiz yapmamı istiyorsunuz?"
         
-        elif any(word in message_lower for word in ['nasılsın', 'naber', 'how are you']):
+        elif 'smalltalk' in keywords:
             return "İyiyim, teşekkürler! 😊 Size nasıl yardımcı olabilirim? Bitcoin, Ethereum veya başka bir konu hakkında analiz yapabilirim."
         
-        elif any(word in message_lower for word in ['teşekkür', 'thanks', 'thank you']):
+        elif 'thanks' in keywords:
             return "Rica ederim! 😊 Başka bir konuda yardıma ihtiyacınız var mı?"
         
-        elif any(word in message_lower for word in ['yardım', 'help', 'ne yapabilirsin']):
+        elif 'help' in keywords:
             return """🤖 Size şu konularda yardımcı olabilirim:
             
 📊 **Finansal Analiz**: "Bitcoin analiz et", "Ethereum sentiment analizi"
@@ -0,0 +1,258 @@
+import csv
+import os
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+from dotenv import load_dotenv
+
+from app.utils.phrase_index import PhraseIndex, tokenize
+
+load_dotenv()
+
+# Sembol/alias tabloları (virgülle ayrılmış); sonraki dosyalar öncekilerin üzerine yazar
+SYMBOLS_PATH = os.getenv("SYMBOLS_PATH", "app/data/symbols.csv")
+
+# Anahtar kelime sınıfları; "*" ile biten ifadeler Türkçe/İngilizce ekleri de
+# kabul eder ("analiz*" -> analizi, analizini). Sıra önemlidir: aynı konumda
+# önce listelenen sınıf kazanır. "auto" ifadeleri gerçek emir açtığı için
+# yalnızca tam eşleşir: "işlem yapma", "trade etme", "traders" auto sayılmaz.
+KEYWORD_CLASSES: Dict[str, List[str]] = {
+    "auto": [
+        "otomatik işlem yap", "otomatik işlem", "otomatik al sat", "alım satım yap",
+        "işlem yap", "trade et", "trade yap", "auto trade",
+    ],
+    "sentiment": ["duygu analiz*", "sentiment*", "duygu*"],
+    "analyze": ["analiz*", "analyz*", "analysis", "kontrol*", "incele*", "işlem*", "alım*", "satım*", "trade*", "sinyal*", "signal*"],
+    "help": ["ne yapabilirsin", "yardım*", "help"],
+    "thanks": ["teşekkür*", "thank you", "thanks", "sağ ol*", "sağol*"],
+    "smalltalk": ["nasılsın*", "naber", "how are you"],
+    "greeting": ["merhaba*", "selam*", "hello", "hey", "hi"],
+}
+
+ANALYSIS_CLASSES = ("auto", "sentiment", "analyze")
+SOCIAL_CLASSES = ("help", "thanks", "smalltalk", "greeting")
+
+# Olumsuz fiil çekimleri (yapma, yapmasın, etmeyin, yapmaz, yapmayacak) ve
+# İngilizce olumsuzluklar; mesajda geçerse auto niyeti manuele düşürülür.
+# Mastar ("yapmak") ve rastgele kelimeler ("almanya") olumsuz sayılmaz.
+NEGATION_RE = re.compile(
+    r"(?<!\w)(?:(?:yap|et|al|sat|gir|aç|başlat|gerçekleştir)(?:ma|me)"
+    r"(?:sın|sin|sınlar|sinler|yın|yin|yınız|yiniz|malı|meli|z|yacak|yecek|yalım|yelim|dı|di)?"
+    r"|don't|dont|do not|never)(?!\w)"
+)
+
+# Bilinmeyen konuyu ayıklarken atılan dolgu kelimeleri
+FILLER_WORDS = frozenset(
+    """
+    için hakkında hakkinda yap yapar yapın yapabilir misin mısın et eder edin
+    lütfen bir bana şu bu bugün şimdi hisse hissesi hissesini hisseleri coin
+    coini token kripto şirketi the for on about please of run do me a an
+    """.split()
+)
+
+
+def _keyword_pattern(phrases: List[str]) -> str:
+    # Uzun ifadeler önce denenir; kelime arası boşluklar esnek
+    alternatives = []
+    for phrase in sorted(phrases, key=len, reverse=True):
+        body = r"\s+".join(map(re.escape, phrase.rstrip("*").split()))
+        alternatives.append(body + (r"\w*" if phrase.endswith("*") else r"(?!\w)"))
+    return rf"(?<!\w)(?:{'|'.join(alternatives)})"
+
+
+KEYWORD_RE = re.compile(
+    "|".join(
+        f"(?P<{name}>{_keyword_pattern(phrases)})"
+        for name, phrases in KEYWORD_CLASSES.items()
+    )
+)
+
+
+@dataclass(frozen=True)
+class Symbol:
+    name: str  # Haber aramasında kullanılan kanonik ad (örn: Bitcoin)
+    ticker: str  # Borsa sembolü (örn: BTC, AAPL, THYAO.IS)
+    kind: str  # crypto, stock, commodity, index, forex
+
+
+@dataclass
+class Intent:
+    intent: str  # analyze, sentiment, auto_trade, help, thanks, smalltalk, greeting, unknown
+    topic: Optional[str] = None
+    symbol: Optional[Symbol] = None
+    mode: Optional[str] = None
+    keywords: Tuple[str, ...] = ()  # eşleşen anahtar kelime sınıfları
+    word_count: int = 0
+    negated: bool = False  # olumsuz fiil ("işlem yapma"); auto'yu manuele düşürür
+
+    @property
+    def is_analysis(self) -> bool:
+        return self.intent in ("analyze", "sentiment", "auto_trade")
+
+    @property
+    def is_social(self) -> bool:
+        return self.intent in SOCIAL_CLASSES
+
+
+class SymbolIndex:
+    """
+    İsim, ticker ve Türkçe/İngilizce alias'lardan sembole giden indeks.
+
+    Alias'lar kelime bazlı PhraseIndex'te tutulur; mesaj başına maliyet sembol
+    sayısından bağımsızdır. Alias'lar kelime sınırına oturur ve en uzun
+    eşleşme kazanır ("bitcoin cash" > "bitcoin").
+    """
+
+    def __init__(self):
+        self.symbols: List[Symbol] = []
+        self._index = PhraseIndex()
+        self._by_ticker: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    def add(self, symbol: Symbol, aliases: List[str]) -> None:
+        """
+        Sembolü ekler; aynı ticker daha önce eklendiyse alias'ları birleşir.
+        """
+        symbol_id = self._by_ticker.get(symbol.ticker.upper())
+        if symbol_id is None:
+            symbol_id = len(self.symbols)
+            self.symbols.append(symbol)
+            self._by_ticker[symbol.ticker.upper()] = symbol_id
+        else:
+            self.symbols[symbol_id] = symbol
+        for alias in aliases:
+            self._index.add(alias, symbol_id)
+
+    def get(self, alias: str) -> Optional[Symbol]:
+        symbol_id = self._index.get(alias)
+        return None if symbol_id is None else self.symbols[symbol_id]
+
+    def aliases(self) -> Dict[str, Symbol]:
+        """
+        {normalize edilmiş alias: sembol}; bulanık eşleştirme için.
+        """
+        return {alias: self.symbols[symbol_id] for alias, symbol_id in self._index.items()}
+
+    def by_ticker(self, ticker: str) -> Optional[Symbol]:
+        symbol_id = self._by_ticker.get(ticker.upper())
+        return None if symbol_id is None else self.symbols[symbol_id]
+
+    def find_tokens(self, tokens: List[str]) -> List[Tuple[Symbol, int, int]]:
+        return [
+            (self.symbols[symbol_id], start, end)
+            for symbol_id, start, end in self._index.find_tokens(tokens)
+        ]
+
+    def load_file(self, path: str) -> int:
+        """
+        'name,ticker,kind,aliases' başlıklı CSV dosyasını yükler. Alias'lar
+        '|' ile ayrılır; ad ve ticker ayrıca eşleşmesi isteniyorsa alias
+        listesine yazılmalıdır ("Target", "Block" gibi genel kelimeler yüzünden).
+        Dönüş: yüklenen sembol sayısı
+        """
+        loaded = 0
+        with open(path, encoding="utf-8", newline="") as f:
+            for row in csv.DictReader(f):
+                name = (row.get("name") or "").strip()
+                ticker = (row.get("ticker") or "").strip()
+                if not name or not ticker or name.startswith("#"):
+                    continue
+                aliases = [a.strip() for a in (row.get("aliases") or "").split("|")]
+                symbol = Symbol(name, ticker, (row.get("kind") or "").strip())
+                self.add(symbol, [a for a in aliases if a])
+                loaded += 1
+        return loaded
+
+
+class IntentEngine:
+    """
+    Mesajdan niyet, konu ve modu tek geçişte çıkarır.
+
+    Tüm anahtar kelime sınıfları tek bir derlenmiş regex'tedir; semboller
+    SymbolIndex ile kelime listesi üzerinden bulunur. Bilinen bir sembol
+    yoksa konu, anahtar ve dolgu kelimeleri atıldıktan sonra kalan
+    kelimelerden (en fazla 3) çıkarılır.
+    """
+
+    def __init__(self, symbols: SymbolIndex):
+        self.symbols = symbols
+
+    def parse(self, message: str) -> Intent:
+        text = message.lower().strip()
+        tokens = tokenize(text)
+
+        keywords = []
+        spans = []
+        for match in KEYWORD_RE.finditer(text):
+            keywords.append(match.lastgroup)
+            spans.append(match.span())
+        negated = NEGATION_RE.search(text) is not None
+        if negated:
+            keywords = [c if c != "auto" else "analyze" for c in keywords]
+        classes = tuple(dict.fromkeys(keywords))
+
+        found = self.symbols.find_tokens(tokens)
+        symbol = found[0][0] if found else None
+        topic = symbol.name if symbol else None
+
+        has_analysis = any(c in ANALYSIS_CLASSES for c in classes)
+        if topic is None and has_analysis:
+            topic = self._residual_topic(text, spans)
+
+        if topic is not None:
+            if "auto" in classes:
+                intent = "auto_trade"
+            elif "sentiment" in classes:
+                intent = "sentiment"
+            else:
+                intent = "analyze"
+        elif has_analysis:
+            intent = "analyze"
+        else:
+            intent = next((c for c in SOCIAL_CLASSES if c in classes), "unknown")
+
+        return Intent(
+            intent=intent,
+            topic=topic,
+            symbol=symbol,
+            mode=("auto" if "auto" in classes else "manual") if topic else None,
+            keywords=classes,
+            word_count=len(tokens),
+            negated=negated,
+        )
+
+    @staticmethod
+    def _residual_topic(text: str, spans: List[Tuple[int, int]]) -> Optional[str]:
+        # Anahtar kelimeleri metinden çıkar, kalan anlamlı kelimeler konudur
+        parts = []
+        last = 0
+        for start, end in spans:
+            parts.append(text[last:start])
+            last = end
+        parts.append(text[last:])
+        words = [w for w in tokenize(" ".join(parts)) if w not in FILLER_WORDS]
+        if not 1 <= len(words) <= 3:
+            return None
+        return " ".join(words)
+
+
+def build_symbol_index(paths: str = SYMBOLS_PATH) -> SymbolIndex:
+    index = SymbolIndex()
+    for path in filter(None, (p.strip() for p in paths.split(","))):
+        index.load_file(path)
+    return index
+
+
+_engine: Optional[IntentEngine] = None
+
+
+def get_intent_engine() -> IntentEngine:
+    """
+    Uygulama boyunca paylaşılan motoru döner (ilk çağrıda derlenir).
+    """
+    global _engine
+    if _engine is None:
+        _engine = IntentEngine(build_symbol_index())
+    return _engine
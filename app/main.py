@@ -1,17 +1,102 @@
+import asyncio
+import logging
+import os
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from app.api.routes import router
-import uvicorn
 from fastapi.staticfiles import StaticFiles
 
+from app.agent.agent_runner import analyze_topic
+from app.agent.article_store import close_article_store
+from app.agent.order_queue import close_order_queue
+from app.agent.scheduler import start_scheduler, stop_scheduler
+from app.agent.tools.plotting_tool import (
+    render_pool,
+    start_output_retention,
+    stop_output_retention,
+)
+from app.agent.tools.sentiment_backends import close_sentiment_backend
+from app.agent.tools.trading_tool import (
+    close_trading_client,
+    start_trading_client,
+    trading_enabled,
+)
+from app.session_memory import (
+    session_store,
+    start_session_sweeper,
+    stop_session_sweeper,
+)
+from app.utils.http_client import close_http_client, start_http_client
+
+logger = logging.getLogger(__name__)
+
+# FAST_START=1: LLM agent ve grafik worker'ları ilk kullanımda yüklenir
+FAST_START = os.getenv("FAST_START", "0").lower() in ("1", "true", "yes")
+
+
+async def warm_up() -> None:
+    """
+    Ağır bileşenleri (LangChain agent, grafik worker'ları, borsa client'ı)
+    istek kabulünü geciktirmeden arka planda hazırlar.
+    """
+    from app.ai_agent import get_ai_agent
+
+    if trading_enabled():
+        await start_trading_client()
+    try:
+        await asyncio.to_thread(get_ai_agent)
+    except Exception:
+        logger.exception("AI agent ısıtılamadı; ilk sohbet isteğinde denenecek")
+    try:
+        await render_pool.start()
+    except Exception:
+        logger.exception("Grafik worker'ları başlatılamadı")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Tüm dış HTTP çağrıları için tek bağlantı havuzu
+    await start_http_client()
+    # Ağır bileşenleri arka planda ısıt; FAST_START'ta tamamen tembel yükle
+    warm_task = None if FAST_START else asyncio.create_task(warm_up())
+    # outputs/ klasörünü boyut ve yaşa göre arka planda temizle
+    start_output_retention()
+    # Boşta kalan sohbet oturumlarını bellekten çıkar
+    start_session_sweeper()
+    # İzleme listesindeki konuların sinyallerini arka planda sıcak tut
+    start_scheduler(analyze_topic)
+    yield
+    # Kapanışta paylaşılan kaynakları serbest bırak
+    if warm_task is not None:
+        warm_task.cancel()
+        await asyncio.gather(warm_task, return_exceptions=True)
+    await stop_scheduler()
+    # Başlamamış emirler iptal edilir, süren emirler beklenir
+    await close_order_queue()
+    await stop_output_retention()
+    await stop_session_sweeper()
+    await session_store.flush()
+    render_pool.shutdown()
+    await close_sentiment_backend()
+    await close_trading_client()
+    await close_http_client()
+    close_article_store()
+
+
 app = FastAPI(
     title="FinAgent - AI Powered Trading System",
     description="Agent tabanlı finansal analiz ve alım-satım otomasyonu",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
 # Tüm route'ları kaydet
 app.mount("/outputs", StaticFiles(directory="outputs"), name="outputs")
+app.mount("/static", StaticFiles(directory="app/static"), name="static")
 app.include_router(router)
 
 if __name__ == "__main__":
+    import uvicorn
+
     uvicorn.run("app.main:app", host="0.0.0.0", port=8000, reload=True, log_level="debug")
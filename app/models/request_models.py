@@ -1,4 +1,5 @@
-from pydantic import BaseModel
+from typing import List, Optional
+from pydantic import BaseModel, Field
 from enum import Enum
 
 
@@ -7,6 +8,32 @@ class ModeEnum(str, Enum):
     manual = "manual"
 
 
+class ChartEnum(str, Enum):
+    data = "data"  # Grafik verisi döner, istemci çizer
+    png = "png"  # Sunucu PNG çizer, graph_url döner
+
+
 class AgentRequest(BaseModel):
     topic: str  # Finans konusu (örn: Bitcoin, Ethereum, Apple vs.)
     mode: ModeEnum  # İşlem modu: otomatik trade mi, sadece sinyal mi?
+    refresh: bool = False  # Önceden hesaplanmış sinyali yok say, yeniden analiz et
+    chart: Optional[ChartEnum] = None  # Yoksa CHART_MODE
+
+
+class StreamAgentRequest(BaseModel):
+    topic: str
+    max_articles: int = Field(default=200, ge=1, le=1000)  # Toplam analiz edilecek haber
+
+
+class StreamFormatEnum(str, Enum):
+    ndjson = "ndjson"
+    sse = "sse"
+
+
+class BatchAgentRequest(BaseModel):
+    topics: List[str] = Field(min_length=1, max_length=200)  # Analiz edilecek konular
+    mode: ModeEnum = ModeEnum.manual
+    refresh: bool = False
+    concurrency: Optional[int] = Field(default=None, ge=1, le=64)  # Yoksa BATCH_CONCURRENCY
+    format: StreamFormatEnum = StreamFormatEnum.ndjson  # Sonuçların akış formatı
+    chart: Optional[ChartEnum] = None
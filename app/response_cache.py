@@ -0,0 +1,283 @@
+import os
+import re
+import time
+import zlib
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from dotenv import load_dotenv
+
+import numpy as np
+
+from app.agent.tools.news_tool import NEWS_CACHE_TTL, news_snapshot_version
+from app.intent_engine import get_intent_engine
+from app.utils.cache import AsyncTTLCache
+from app.utils.phrase_index import tokenize
+
+load_dotenv()
+
+# exact: normalize edilmiş prompt birebir eşleşmeli
+# semantic: aynı konu/sürümdeki benzer promptlar da eşleşir
+# off: cache kapalı
+RESPONSE_CACHE_MODE = os.getenv("RESPONSE_CACHE_MODE", "exact")
+# Varsayılan olarak haber cache'i kadar yaşar; haberler yenilenince yanıt da yenilenir
+RESPONSE_CACHE_TTL = float(os.getenv("RESPONSE_CACHE_TTL", str(NEWS_CACHE_TTL)))
+RESPONSE_CACHE_SIZE = int(os.getenv("RESPONSE_CACHE_SIZE", "512"))
+# semantic modda eşleşme için en düşük kosinüs benzerliği
+RESPONSE_CACHE_SIMILARITY = float(os.getenv("RESPONSE_CACHE_SIMILARITY", "0.9"))
+
+EMBEDDING_DIM = 512
+# Konu/sürüm başına benzerlik için tutulan en fazla prompt
+VECTORS_PER_BUCKET = 64
+
+# Bu araçları çağıran agent yanıtları (emir açılmış olabilir) saklanmaz
+UNCACHEABLE_TOOLS = frozenset({"trading_tool"})
+
+# Semantik eşleşmede karşılaştırılan işlem yönü ("alayım mı" / "satayım mı")
+SIDE_PATTERNS = {
+    "buy": re.compile(
+        r"(?<!\w)(?:al|alayım|alayim|alsam|alsak|alalım|alalim|alınır|alinir|alım|alim"
+        r"|almalı|almali|buy|buying|long)(?!\w)"
+    ),
+    "sell": re.compile(
+        r"(?<!\w)(?:sat|satayım|satayim|satsam|satsak|satalım|satalim|satılır|satilir"
+        r"|satım|satim|satmalı|satmali|sell|selling|short)(?!\w)"
+    ),
+}
+
+
+def normalize_prompt(message: str) -> str:
+    """
+    Büyük/küçük harf, noktalama ve fazla boşlukları yok sayar:
+    "Bitcoin analiz et!" -> "bitcoin analiz et"
+    """
+    return " ".join(tokenize(message))
+
+
+def embed(text: str) -> np.ndarray:
+    """
+    Karakter trigramlarının hash'lenmiş sayımından birim vektör üretir.
+    Model gerektirmez; yazım farkları ve ek/kelime sırası değişiklikleri
+    yüksek benzerlik verir.
+    """
+    padded = f" {text} "
+    vector = np.zeros(EMBEDDING_DIM, dtype=np.float32)
+    for i in range(len(padded) - 2):
+        vector[zlib.crc32(padded[i : i + 3].encode("utf-8")) % EMBEDDING_DIM] += 1.0
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+def decision_side(text: str) -> Tuple[str, ...]:
+    """
+    Promptun sorduğu işlem yönleri: "ethereum alayım mı" -> ("buy",).
+    """
+    return tuple(side for side, pattern in SIDE_PATTERNS.items() if pattern.search(text))
+
+
+def is_cacheable(result: Dict[str, Any]) -> bool:
+    """
+    Hatalı veya emir açmış olabilecek (trading_tool çağrılmış) yanıtlar
+    saklanmaz; tekrar oynatılırsa emir açılmadan "işlem yapıldı" denir.
+    """
+    if "error" in result:
+        return False
+    return not UNCACHEABLE_TOOLS.intersection(result.get("tools_used") or ())
+
+
+class _NotCached(Exception):
+    # Saklanmayan agent yanıtları. Hatalar bekleyen herkese iletilir; emir
+    # açmış olabilecek yanıtlar paylaşılmaz, bekleyenler agent'ı kendisi çalıştırır.
+    def __init__(self, result: Dict, shared: bool = True):
+        self.result = result
+        self.shared = shared
+
+
+class ResponseCache:
+    """
+    AI agent yanıtları için cache.
+
+    Anahtar: (normalize edilmiş prompt, konu, konunun haber sürümü). Konu
+    intent motoruyla bulunur; haberleri değiştiğinde sürüm değişir ve eski
+    yanıtlar kullanılmaz. Yalnızca oturum geçmişi boşken cache'lenir ve
+    cache'ten yanıt verilir: geçmişle üretilen yanıt o oturumun bağlamına
+    aittir. Aynı anda gelen aynı promptlar tek agent çalıştırmasını paylaşır. Otomatik işlem niyetli
+    mesajlar ve trading_tool çağıran yanıtlar ne saklanır ne paylaşılır;
+    semantik eşleşme yalnızca aynı işlem yönünü soran promptlar arasındadır.
+    """
+
+    def __init__(
+        self,
+        mode: str = RESPONSE_CACHE_MODE,
+        ttl: float = RESPONSE_CACHE_TTL,
+        maxsize: int = RESPONSE_CACHE_SIZE,
+        similarity: float = RESPONSE_CACHE_SIMILARITY,
+    ):
+        self.mode = mode
+        self.similarity = similarity
+        self._cache = AsyncTTLCache(ttl=ttl, maxsize=maxsize, name="agent_responses")
+        # (konu, sürüm) -> {normalize prompt: vektör}
+        self._vectors: "OrderedDict[Tuple, OrderedDict[str, np.ndarray]]" = OrderedDict()
+        self.semantic_hits = 0
+        self.bypassed = 0
+        self.latency_saved_ms = 0.0
+
+    def _bucket(self, message: str) -> Tuple[Optional[str], Optional[str]]:
+        return self._topic_bucket(get_intent_engine().parse(message).topic)
+
+    @staticmethod
+    def _topic_bucket(topic: Optional[str]) -> Tuple[Optional[str], Optional[str]]:
+        if topic is None:
+            return None, None
+        return topic.lower(), news_snapshot_version(topic)
+
+    def _remember(self, bucket: Tuple, normalized: str) -> None:
+        vectors = self._vectors.get(bucket)
+        if vectors is None:
+            vectors = self._vectors[bucket] = OrderedDict()
+        vectors[normalized] = embed(normalized)
+        vectors.move_to_end(normalized)
+        self._vectors.move_to_end(bucket)
+        while len(vectors) > VECTORS_PER_BUCKET:
+            vectors.popitem(last=False)
+        while len(self._vectors) > self._cache.maxsize:
+            self._vectors.popitem(last=False)
+
+    def _similar(self, bucket: Tuple, normalized: str) -> Optional[Dict]:
+        vectors = self._vectors.get(bucket)
+        if not vectors:
+            return None
+        # Yalnızca aynı işlem yönünü soran promptlar aday olur
+        side = decision_side(normalized)
+        prompts = [p for p in vectors if decision_side(p) == side]
+        if not prompts:
+            return None
+        scores = np.stack([vectors[p] for p in prompts]) @ embed(normalized)
+        best = int(np.argmax(scores))
+        if scores[best] < self.similarity:
+            return None
+        entry = self._cache.get((prompts[best], *bucket))
+        if entry is None:
+            # Süresi dolmuş
+            del vectors[prompts[best]]
+        return entry
+
+    def _lookup_key(self, message: str, history: List) -> Optional[Tuple]:
+        # Cache'lenemeyen mesajlar için None
+        if self.mode == "off":
+            return None
+        intent = get_intent_engine().parse(message)
+        if intent.mode == "auto":
+            self.bypassed += 1
+            return None
+        if history:
+            self.bypassed += 1
+            return None
+        return (normalize_prompt(message), *self._topic_bucket(intent.topic))
+
+    def _hit(self, entry: Dict) -> Dict[str, Any]:
+        self.latency_saved_ms += entry["latency_ms"]
+        return {**entry["result"], "cached": True}
+
+    def lookup(self, message: str, history: List) -> Optional[Dict[str, Any]]:
+        """
+        Agent'ı çalıştırmadan yalnızca cache'e bakar (akış yanıtları için).
+        """
+        key = self._lookup_key(message, history)
+        if key is None:
+            return None
+        entry = self._cache.get(key)
+        if entry is None and self.mode == "semantic":
+            entry = self._similar(key[1:], key[0])
+            if entry is not None:
+                self.semantic_hits += 1
+        if entry is None:
+            self._cache.misses += 1
+            return None
+        self._cache.hits += 1
+        return self._hit(entry)
+
+    def store(
+        self, message: str, history: List, result: Dict[str, Any], latency_ms: float
+    ) -> None:
+        """
+        Başka yoldan (ör. akışla) üretilmiş başarılı yanıtı saklar.
+        """
+        if self.mode == "off" or not is_cacheable(result):
+            return
+        intent = get_intent_engine().parse(message)
+        if intent.mode == "auto":
+            return
+        if history:
+            return
+        bucket = self._topic_bucket(intent.topic)
+        normalized = normalize_prompt(message)
+        self._cache.set((normalized, *bucket), {"result": result, "latency_ms": latency_ms})
+        if self.mode == "semantic":
+            self._remember(bucket, normalized)
+
+    async def get_or_run(
+        self,
+        message: str,
+        history: List,
+        run: Callable[[], Awaitable[Dict[str, Any]]],
+    ) -> Dict[str, Any]:
+        """
+        Cache'te varsa saklanan yanıtı (`cached: True` ile) döner; yoksa
+        `run()` ile agent'ı çalıştırır ve başarılı yanıtı saklar.
+        """
+        key = self._lookup_key(message, history)
+        if key is None:
+            return await run()
+
+        normalized, bucket = key[0], key[1:]
+        if self.mode == "semantic":
+            entry = self._similar(bucket, normalized)
+            if entry is not None:
+                self.semantic_hits += 1
+                return self._hit(entry)
+
+        loaded = False
+
+        async def load() -> Dict:
+            nonlocal loaded
+            loaded = True
+            start = time.perf_counter()
+            result = await run()
+            if not is_cacheable(result):
+                raise _NotCached(result, shared="error" in result)
+            return {"result": result, "latency_ms": (time.perf_counter() - start) * 1000}
+
+        try:
+            entry = await self._cache.get_or_load(key, load)
+        except _NotCached as e:
+            if loaded or e.shared:
+                return e.result
+            return await run()
+
+        if not loaded:
+            return self._hit(entry)
+
+        # Agent haberleri ilk kez çektiyse konu sürümü değişmiştir; sonraki
+        # istekler yeni sürümle arayacağı için yanıtı o anahtarla da sakla
+        new_bucket = self._bucket(message)
+        if new_bucket != bucket:
+            self._cache.set((normalized, *new_bucket), entry)
+        if self.mode == "semantic":
+            self._remember(new_bucket, normalized)
+        return entry["result"]
+
+    def stats(self) -> Dict[str, Any]:
+        stats = self._cache.stats()
+        hits = stats["hits"] + stats["coalesced"] + self.semantic_hits
+        lookups = hits + stats["misses"]
+        return {
+            **stats,
+            "mode": self.mode,
+            "semantic_hits": self.semantic_hits,
+            "bypassed": self.bypassed,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+            "latency_saved_ms": round(self.latency_saved_ms, 1),
+        }
+
+
+response_cache = ResponseCache()
@@ -0,0 +1,221 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+from dotenv import load_dotenv
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# LLM'e gönderilecek geçmişin yaklaşık token bütçesi
+SESSION_MAX_TOKENS = int(os.getenv("SESSION_MAX_TOKENS", "1500"))
+# Bu kadar saniye kullanılmayan oturum bellekten çıkarılır
+SESSION_IDLE_TTL = float(os.getenv("SESSION_IDLE_TTL", "1800"))
+# Bellekte tutulacak en fazla oturum; aşılırsa en eski kullanılan çıkarılır
+SESSION_MAX_SESSIONS = int(os.getenv("SESSION_MAX_SESSIONS", "1000"))
+# Tanımlıysa bellekten çıkarılan oturumlar diske yazılır ve tekrar gelince yüklenir
+SESSION_SPILL_DIR = os.getenv("SESSION_SPILL_DIR", "")
+# Diske yazılmış oturumların saklanma süresi (saniye)
+SESSION_SPILL_TTL = float(os.getenv("SESSION_SPILL_TTL", str(7 * 24 * 3600)))
+SESSION_SWEEP_INTERVAL = float(os.getenv("SESSION_SWEEP_INTERVAL", "60"))
+
+
+def estimate_tokens(text: str) -> int:
+    # Tokenizer yüklemeden kaba tahmin: ~4 karakter / token
+    return len(text) // 4 + 1
+
+
+@dataclass
+class Session:
+    turns: List[Tuple[str, str]] = field(default_factory=list)  # (rol, metin)
+    tokens: int = 0
+    last_used: float = field(default_factory=time.time)
+
+
+class SessionStore:
+    """
+    Oturum başına sınırlı sohbet geçmişi.
+
+    Her oturumun geçmişi `max_tokens` bütçesini aşınca en eski mesajlar
+    atılır (kayan pencere); böylece her turda LLM'e giden prompt ve oturum
+    başına bellek sabit kalır. `idle_ttl` boyunca kullanılmayan oturumlar ve
+    `max_sessions` sınırını aşanlar bellekten çıkarılır; `spill_dir`
+    verilmişse diske yazılır ve oturum tekrar geldiğinde yüklenir.
+    """
+
+    def __init__(
+        self,
+        max_tokens: int = SESSION_MAX_TOKENS,
+        idle_ttl: float = SESSION_IDLE_TTL,
+        max_sessions: int = SESSION_MAX_SESSIONS,
+        spill_dir: str = SESSION_SPILL_DIR,
+    ):
+        self.max_tokens = max_tokens
+        self.idle_ttl = idle_ttl
+        self.max_sessions = max_sessions
+        self.spill_dir = spill_dir
+        self._sessions: "OrderedDict[str, Session]" = OrderedDict()
+        self.evicted = 0
+        self.spilled = 0
+        self.restored = 0
+        if spill_dir:
+            os.makedirs(spill_dir, exist_ok=True)
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def _spill_path(self, session_id: str) -> str:
+        # Oturum id'si dosya adında doğrudan kullanılmaz
+        digest = hashlib.sha256(session_id.encode("utf-8")).hexdigest()[:32]
+        return os.path.join(self.spill_dir, f"{digest}.json")
+
+    def _write_spill(self, session_id: str, session: Session) -> None:
+        path = self._spill_path(session_id)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"turns": session.turns}, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    def _read_spill(self, session_id: str) -> Optional[Session]:
+        path = self._spill_path(session_id)
+        try:
+            with open(path, encoding="utf-8") as f:
+                turns = [tuple(turn) for turn in json.load(f)["turns"]]
+        except (FileNotFoundError, ValueError, KeyError):
+            return None
+        os.remove(path)
+        return Session(turns, sum(estimate_tokens(text) for _, text in turns))
+
+    async def _load(self, session_id: str) -> Optional[Session]:
+        session = self._sessions.get(session_id)
+        if session is None and self.spill_dir:
+            session = await asyncio.to_thread(self._read_spill, session_id)
+            if session is not None:
+                self.restored += 1
+                self._sessions[session_id] = session
+        if session is not None:
+            session.last_used = time.time()
+            self._sessions.move_to_end(session_id)
+        return session
+
+    async def history(self, session_id: str) -> List[Tuple[str, str]]:
+        """
+        Oturumun (rol, metin) listesini eskiden yeniye döner; rol "human"
+        veya "ai".
+        """
+        session = await self._load(session_id)
+        return list(session.turns) if session else []
+
+    async def append(self, session_id: str, user_text: str, ai_text: str) -> None:
+        """
+        Bir turu ekler ve geçmişi token bütçesine indirir.
+        """
+        session = await self._load(session_id)
+        if session is None:
+            session = Session()
+            self._sessions[session_id] = session
+
+        for turn in (("human", user_text), ("ai", ai_text)):
+            session.turns.append(turn)
+            session.tokens += estimate_tokens(turn[1])
+        # Turlar (kullanıcı + yanıt) birlikte atılır; geçmiş yanıtla başlamasın
+        while session.turns and session.tokens > self.max_tokens:
+            for _, text in session.turns[:2]:
+                session.tokens -= estimate_tokens(text)
+            del session.turns[:2]
+
+        await self._enforce_limit()
+
+    async def _evict(self, session_id: str) -> None:
+        session = self._sessions.pop(session_id, None)
+        if session is None:
+            return
+        self.evicted += 1
+        if self.spill_dir and session.turns:
+            try:
+                await asyncio.to_thread(self._write_spill, session_id, session)
+                self.spilled += 1
+            except OSError:
+                logger.exception("Oturum diske yazılamadı")
+
+    async def _enforce_limit(self) -> None:
+        while len(self._sessions) > self.max_sessions:
+            await self._evict(next(iter(self._sessions)))
+
+    async def sweep(self) -> int:
+        """
+        Boşta kalan oturumları çıkarır, süresi dolan disk kayıtlarını siler.
+        Dönüş: bellekten çıkarılan oturum sayısı
+        """
+        cutoff = time.time() - self.idle_ttl
+        # OrderedDict en eski kullanılandan yeniye sıralı
+        idle = []
+        for session_id, session in self._sessions.items():
+            if session.last_used > cutoff:
+                break
+            idle.append(session_id)
+        for session_id in idle:
+            await self._evict(session_id)
+        if self.spill_dir:
+            await asyncio.to_thread(self._sweep_spill)
+        return len(idle)
+
+    async def flush(self) -> None:
+        """
+        Kapanışta tüm oturumları (spill_dir varsa) diske yazar.
+        """
+        for session_id in list(self._sessions):
+            await self._evict(session_id)
+
+    def _sweep_spill(self) -> None:
+        cutoff = time.time() - SESSION_SPILL_TTL
+        for entry in os.scandir(self.spill_dir):
+            if entry.is_file() and entry.stat().st_mtime < cutoff:
+                try:
+                    os.remove(entry.path)
+                except FileNotFoundError:
+                    pass
+
+    def stats(self) -> Dict:
+        return {
+            "sessions": len(self._sessions),
+            "max_sessions": self.max_sessions,
+            "max_tokens": self.max_tokens,
+            "evicted": self.evicted,
+            "spilled": self.spilled,
+            "restored": self.restored,
+        }
+
+
+session_store = SessionStore()
+
+_sweep_task: Optional[asyncio.Task] = None
+
+
+async def _sweep_loop(interval: float) -> None:
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await session_store.sweep()
+        except Exception:
+            logger.exception("Oturumlar temizlenemedi")
+
+
+def start_session_sweeper(interval: float = SESSION_SWEEP_INTERVAL) -> None:
+    global _sweep_task
+    if _sweep_task is None:
+        _sweep_task = asyncio.create_task(_sweep_loop(interval))
+
+
+async def stop_session_sweeper() -> None:
+    global _sweep_task
+    if _sweep_task is not None:
+        _sweep_task.cancel()
+        await asyncio.gather(_sweep_task, return_exceptions=True)
+        _sweep_task = None
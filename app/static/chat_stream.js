@@ -0,0 +1,108 @@
+// /chat/stream Server-Sent Events istemcisi. EventSource yalnızca GET
+// desteklediği için akış fetch + ReadableStream ile okunur.
+//
+// Kullanım:
+//   const reply = document.createElement("div");
+//   messages.appendChild(reply);
+//   const done = await renderChatStream(reply, "Bitcoin analiz et", sessionId);
+//   sessionId = done.session_id;
+
+async function streamChat(message, sessionId, onEvent) {
+  const response = await fetch("/chat/stream", {
+    method: "POST",
+    headers: { "Content-Type": "application/json" },
+    body: JSON.stringify({ message, session_id: sessionId || null }),
+  });
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = "";
+  let last = null;
+
+  for (;;) {
+    const { value, done } = await reader.read();
+    if (done) break;
+    buffer += decoder.decode(value, { stream: true });
+
+    // Olaylar boş satırla ayrılır
+    let boundary;
+    while ((boundary = buffer.indexOf("\n\n")) !== -1) {
+      const block = buffer.slice(0, boundary);
+      buffer = buffer.slice(boundary + 2);
+      let event = "message";
+      const data = [];
+      for (const line of block.split("\n")) {
+        if (line.startsWith("event:")) event = line.slice(6).trim();
+        else if (line.startsWith("data:")) data.push(line.slice(5).trim());
+      }
+      if (!data.length) continue;
+      const payload = JSON.parse(data.join("\n"));
+      if (event === "done") last = payload;
+      onEvent(event, payload);
+    }
+  }
+  return last;
+}
+
+const TOOL_LABELS = {
+  news_tool: "📰 Haberler toplanıyor",
+  sentiment_tool: "📊 Sentiment analizi yapılıyor",
+  decision_tool: "🎯 Karar veriliyor",
+  plotting_tool: "📈 Grafik hazırlanıyor",
+  trading_tool: "💱 İşlem gönderiliyor",
+};
+
+const DECISION_LABELS = { buy: "AL", sell: "SAT", hold: "BEKLE" };
+
+// Yanıtı geldikçe `container` içine çizer; son `done` olayını döner.
+async function renderChatStream(container, message, sessionId) {
+  const status = document.createElement("div");
+  status.className = "chat-status";
+  const text = document.createElement("div");
+  text.className = "chat-text";
+  const result = document.createElement("div");
+  result.className = "chat-result";
+  container.append(status, text, result);
+
+  const showResult = (data) => {
+    if (data.decision) {
+      const label = DECISION_LABELS[data.decision] || String(data.decision).toUpperCase();
+      const confidence = ((data.confidence || 0) * 100).toFixed(1);
+      result.textContent = `📊 Karar: ${label}  🎯 Güven: %${confidence}`;
+    }
+    if (data.chart_data && typeof drawSentimentChart === "function") {
+      const canvas = document.createElement("canvas");
+      canvas.style.width = "100%";
+      canvas.style.height = "240px";
+      result.appendChild(canvas);
+      drawSentimentChart(canvas, data.chart_data);
+    } else if (data.graph_url) {
+      const img = document.createElement("img");
+      img.src = data.graph_url;
+      img.alt = "Sentiment grafiği";
+      result.appendChild(img);
+    }
+  };
+
+  return streamChat(message, sessionId, (event, data) => {
+    switch (event) {
+      case "route":
+        status.textContent = data.served_by === "ai_agent" ? "🤖 Düşünüyor..." : "";
+        break;
+      case "tool_start":
+        status.textContent = (TOOL_LABELS[data.tool] || data.tool) + "...";
+        break;
+      case "token":
+        status.textContent = "";
+        text.textContent += data.text;
+        break;
+      case "result":
+        showResult(data);
+        break;
+      case "done":
+        status.textContent = "";
+        if (data.error) text.textContent = data.error;
+        else if (!text.textContent) text.textContent = data.response_text || "";
+        break;
+    }
+  });
+}
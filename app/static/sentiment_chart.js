@@ -0,0 +1,63 @@
+// Sunucunun döndüğü chart_data ({t: [unix saniye], y: [skor]}) verisini
+// bir <canvas> üzerine çizer. Kullanım:
+//   drawSentimentChart(document.getElementById("chart"), result.chart_data);
+function drawSentimentChart(canvas, chartData) {
+  const ctx = canvas.getContext("2d");
+  const ratio = window.devicePixelRatio || 1;
+  const width = canvas.clientWidth || 480;
+  const height = canvas.clientHeight || 240;
+  canvas.width = width * ratio;
+  canvas.height = height * ratio;
+  ctx.setTransform(ratio, 0, 0, ratio, 0, 0);
+  ctx.clearRect(0, 0, width, height);
+
+  const t = chartData.t || [];
+  const y = chartData.y || [];
+  const pad = { left: 36, right: 12, top: 24, bottom: 32 };
+  const plotW = width - pad.left - pad.right;
+  const plotH = height - pad.top - pad.bottom;
+
+  ctx.fillStyle = "#333";
+  ctx.font = "13px sans-serif";
+  ctx.fillText(`Sentiment Trend for ${chartData.topic || ""}`, pad.left, 16);
+  if (t.length === 0) return;
+
+  const tMin = t[0];
+  const tSpan = Math.max(t[t.length - 1] - tMin, 1);
+  const px = (v) => pad.left + ((v - tMin) / tSpan) * plotW;
+  const py = (v) => pad.top + (1 - v) * plotH; // skorlar 0.0–1.0 aralığında
+
+  // Eksenler ve 0.4 / 0.6 eşik çizgileri
+  ctx.strokeStyle = "#ccc";
+  ctx.lineWidth = 1;
+  ctx.beginPath();
+  ctx.moveTo(pad.left, pad.top);
+  ctx.lineTo(pad.left, pad.top + plotH);
+  ctx.lineTo(pad.left + plotW, pad.top + plotH);
+  ctx.stroke();
+  ctx.setLineDash([4, 4]);
+  [0.4, 0.6].forEach((level) => {
+    ctx.beginPath();
+    ctx.moveTo(pad.left, py(level));
+    ctx.lineTo(pad.left + plotW, py(level));
+    ctx.stroke();
+  });
+  ctx.setLineDash([]);
+
+  ctx.fillStyle = "#666";
+  ctx.font = "11px sans-serif";
+  [0, 0.5, 1].forEach((level) => ctx.fillText(level.toFixed(1), 8, py(level) + 4));
+  const fmt = (s) => {
+    const d = new Date(s * 1000);
+    return `${String(d.getHours()).padStart(2, "0")}:${String(d.getMinutes()).padStart(2, "0")}`;
+  };
+  ctx.fillText(fmt(t[0]), pad.left, height - 10);
+  ctx.fillText(fmt(t[t.length - 1]), pad.left + plotW - 30, height - 10);
+
+  // Seri
+  ctx.strokeStyle = "#1f77b4";
+  ctx.lineWidth = 2;
+  ctx.beginPath();
+  t.forEach((v, i) => (i === 0 ? ctx.moveTo(px(v), py(y[i])) : ctx.lineTo(px(v), py(y[i]))));
+  ctx.stroke();
+}
@@ -0,0 +1,95 @@
+import asyncio
+import os
+import random
+from typing import Optional
+from dotenv import load_dotenv
+import httpx
+
+load_dotenv()
+
+HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", "10"))
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+HTTP_MAX_KEEPALIVE = int(os.getenv("HTTP_MAX_KEEPALIVE", "20"))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30"))
+HTTP_RETRIES = int(os.getenv("HTTP_RETRIES", "2"))
+HTTP_BACKOFF = float(os.getenv("HTTP_BACKOFF", "0.25"))
+
+# Tekrar denemeye değer geçici hata kodları
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+_client: Optional[httpx.AsyncClient] = None
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def create_http_client() -> httpx.AsyncClient:
+    """
+    Keep-alive limitli, (h2 kuruluysa) HTTP/2 destekli bir client oluşturur.
+    """
+    return httpx.AsyncClient(
+        timeout=HTTP_TIMEOUT,
+        http2=_http2_available(),
+        limits=httpx.Limits(
+            max_connections=HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=HTTP_MAX_KEEPALIVE,
+            keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+        ),
+    )
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Uygulama boyunca paylaşılan client'ı döner. Lifespan dışında (script,
+    test) çağrılırsa ilk kullanımda oluşturulur.
+    """
+    global _client
+    if _client is None or _client.is_closed:
+        _client = create_http_client()
+    return _client
+
+
+async def start_http_client() -> httpx.AsyncClient:
+    return get_http_client()
+
+
+async def close_http_client() -> None:
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+async def request_with_retry(
+    method: str,
+    url: str,
+    retries: int = HTTP_RETRIES,
+    backoff: float = HTTP_BACKOFF,
+    **kwargs,
+) -> httpx.Response:
+    """
+    Paylaşılan client ile istek atar; bağlantı hatalarında ve 429/5xx
+    yanıtlarında üstel bekleme ile tekrar dener. Retry-After başlığına uyar.
+    Son denemenin yanıtı (başarısız olsa da) olduğu gibi döner.
+    """
+    client = get_http_client()
+    for attempt in range(retries + 1):
+        delay = backoff * (2 ** attempt)
+        try:
+            resp = await client.request(method, url, **kwargs)
+        except httpx.TransportError:
+            if attempt == retries:
+                raise
+        else:
+            if resp.status_code not in RETRY_STATUS_CODES or attempt == retries:
+                return resp
+            retry_after = resp.headers.get("Retry-After", "")
+            if retry_after.isdigit():
+                delay = max(delay, min(float(retry_after), HTTP_TIMEOUT))
+            await resp.aclose()
+        await asyncio.sleep(delay + random.uniform(0, backoff))
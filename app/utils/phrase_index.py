@@ -0,0 +1,73 @@
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Kelime sınırları: Türkçe karakterler dahil tüm unicode harf/rakamlar
+TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Metni küçük harfe çevirip kelimelere ayırır.
+    """
+    return TOKEN_RE.findall(text.lower())
+
+
+class PhraseIndex:
+    """
+    Tek ve çok kelimeli ifadeler için kelime bazlı eşleştirici.
+
+    İfadeler kelime demetleri (tuple) olarak bir sözlükte tutulur; metin tek
+    geçişte taranır ve her konumda en uzun eşleşme alınır. Maliyet
+    O(kelime sayısı × en uzun ifade uzunluğu) olup sözlük büyüklüğünden
+    bağımsızdır. Eşleşmeler kelime sınırına oturduğu için "up" ifadesi
+    "support" içinde yakalanmaz.
+    """
+
+    def __init__(self):
+        self._phrases: Dict[Tuple[str, ...], int] = {}
+        self.max_len = 0
+
+    def __len__(self) -> int:
+        return len(self._phrases)
+
+    def add(self, phrase: str, value: int) -> bool:
+        """
+        İfadeyi ekler; ifade boşsa False döner. Aynı ifade tekrar eklenirse
+        son değer geçerli olur.
+        """
+        key = tuple(tokenize(phrase))
+        if not key:
+            return False
+        self._phrases[key] = value
+        self.max_len = max(self.max_len, len(key))
+        return True
+
+    def get(self, phrase: str) -> Optional[int]:
+        return self._phrases.get(tuple(tokenize(phrase)))
+
+    def items(self) -> Iterable[Tuple[str, int]]:
+        """
+        (normalize edilmiş ifade, değer) çiftleri.
+        """
+        return ((" ".join(key), value) for key, value in self._phrases.items())
+
+    def find_tokens(self, tokens: List[str]) -> Iterable[Tuple[int, int, int]]:
+        """
+        Kelime listesindeki eşleşmeleri (değer, başlangıç, bitiş) olarak üretir.
+        Eşleşmeler çakışmaz; her konumda en uzun ifade tercih edilir.
+        """
+        phrases = self._phrases
+        n = len(tokens)
+        i = 0
+        while i < n:
+            for length in range(min(self.max_len, n - i), 0, -1):
+                value = phrases.get(tuple(tokens[i : i + length]))
+                if value is not None:
+                    yield value, i, i + length
+                    i += length
+                    break
+            else:
+                i += 1
+
+    def find(self, text: str) -> List[Tuple[int, int, int]]:
+        return list(self.find_tokens(tokenize(text)))
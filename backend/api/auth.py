@@ -1,33 +1,39 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Request
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
 from backend.schemas.auth import RegisterRequest, RegisterResponse, LoginRequest, LoginResponse
 from backend.db.session import get_db
 from backend.db.models import User
-from backend.core.security import hash_password, verify_password, create_access_token
+from backend.core.security import hash_password_async, verify_password_async, create_access_token
 
 router = APIRouter()
 
+async def _get_user_by_email(db: AsyncSession, email: str):
+    result = await db.execute(select(User).where(User.email == email))
+    return result.scalar_one_or_none()
+
 @router.post("/register", response_model=RegisterResponse)
-def register_user(payload: RegisterRequest, db: Session = Depends(get_db)):
+async def register_user(payload: RegisterRequest, db: AsyncSession = Depends(get_db)):
     # Uygulama seviyesi kontrol (erken dön geri bildirim)
-    if db.query(User).filter(User.email == payload.email).first():
+    if await _get_user_by_email(db, payload.email):
         raise HTTPException(status_code=400, detail="Email already registered")
 
-    user = User(email=payload.email, password_hash=hash_password(payload.password))
+    # bcrypt event loop'u bloklamadan ayrı executor'da çalışır
+    user = User(email=payload.email, password_hash=await hash_password_async(payload.password))
     db.add(user)
     try:
-        db.commit()  # DB seviyesi güvence (unique index)
+        await db.commit()  # DB seviyesi güvence (unique index)
     except IntegrityError:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=400, detail="Email already registered")
     return {"message": "Kayıt başarılı!"}
 
 @router.post("/login", response_model=LoginResponse)
-def login_user(payload: LoginRequest, db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.email == payload.email).first()
+async def login_user(payload: LoginRequest, db: AsyncSession = Depends(get_db)):
+    user = await _get_user_by_email(db, payload.email)
     # Kullanıcı adı/şifre ayrımı yapma → enumeration engeli
-    if not user or not verify_password(payload.password, user.password_hash):
+    if not user or not await verify_password_async(payload.password, user.password_hash):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Geçersiz kimlik bilgileri")
     token = create_access_token(sub=str(user.id))
     return {"access_token": token, "token_type": "bearer"}
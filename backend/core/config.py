@@ -10,6 +10,12 @@ class Settings(BaseModel):
     DATABASE_URL: str = os.getenv("DATABASE_URL", "")
     JWT_SECRET: str = os.getenv("JWT_SECRET", "dev_secret")
     JWT_EXPIRE_MINUTES: int = int(os.getenv("JWT_EXPIRE_MINUTES", "60"))
+    # Async DB bağlantı havuzu
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "10"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+    # bcrypt maliyeti (2^rounds) ve aynı anda çalışacak hash işlemi
+    BCRYPT_ROUNDS: int = int(os.getenv("BCRYPT_ROUNDS", "12"))
+    BCRYPT_MAX_WORKERS: int = int(os.getenv("BCRYPT_MAX_WORKERS", str(os.cpu_count() or 2)))
 
 
 settings = Settings()
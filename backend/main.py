@@ -9,6 +9,7 @@ from sqlalchemy import text
 # Eğer projeyi repo kökünden "uvicorn backend.main:app" ile çalıştırıyorsan:
 from backend.db.base import Base
 from backend.db.session import engine
+from backend.core.security import shutdown_password_executor
 from backend.api.routes import router as api_router
 
 # Eğer projeyi "cd backend && uvicorn main:app" ile çalıştırıyorsan
@@ -20,17 +21,20 @@ from backend.api.routes import router as api_router
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # DB tabloları (Alembic yoksa)
-    Base.metadata.create_all(bind=engine)
+    # DB tabloları (Alembic yoksa); metadata API'si senkron olduğu için run_sync
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
     # Basit bağlantı kontrolü
     try:
-        with engine.connect() as conn:
-            conn.execute(text("SELECT 1"))
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
     except Exception:
         # İstersen burada logla ya da retry mekanizması koy
         pass
     yield
-    # Kapanışta yapılacak işler varsa buraya
+    # Kapanışta bağlantı havuzunu ve bcrypt worker'larını kapat
+    await engine.dispose()
+    shutdown_password_executor()
 
 
 app = FastAPI(title="News2Signal Backend", lifespan=lifespan)
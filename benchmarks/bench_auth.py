@@ -0,0 +1,90 @@
+"""
+Backend /api/register ve /api/login yük benchmark'ı.
+
+Kullanım:
+    python -m benchmarks.bench_auth --users 50 --requests 400 --concurrency 50
+
+Backend'i geçici bir SQLite veritabanıyla (DATABASE_URL verilmediyse)
+arka planda başlatır; kullanıcıları eşzamanlı kaydeder, ardından eşzamanlı
+login isteklerinin gecikme yüzdeliklerini ve saniyelik isteği yazar.
+BCRYPT_ROUNDS ve BCRYPT_MAX_WORKERS ortam değişkenleriyle denenebilir.
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from typing import List
+
+import httpx
+
+from benchmarks.bench_news import _free_port, percentile
+
+
+def start_backend(port: int):
+    import threading
+
+    import uvicorn
+
+    from backend.main import app
+
+    server = uvicorn.Server(
+        uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning")
+    )
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return server
+
+
+async def run_load(client: httpx.AsyncClient, path: str, payloads: List[dict], concurrency: int):
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    errors = 0
+
+    async def one(payload):
+        nonlocal errors
+        async with semaphore:
+            start = time.perf_counter()
+            resp = await client.post(path, json=payload)
+            latencies.append(time.perf_counter() - start)
+            if resp.status_code != 200:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(p) for p in payloads))
+    elapsed = time.perf_counter() - start
+    print(
+        f"{path:>14}: {len(payloads)} istek, {len(payloads) / elapsed:.1f} istek/s, "
+        f"p50={percentile(latencies, 50) * 1000:.1f}ms "
+        f"p95={percentile(latencies, 95) * 1000:.1f}ms "
+        f"p99={percentile(latencies, 99) * 1000:.1f}ms hata={errors}"
+    )
+
+
+async def main(users: int, requests: int, concurrency: int, port: int) -> None:
+    accounts = [
+        {"email": f"bench{i}@example.com", "password": f"Bench{i}Password"} for i in range(users)
+    ]
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(
+        base_url=f"http://127.0.0.1:{port}", limits=limits, timeout=60
+    ) as client:
+        await run_load(client, "/api/register", accounts, concurrency)
+        logins = [accounts[i % users] for i in range(requests)]
+        await run_load(client, "/api/login", logins, concurrency)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+
+    if not os.getenv("DATABASE_URL"):
+        db_path = os.path.join(tempfile.mkdtemp(), "bench_auth.db")
+        os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+    port = _free_port()
+    start_backend(port)
+    asyncio.run(main(args.users, args.requests, args.concurrency, port))
@@ -0,0 +1,69 @@
+"""
+Intent motoru benchmark'ı.
+
+Kullanım:
+    python -m benchmarks.bench_intent --symbols 5000 --messages 20000
+
+Yerleşik sembol tablosuna sentetik semboller ekleyerek mesaj başına çözümleme
+süresinin sembol sayısıyla büyümediğini gösterir.
+"""
+import argparse
+import random
+import time
+from typing import Dict, List
+
+from app.intent_engine import IntentEngine, Symbol, build_symbol_index
+
+TEMPLATES = [
+    "{} analiz et",
+    "{} için otomatik işlem yap",
+    "{} sentiment analizi",
+    "{} hissesini incele",
+    "bugün {} hakkında ne düşünüyorsun?",
+    "merhaba",
+    "{}",
+]
+
+
+def make_messages(names: List[str], count: int, seed: int = 42) -> List[str]:
+    rng = random.Random(seed)
+    return [rng.choice(TEMPLATES).format(rng.choice(names)) for _ in range(count)]
+
+
+def run(extra_symbols: int, messages: int) -> Dict:
+    index = build_symbol_index()
+    builtin = [s.name for s in index.symbols]
+    for i in range(extra_symbols):
+        name = f"Synthetic Asset {i}"
+        index.add(Symbol(name, f"SYN{i}", "stock"), [name, f"syn{i}"])
+    engine = IntentEngine(index)
+
+    batch = make_messages(builtin + [f"syn{i}" for i in range(0, extra_symbols, 7)], messages)
+    start = time.perf_counter()
+    resolved = sum(1 for message in batch if engine.parse(message).topic)
+    elapsed = time.perf_counter() - start
+
+    return {
+        "symbols": len(index),
+        "messages": messages,
+        "resolved": resolved,
+        "elapsed_s": round(elapsed, 3),
+        "us_per_message": round(elapsed / messages * 1e6, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Intent motoru benchmark'ı")
+    parser.add_argument("--symbols", type=int, default=5000, help="Eklenecek sentetik sembol")
+    parser.add_argument("--messages", type=int, default=20000)
+    args = parser.parse_args()
+
+    for extra in sorted({0, args.symbols}):
+        result = run(extra, args.messages)
+        for key, value in result.items():
+            print(f"{key:>16}: {value}")
+        print()
+
+
+if __name__ == "__main__":
+    main()
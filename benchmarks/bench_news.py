@@ -0,0 +1,99 @@
+"""
+get_news gecikme benchmark'ı.
+
+Kullanım:
+    python -m benchmarks.bench_news --requests 200
+
+Yerel sahte NewsAPI'yi (benchmarks.fake_newsapi) arka planda başlatır ve
+her çağrıda yeni client açan eski yöntemi, paylaşılan client + koşullu
+istek kullanan get_news ile karşılaştırır.
+"""
+import argparse
+import asyncio
+import os
+import socket
+import threading
+import time
+from typing import List
+
+import httpx
+import uvicorn
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_fake_newsapi(port: int) -> uvicorn.Server:
+    from benchmarks.fake_newsapi import app
+
+    server = uvicorn.Server(
+        uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning")
+    )
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return server
+
+
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+async def measure(fetch, requests: int) -> List[float]:
+    latencies = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        await fetch()
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def report(name: str, latencies: List[float]) -> None:
+    print(
+        f"{name:>16}: p50={percentile(latencies, 50) * 1000:.2f}ms "
+        f"p95={percentile(latencies, 95) * 1000:.2f}ms "
+        f"p99={percentile(latencies, 99) * 1000:.2f}ms"
+    )
+
+
+async def run(requests: int, topic: str) -> None:
+    from app.agent.tools import news_tool
+    from app.utils.http_client import close_http_client
+
+    async def per_call_client():
+        # Eski davranış: her çağrıda yeni client ve bağlantı havuzu
+        async with httpx.AsyncClient(timeout=10) as client:
+            resp = await client.get(
+                news_tool.BASE_URL, params={"q": topic, "pageSize": 20}
+            )
+            resp.raise_for_status()
+            return resp.json()
+
+    report("per-call client", await measure(per_call_client, requests))
+    report("shared client", await measure(lambda: news_tool.get_news(topic), requests))
+    await close_http_client()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="get_news latency benchmark")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--topic", default="Bitcoin")
+    parser.add_argument("--latency-ms", default="5")
+    args = parser.parse_args()
+
+    port = _free_port()
+    os.environ["FAKE_NEWSAPI_LATENCY_MS"] = args.latency_ms
+    os.environ["NEWS_API_URL"] = f"http://127.0.0.1:{port}/v2/everything"
+    server = start_fake_newsapi(port)
+    try:
+        asyncio.run(run(args.requests, args.topic))
+    finally:
+        server.should_exit = True
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Sentiment backend benchmark'ı.
+
+Kullanım:
+    python -m benchmarks.bench_sentiment --backend lexicon --requests 200 --concurrency 32
+    SENTIMENT_MODEL_LOADER=paket.modul:load_model python -m benchmarks.bench_sentiment --backend local
+
+Aynı sentetik haber setini seçilen backend'e eşzamanlı isteklerle gönderir ve
+gecikme yüzdeliklerini ile saniyedeki haber sayısını raporlar.
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from typing import Dict, List
+
+from app.agent.tools.sentiment_backends import create_sentiment_backend
+
+WORDS = (
+    "bitcoin price rise rally market crash fear growth earnings loss record "
+    "investors traders support resistance volume report analysts expect"
+).split()
+
+
+def make_articles(count: int, seed: int = 42) -> List[Dict]:
+    rng = random.Random(seed)
+    return [
+        {
+            "title": " ".join(rng.choices(WORDS, k=10)),
+            "description": " ".join(rng.choices(WORDS, k=30)),
+            "url": f"https://example.com/{i}",
+            "publishedAt": "2025-01-01T00:00:00Z",
+        }
+        for i in range(count)
+    ]
+
+
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def run(backend_name: str, requests: int, concurrency: int, articles: int) -> Dict:
+    backend = create_sentiment_backend(backend_name)
+    batch = make_articles(articles)
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+
+    async def one_request():
+        async with semaphore:
+            start = time.perf_counter()
+            await backend.analyze(batch)
+            latencies.append(time.perf_counter() - start)
+
+    # Isınma (model yükleme, bağlantı kurma)
+    await backend.analyze(batch)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one_request() for _ in range(requests)))
+    elapsed = time.perf_counter() - start
+    await backend.aclose()
+
+    return {
+        "backend": backend_name,
+        "requests": requests,
+        "articles_per_request": articles,
+        "elapsed_s": round(elapsed, 3),
+        "articles_per_s": round(requests * articles / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        "mean_ms": round(statistics.mean(latencies) * 1000, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sentiment backend benchmark")
+    parser.add_argument("--backend", default="lexicon", choices=["lexicon", "local", "http"])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--articles", type=int, default=20)
+    args = parser.parse_args()
+
+    result = asyncio.run(run(args.backend, args.requests, args.concurrency, args.articles))
+    for key, value in result.items():
+        print(f"{key:>22}: {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Emir gönderme gecikmesi benchmark'ı.
+
+Kullanım:
+    python -m benchmarks.bench_trading --orders 50
+
+Yerel mock borsayı (benchmarks.mock_exchange) arka planda başlatır ve her
+emirde AsyncClient.create / close_connection yapan eski yöntemi, açık kalan
+TradingClient ile karşılaştırır.
+"""
+import argparse
+import asyncio
+import os
+import threading
+import time
+
+import uvicorn
+
+from benchmarks.bench_news import _free_port, measure, report
+
+
+def start_mock_exchange(port: int) -> uvicorn.Server:
+    from benchmarks.mock_exchange import app
+
+    server = uvicorn.Server(
+        uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning")
+    )
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return server
+
+
+async def main(orders: int) -> None:
+    from binance import AsyncClient
+
+    from app.agent.tools.trading_tool import TradingClient
+
+    api_url = os.environ["BINANCE_API_URL"]
+
+    async def per_order():
+        # Eski execute_trade: her emirde ping + server time + yeni bağlantı
+        client = AsyncClient("bench", "bench")
+        client.API_URL = api_url
+        await client.ping()
+        await client.get_server_time()
+        try:
+            await client.create_order(symbol="BTCUSDT", side="BUY", type="MARKET", quantity=0.001)
+        finally:
+            await client.close_connection()
+
+    warm = TradingClient("bench", "bench", api_url=api_url)
+    await warm.start()
+
+    async def warm_order():
+        result = await warm.execute("BTC", "buy", 0.001)
+        assert result["status"] == "FILLED", result
+
+    try:
+        report("per-order client", await measure(per_order, orders))
+        report("warm client", await measure(warm_order, orders))
+        print(await warm.health())
+    finally:
+        await warm.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--orders", type=int, default=50)
+    args = parser.parse_args()
+
+    port = _free_port()
+    os.environ.setdefault("BINANCE_API_URL", f"http://127.0.0.1:{port}/api")
+    start_mock_exchange(port)
+    asyncio.run(main(args.orders))
@@ -0,0 +1,74 @@
+"""
+NewsAPI `everything` endpoint'inin yerel taklidi.
+
+Kullanım:
+    uvicorn benchmarks.fake_newsapi:app --port 8900
+    NEWS_API_URL=http://127.0.0.1:8900/v2/everything python -m app.main
+
+Aynı sorgu için deterministik haberler üretir, ETag gönderir ve
+If-None-Match eşleşirse 304 döner. FAKE_NEWSAPI_LATENCY_MS ile gecikme eklenebilir.
+"""
+import asyncio
+import hashlib
+import os
+import time
+from datetime import datetime, timedelta, timezone
+
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import JSONResponse
+
+LATENCY_MS = float(os.getenv("FAKE_NEWSAPI_LATENCY_MS", "50"))
+TOTAL_RESULTS = int(os.getenv("FAKE_NEWSAPI_TOTAL_RESULTS", "500"))
+# Haberler bu kadar saniyede bir "yenilenir" (ETag değişir)
+REFRESH_SECONDS = int(os.getenv("FAKE_NEWSAPI_REFRESH_SECONDS", "60"))
+
+WORDS = (
+    "price rise rally market crash fear growth earnings loss record investors "
+    "traders support resistance volume report analysts expect bullish bearish"
+).split()
+
+app = FastAPI(title="Fake NewsAPI")
+stats = {"requests": 0, "not_modified": 0}
+
+
+def _articles(q: str, page: int, page_size: int, version: int):
+    base = datetime.fromtimestamp(version * REFRESH_SECONDS, tz=timezone.utc)
+    start = (page - 1) * page_size
+    articles = []
+    for i in range(start, min(start + page_size, TOTAL_RESULTS)):
+        digest = hashlib.sha1(f"{q}:{version}:{i}".encode()).digest()
+        words = [WORDS[b % len(WORDS)] for b in digest[:12]]
+        articles.append(
+            {
+                "source": {"id": None, "name": "Fake"},
+                "title": f"{q} " + " ".join(words[:6]),
+                "description": " ".join(words),
+                "url": f"https://news.example.com/{q.lower()}/{version}/{i}",
+                "publishedAt": (base - timedelta(minutes=i)).strftime("%Y-%m-%dT%H:%M:%SZ"),
+            }
+        )
+    return articles
+
+
+@app.get("/v2/everything")
+async def everything(request: Request, q: str = "", pageSize: int = 20, page: int = 1):
+    stats["requests"] += 1
+    await asyncio.sleep(LATENCY_MS / 1000)
+
+    version = int(time.time() // REFRESH_SECONDS)
+    etag = '"' + hashlib.sha1(f"{q}:{page}:{pageSize}:{version}".encode()).hexdigest() + '"'
+    if request.headers.get("if-none-match") == etag:
+        stats["not_modified"] += 1
+        return Response(status_code=304, headers={"ETag": etag})
+
+    body = {
+        "status": "ok",
+        "totalResults": TOTAL_RESULTS,
+        "articles": _articles(q, page, min(pageSize, 100), version),
+    }
+    return JSONResponse(body, headers={"ETag": etag})
+
+
+@app.get("/stats")
+async def get_stats():
+    return stats
@@ -0,0 +1,114 @@
+"""
+Binance spot REST API'sinin yerel taklidi (trading client testleri için).
+
+Kullanım:
+    uvicorn benchmarks.mock_exchange:app --port 8901
+    BINANCE_API_URL=http://127.0.0.1:8901/api BINANCE_API_KEY=x BINANCE_SECRET_KEY=x \
+        python -m app.main
+
+ping, time, exchangeInfo, ticker/price ve MARKET order uçlarını sunar; emirler
+anında FILLED döner. İmza doğrulanmaz. MOCK_EXCHANGE_LATENCY_MS ile gecikme
+eklenebilir.
+"""
+import asyncio
+import itertools
+import os
+import time
+from urllib.parse import parse_qsl
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+LATENCY_MS = float(os.getenv("MOCK_EXCHANGE_LATENCY_MS", "20"))
+
+# çift -> (fiyat, minQty, stepSize, minNotional)
+PAIRS = {
+    "BTCUSDT": ("65000.00", "0.00001", "0.00001", "5"),
+    "ETHUSDT": ("3200.00", "0.0001", "0.0001", "5"),
+    "SOLUSDT": ("150.00", "0.001", "0.001", "5"),
+    "XRPUSDT": ("0.60", "1", "1", "5"),
+    "DOGEUSDT": ("0.15", "1", "1", "5"),
+}
+
+app = FastAPI(title="Mock Exchange")
+stats = {"requests": 0, "orders": 0, "exchange_info": 0}
+_order_ids = itertools.count(1)
+_weight = {"minute": 0, "used": 0}
+
+
+@app.middleware("http")
+async def latency(request: Request, call_next):
+    stats["requests"] += 1
+    await asyncio.sleep(LATENCY_MS / 1000)
+    response = await call_next(request)
+    # Binance gibi dakikalık kullanılan ağırlığı bildir (her istek 1 sayılır)
+    minute = int(time.time() // 60)
+    if _weight["minute"] != minute:
+        _weight.update(minute=minute, used=0)
+    _weight["used"] += 1
+    response.headers["x-mbx-used-weight-1m"] = str(_weight["used"])
+    return response
+
+
+def _symbol_info(pair: str) -> dict:
+    _, min_qty, step, min_notional = PAIRS[pair]
+    return {
+        "symbol": pair,
+        "status": "TRADING",
+        "baseAsset": pair[:-4],
+        "quoteAsset": "USDT",
+        "filters": [
+            {"filterType": "LOT_SIZE", "minQty": min_qty, "maxQty": "9000000", "stepSize": step},
+            {"filterType": "NOTIONAL", "minNotional": min_notional},
+        ],
+    }
+
+
+@app.get("/api/v3/ping")
+async def ping():
+    return {}
+
+
+@app.get("/api/v3/time")
+async def server_time():
+    return {"serverTime": int(time.time() * 1000)}
+
+
+@app.get("/api/v3/exchangeInfo")
+async def exchange_info():
+    stats["exchange_info"] += 1
+    return {"timezone": "UTC", "symbols": [_symbol_info(pair) for pair in PAIRS]}
+
+
+@app.get("/api/v3/ticker/price")
+async def ticker_price(symbol: str):
+    if symbol not in PAIRS:
+        return JSONResponse({"code": -1121, "msg": "Invalid symbol."}, status_code=400)
+    return {"symbol": symbol, "price": PAIRS[symbol][0]}
+
+
+@app.post("/api/v3/order")
+async def order(request: Request):
+    # python-multipart gerektirmemek için form gövdesi elle çözülür
+    form = dict(parse_qsl((await request.body()).decode()))
+    form.update(request.query_params)
+    symbol = form.get("symbol")
+    if symbol not in PAIRS:
+        return JSONResponse({"code": -1121, "msg": "Invalid symbol."}, status_code=400)
+    stats["orders"] += 1
+    qty = form.get("quantity")
+    price = PAIRS[symbol][0]
+    return {
+        "symbol": symbol,
+        "orderId": next(_order_ids),
+        "status": "FILLED",
+        "side": form.get("side"),
+        "type": form.get("type"),
+        "executedQty": qty,
+        "fills": [{"price": price, "qty": qty, "commission": "0", "commissionAsset": "USDT"}],
+    }
+
+
+@app.get("/stats")
+async def get_stats():
+    return stats
@@ -0,0 +1,99 @@
+"""
+Başlangıç (import) süresi benchmark'ı.
+
+Kullanım:
+    python -m benchmarks.startup_importtime --top 15
+    python -m benchmarks.startup_importtime --module app.main --runs 5 --json
+
+Modülü her çalıştırmada temiz bir `python -X importtime` process'inde import
+eder; toplam süreyi ve kümülatif olarak en pahalı import'ları raporlar.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List, Tuple
+
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int, int]]:
+    """
+    "import time: self [us] | cumulative | imported package" satırlarını
+    (modül, self_us, cumulative_us) listesine çevirir.
+    """
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:") :].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue
+        rows.append((parts[2].strip(), int(parts[0]), int(parts[1])))
+    return rows
+
+
+def measure(module: str) -> Tuple[float, List[Tuple[str, int, int]]]:
+    env = {**os.environ, "PYTHONDONTWRITEBYTECODE": "1"}
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        env=env,
+    )
+    elapsed = time.perf_counter() - start
+    if proc.returncode != 0:
+        tail = "\n".join(proc.stderr.splitlines()[-5:])
+        raise SystemExit(f"{module} import edilemedi:\n{tail}")
+    return elapsed, parse_importtime(proc.stderr)
+
+
+def run(module: str, runs: int, top: int) -> Dict:
+    walls = []
+    cumulative: Dict[str, List[int]] = {}
+    for _ in range(runs):
+        wall, rows = measure(module)
+        walls.append(wall)
+        for name, _, cum in rows:
+            cumulative.setdefault(name, []).append(cum)
+
+    # Her modül için çalıştırmaların medyanı; en pahalılar önce
+    medians = {name: statistics.median(values) for name, values in cumulative.items()}
+    ranked = sorted(medians.items(), key=lambda item: item[1], reverse=True)
+    return {
+        "module": module,
+        "runs": runs,
+        "wall_ms_median": round(statistics.median(walls) * 1000, 1),
+        "wall_ms_min": round(min(walls) * 1000, 1),
+        "import_ms": round(medians.get(module, 0) / 1000, 1),
+        "top_imports": [
+            {"module": name, "cumulative_ms": round(us / 1000, 1)}
+            for name, us in ranked[:top]
+        ],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import süresi benchmark'ı")
+    parser.add_argument("--module", default="app.main")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--json", action="store_true", help="Sonucu JSON olarak yaz")
+    args = parser.parse_args()
+
+    result = run(args.module, args.runs, args.top)
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return
+
+    for key in ("module", "runs", "wall_ms_median", "wall_ms_min", "import_ms"):
+        print(f"{key:>16}: {result[key]}")
+    print()
+    for row in result["top_imports"]:
+        print(f"{row['cumulative_ms']:>10.1f} ms  {row['module']}")
+
+
+if __name__ == "__main__":
+    main()
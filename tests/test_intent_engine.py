@@ -0,0 +1,57 @@
+import pytest
+
+from app.intent_engine import get_intent_engine
+
+
+@pytest.fixture(scope="module")
+def engine():
+    return get_intent_engine()
+
+
+@pytest.mark.parametrize(
+    "message",
+    [
+        "Bitcoin için işlem yapma",
+        "ethereum trade etme",
+        "Tesla otomatik işlem yapmasın",
+        "bitcoin traders",
+        "Bitcoin alım satım hacmi",
+        "don't auto trade bitcoin",
+        "bitcoin için otomatik işlem yapmayın",
+        "ethereum otomatik işlem yapmaz mısın",
+        "Bitcoin alma, otomatik işlem yapma",
+    ],
+)
+def test_negations_and_mentions_are_not_auto(engine, message):
+    intent = engine.parse(message)
+    assert intent.mode == "manual"
+    assert intent.intent != "auto_trade"
+    assert "auto" not in intent.keywords
+
+
+@pytest.mark.parametrize(
+    "message, topic",
+    [
+        ("Tesla için otomatik işlem yap", "Tesla"),
+        ("bitcoin için işlem yap", "Bitcoin"),
+        ("ethereum trade et", "Ethereum"),
+        ("Tesla için otomatik işlem yapmak istiyorum", "Tesla"),
+        ("Tesla için otomatik işlem yap, almayı düşünüyorum", "Tesla"),
+    ],
+)
+def test_explicit_auto_commands(engine, message, topic):
+    intent = engine.parse(message)
+    assert intent.intent == "auto_trade"
+    assert intent.mode == "auto"
+    assert intent.topic == topic
+
+
+def test_words_that_only_look_negative_keep_auto(engine):
+    intent = engine.parse("Almanya borsası için otomatik işlem yap")
+    assert intent.mode == "auto"
+    assert not intent.negated
+
+
+def test_negation_is_flagged(engine):
+    assert engine.parse("Bitcoin için işlem yapma").negated
+    assert not engine.parse("Bitcoin analiz et").negated
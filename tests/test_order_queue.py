@@ -0,0 +1,114 @@
+import asyncio
+
+import pytest
+
+from app.agent.order_queue import OrderQueue, WeightBudget
+
+
+class FakeExchange:
+    def __init__(self):
+        self.calls = []
+
+    async def execute(self, symbol, decision, amount=None):
+        self.calls.append((symbol, decision, amount))
+        return {"status": "FILLED", "symbol": symbol, "side": decision.upper()}
+
+
+def make_queue(exchange, limit=6000):
+    return OrderQueue(execute=exchange.execute, budget=WeightBudget(limit=limit, safety=1.0))
+
+
+async def drain(queue):
+    await asyncio.gather(*list(queue._workers.values()))
+
+
+def test_duplicate_key_returns_first_order():
+    async def scenario():
+        exchange = FakeExchange()
+        queue = make_queue(exchange)
+        first = queue.submit("Bitcoin", "buy", 0.9, "v1", symbol="BTCUSDT")
+        second = queue.submit("bitcoin ", "buy", 0.9, "v1", symbol="BTCUSDT")
+        await drain(queue)
+        return exchange, queue, first, second
+
+    exchange, queue, first, second = asyncio.run(scenario())
+    assert second is first
+    assert queue.duplicates == 1
+    assert first.status == "executed"
+    assert len(exchange.calls) == 1
+
+
+def test_same_side_signal_joins_pending_order():
+    async def scenario():
+        exchange = FakeExchange()
+        queue = make_queue(exchange)
+        first = queue.submit("Bitcoin", "buy", 0.9, "v1", symbol="BTCUSDT")
+        second = queue.submit("BTC", "buy", 0.85, "v2", symbol="BTCUSDT")
+        await drain(queue)
+        return exchange, first, second
+
+    exchange, first, second = asyncio.run(scenario())
+    assert first.status == "executed"
+    assert second.status == "coalesced"
+    assert second.coalesced_with == first.key
+    assert exchange.calls == [("BTCUSDT", "buy", None)]
+
+
+def test_opposite_side_signal_cancels_both():
+    async def scenario():
+        exchange = FakeExchange()
+        queue = make_queue(exchange)
+        buy = queue.submit("Bitcoin", "buy", 0.9, "v1", symbol="BTCUSDT")
+        sell = queue.submit("Bitcoin", "sell", 0.9, "v2", symbol="BTCUSDT")
+        await drain(queue)
+        return exchange, queue, buy, sell
+
+    exchange, queue, buy, sell = asyncio.run(scenario())
+    assert buy.status == "coalesced" and sell.status == "coalesced"
+    assert buy.coalesced_with == sell.key and sell.coalesced_with == buy.key
+    assert exchange.calls == []
+    assert queue.stats()["pending"] == 0
+
+
+def test_budget_waits_when_window_is_full():
+    async def scenario():
+        budget = WeightBudget(limit=6, safety=1.0)
+        await budget.acquire(3)
+        await budget.acquire(3)
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(budget.acquire(3), timeout=0.1)
+        return budget
+
+    budget = asyncio.run(scenario())
+    assert budget.waits >= 1
+    assert budget.stats()["used"] == 6
+
+
+def test_budget_respects_reported_exchange_weight():
+    async def scenario():
+        budget = WeightBudget(limit=10, safety=1.0)
+        budget.observe(9)
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(budget.acquire(3), timeout=0.1)
+        return budget
+
+    assert asyncio.run(scenario()).waits >= 1
+
+
+def test_order_waits_for_budget_and_stays_pending():
+    async def scenario():
+        exchange = FakeExchange()
+        queue = make_queue(exchange, limit=3)
+        first = queue.submit("Bitcoin", "buy", 0.9, "v1", symbol="BTCUSDT")
+        await drain(queue)
+        second = queue.submit("Ethereum", "buy", 0.9, "v1", symbol="ETHUSDT")
+        await asyncio.sleep(0.1)
+        status = second.status
+        await queue.close(timeout=0.1)
+        return exchange, first, status, second
+
+    exchange, first, status, second = asyncio.run(scenario())
+    assert first.status == "executed"
+    assert status == "queued"
+    assert second.status == "cancelled"
+    assert len(exchange.calls) == 1
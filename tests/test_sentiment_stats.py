@@ -0,0 +1,58 @@
+import pytest
+
+from app.agent.tools.sentiment_stats import SentimentAggregate, TopicAggregates
+
+
+def article(i, score, hour, label=None):
+    return {
+        "url": f"https://example.com/{i}",
+        "publishedAt": f"2025-01-01T{hour:02d}:00:00Z",
+        "sentiment_score": score,
+        "sentiment_label": label or ("positive" if score > 0.6 else "negative"),
+    }
+
+
+def test_remove_restores_previous_state():
+    aggregate = SentimentAggregate(half_life_hours=6)
+    aggregate.add(article(1, 0.8, 1))
+    before = (aggregate.mean, aggregate.count, dict(aggregate.label_counts))
+    entry = aggregate.add(article(2, 0.2, 5))
+    aggregate.remove(entry)
+    assert aggregate.mean == pytest.approx(before[0])
+    assert (aggregate.count, aggregate.label_counts) == before[1:]
+
+
+def test_window_eviction_keeps_counts_and_mean_in_step():
+    topics = TopicAggregates(half_life_hours=0, max_articles=2)
+    topics.update("Bitcoin", [article(1, 0.9, 1), article(2, 0.1, 2), article(3, 0.2, 3)])
+    aggregate = topics.get("bitcoin")
+    assert aggregate.count == 2
+    assert aggregate.mean == pytest.approx(0.15)
+    assert aggregate.label_counts["positive"] == 0
+
+
+def test_refetched_article_is_not_double_counted():
+    topics = TopicAggregates(half_life_hours=0, max_articles=2)
+    items = [article(1, 0.9, 1), article(2, 0.1, 2), article(3, 0.2, 3)]
+    topics.update("Bitcoin", items)
+    # 1 pencereden düştü; tekrar gelirse pencerede yalnızca bir kez yer alır
+    aggregate = topics.update("Bitcoin", items)
+    assert aggregate.count == 2
+
+
+def test_decayed_articles_leave_counts():
+    topics = TopicAggregates(half_life_hours=1, min_weight=0.01)
+    topics.update("Bitcoin", [article(1, 0.9, 0)])
+    aggregate = topics.update("Bitcoin", [article(2, 0.1, 12)])
+    assert aggregate.count == 1
+    assert aggregate.label_counts["positive"] == 0
+    assert aggregate.mean == pytest.approx(0.1)
+
+
+def test_label_shares_use_the_same_weights_as_mean():
+    aggregate = SentimentAggregate.from_items(
+        [article(1, 0.9, 0), article(2, 0.1, 1)], half_life_hours=1
+    )
+    shares = aggregate.label_shares
+    assert shares["negative"] == pytest.approx(2 / 3)
+    assert shares["positive"] == pytest.approx(1 / 3)